@@ -0,0 +1,64 @@
+"""Micro-benchmark: KeywordMatcher against the nested keyword loop it replaced.
+
+The nested loop costs O(titles x keywords) substring searches, while the
+matcher scans each title once, so the gap grows with the size of the keyword
+set. Run with ``python -m benchmarks.bench_keyword_matcher``.
+"""
+import argparse
+import itertools
+import timeit
+from typing import List
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.standin_site import build_catalogue
+
+KEYWORDS = ["qa", "quality", "test", "automation", "python", "java", "devops", "data"]
+EXTRA_KEYWORDS = [
+    f"{tech}{suffix}"
+    for tech, suffix in itertools.product(
+        ["react", "node", "scala", "golang", "rust", "kotlin", "swift", "php"],
+        ["", " developer", " engineer", " lead", " architect", "js", "ops", "ml"],
+    )
+]
+
+
+def nested_loop(titles: List[str], keywords: List[str]) -> List[str]:
+    """The previous CareersPage.get_job_title algorithm, collected into a list."""
+    matched = []
+    for title in titles:
+        for keyword in keywords:
+            if keyword.lower() in title.lower():
+                matched.append(title)
+    return matched
+
+
+def best_of(func, repeat: int) -> float:
+    """Returns the fastest of `repeat` single runs, in seconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, nargs="+", default=[100, 10000, 50000])
+    parser.add_argument("--keywords", type=int, nargs="+", default=[8, 32, 72])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.titles:
+        titles = [job.title for job in build_catalogue(size)]
+        for count in args.keywords:
+            keywords = (KEYWORDS + EXTRA_KEYWORDS)[:count]
+            matcher = KeywordMatcher(keywords)
+            loop = best_of(lambda: nested_loop(titles, keywords), args.repeat)
+            compiled = best_of(lambda: matcher.match(titles), args.repeat)
+            build = best_of(lambda: KeywordMatcher(keywords), args.repeat)
+            print(
+                f"{size:>7} titles x {len(keywords):>3} keywords: "
+                f"nested loop {loop * 1000:8.2f} ms, "
+                f"matcher {compiled * 1000:8.2f} ms (+{build * 1000:.2f} ms compile), "
+                f"speed-up {loop / compiled:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
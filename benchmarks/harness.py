@@ -0,0 +1,201 @@
+"""Sampling, statistics and result storage shared by the benchmarks."""
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+DEFAULT_RESULTS_DIR = Path(".benchmarks")
+
+# Shown in the report; the results file keeps every sample
+REPORTED_STATS = ("min", "p50", "p90", "p99", "max")
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Returns the q-th percentile (0-100) of the samples, interpolating linearly."""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@dataclass
+class BenchmarkResult:
+    """Repeated samples of one measurement, in milliseconds.
+
+    Attributes:
+        name (str): What was measured, e.g. "navigate_cold".
+        samples (list): One duration per repetition, in milliseconds.
+        params (dict): Parameters of the measurement, e.g. {"size": 100}.
+    """
+
+    name: str
+    samples: List[float]
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        if not self.params:
+            return self.name
+        args = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{args}]"
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "n": len(self.samples),
+            "mean": statistics.fmean(self.samples),
+            "stdev": statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0,
+            "min": min(self.samples),
+            "p50": percentile(self.samples, 50),
+            "p90": percentile(self.samples, 90),
+            "p99": percentile(self.samples, 99),
+            "max": max(self.samples),
+        }
+
+
+class Timer:
+    """Context manager measuring the wall time of a block in milliseconds."""
+
+    def __enter__(self) -> "Timer":
+        self._start = time.perf_counter()
+        self.ms = 0.0
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.ms = (time.perf_counter() - self._start) * 1000
+
+
+async def collect(
+    measure: Callable[[], Awaitable[Dict[str, float]]], repeat: int, warmup: int = 1
+) -> Dict[str, List[float]]:
+    """Runs a measurement repeatedly and gathers its samples by name.
+
+    Args:
+        measure (Callable): Coroutine function running one repetition and
+            returning the milliseconds of each thing it measured.
+        repeat (int): Number of recorded repetitions.
+        warmup (int): Repetitions run first and discarded.
+
+    Returns:
+        dict: Samples by measurement name.
+    """
+    samples: Dict[str, List[float]] = {}
+    for index in range(warmup + repeat):
+        timings = await measure()
+        if index < warmup:
+            continue
+        for name, ms in timings.items():
+            samples.setdefault(name, []).append(ms)
+    return samples
+
+
+def git_revision() -> str:
+    """Returns the short commit id, suffixed with "-dirty" for uncommitted changes."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def save_results(
+    results: List[BenchmarkResult],
+    metadata: Dict[str, Any],
+    directory: Path = DEFAULT_RESULTS_DIR,
+) -> Path:
+    """Saves the results as <revision>.json so runs can be compared across commits."""
+    revision = metadata.setdefault("revision", git_revision())
+    metadata.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
+    metadata.setdefault("python", platform.python_version())
+    payload = {
+        "metadata": metadata,
+        "results": {
+            result.key: {"stats": result.stats(), "samples": result.samples}
+            for result in results
+        },
+    }
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{revision}.json"
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return path
+
+
+def load_results(ref: str, directory: Path = DEFAULT_RESULTS_DIR) -> Optional[Dict[str, Dict]]:
+    """Loads saved results by file path, revision or any git ref (e.g. HEAD~1).
+
+    A run on uncommitted changes is found through the commit it was based on.
+
+    Returns:
+        Optional[dict]: Stats by result key, None if nothing was saved for the ref.
+    """
+    candidates = [Path(ref), directory / f"{ref}.json"]
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", ref],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        candidates.append(directory / f"{revision}.json")
+        candidates.append(directory / f"{revision}-dirty.json")
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    for path in candidates:
+        if path.is_file():
+            results = json.loads(path.read_text(encoding="utf-8"))["results"]
+            return {key: data["stats"] for key, data in results.items()}
+    return None
+
+
+def format_results(results: List[BenchmarkResult]) -> List[str]:
+    """Formats one line per result with its percentiles."""
+    width = max((len(result.key) for result in results), default=0)
+    header = f"{'benchmark':<{width}}  {'n':>3}" + "".join(
+        f"{name:>10}" for name in REPORTED_STATS
+    )
+    lines = [header + "   (ms)"]
+    for result in results:
+        stats = result.stats()
+        lines.append(
+            f"{result.key:<{width}}  {stats['n']:>3}"
+            + "".join(f"{stats[name]:>10.2f}" for name in REPORTED_STATS)
+        )
+    return lines
+
+
+def compare_results(
+    results: List[BenchmarkResult], baseline: Dict[str, Dict], threshold: float = 0.1
+) -> List[str]:
+    """Compares the p50 of every result with a baseline.
+
+    Changes within ``threshold`` (a fraction) are reported as unchanged.
+    """
+    lines = []
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None:
+            lines.append(f"{result.key}: new")
+            continue
+        p50 = result.stats()["p50"]
+        change = (p50 - base["p50"]) / base["p50"] if base["p50"] else 0.0
+        verdict = "unchanged"
+        if change > threshold:
+            verdict = "SLOWER"
+        elif change < -threshold:
+            verdict = "faster"
+        lines.append(
+            f"{result.key}: p50 {base['p50']:.2f} -> {p50:.2f} ms ({change:+.0%}) {verdict}"
+        )
+    return lines
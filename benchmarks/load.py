@@ -0,0 +1,291 @@
+"""Synthetic load and soak runs of CareersPage search and filter scenarios.
+
+Every scenario searches a keyword, then filters by one location and one job
+type of the utils.data_helpers matrix. Virtual users, each with its own
+browser context, run scenarios for a set duration, either back to back or at a
+fixed total rate. Several user counts can be run in turn to find where the
+results page degrades. Runs against the in-process stand-in site by default;
+pass --careers-url for a staging host. Run with ``python -m benchmarks.load``.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import Browser, async_playwright
+
+from benchmarks.harness import DEFAULT_RESULTS_DIR, git_revision
+from benchmarks.load_stats import LoadRecorder, find_degradation, format_summary
+from pages.careers_page import CareersPage
+from utils.browser_pool import BROWSER_LAUNCH_ARGS, CONTEXT_OPTIONS
+from utils.consent_state import warm_up_consent_state
+from utils.data_helpers import get_job_types, get_test_locations
+from utils.resource_blocking import PROFILES, ResourceBlocker
+from utils.standin_site import StandInSite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEYWORDS = ["Developer", "QA", "Data"]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One combination of the search matrix."""
+
+    keyword: str
+    location: str
+    job_type: str
+
+    @property
+    def location_filter(self) -> str:
+        return f"All Cities in {self.location}"
+
+
+def build_scenarios(keywords: List[str]) -> List[Scenario]:
+    """Crosses the keywords with the test locations and job types."""
+    return [
+        Scenario(keyword, location, job_type)
+        for keyword, location, job_type in itertools.product(
+            keywords, get_test_locations(), get_job_types()
+        )
+    ]
+
+
+class LoadRun:
+    """One stage of a load run: a number of users over a duration.
+
+    Without a rate, each user starts its next scenario as soon as the previous
+    one ends (closed model). With a rate, scenarios are started on a fixed
+    schedule and wait for a free user (open model); their latency is measured
+    from the scheduled start, so a saturated site shows up as growing latency
+    rather than as a quietly lower request rate.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        url: str,
+        scenarios: List[Scenario],
+        users: int,
+        duration: float,
+        rate: Optional[float] = None,
+        ramp_up: float = 0.0,
+        consent_state: Optional[Path] = None,
+        resource_profile: str = "full",
+        window: float = 10.0,
+    ):
+        self.browser = browser
+        self.url = url
+        self.scenarios = scenarios
+        self.users = max(1, users)
+        self.duration = duration
+        self.rate = rate
+        self.ramp_up = ramp_up
+        self.consent_state = consent_state
+        self.profile = PROFILES[resource_profile]
+        self.recorder = LoadRecorder(window)
+        self._next = itertools.cycle(scenarios)
+        self._started = 0.0
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._started
+
+    async def _timed(self, name: str, action) -> None:
+        started = time.perf_counter()
+        try:
+            await action()
+        except Exception as e:
+            self.recorder.failure(name, e, self._now())
+            raise
+        self.recorder.success(name, (time.perf_counter() - started) * 1000, self._now())
+
+    async def _run_scenario(
+        self, careers_page: CareersPage, scenario: Scenario, since: float
+    ) -> None:
+        """Runs one scenario, recording each action and the scenario as a whole.
+
+        A failed action ends the scenario; the next one navigates afresh.
+        """
+        page = careers_page
+        try:
+            await self._timed("navigate", page.navigate)
+            await self._timed("search_jobs", lambda: page.search_jobs(scenario.keyword))
+            await self._timed(
+                "filter_by_location",
+                lambda: page.filter_by_location(scenario.location_filter),
+            )
+            await self._timed(
+                "filter_by_job_type", lambda: page.filter_by_job_type(scenario.job_type)
+            )
+        except Exception as e:
+            self.recorder.failure("scenario", e, self._now())
+            logger.debug("Scenario %s failed: %s", scenario, e)
+            return
+        self.recorder.success("scenario", (time.perf_counter() - since) * 1000, self._now())
+
+    async def _new_user(self) -> CareersPage:
+        state = str(self.consent_state) if self.consent_state else None
+        context = await self.browser.new_context(**CONTEXT_OPTIONS, storage_state=state)
+        await ResourceBlocker(self.profile, self.url).install(context)
+        return CareersPage(
+            await context.new_page(), consent_cached=state is not None, url=self.url
+        )
+
+    async def _closed_user(self, index: int, deadline: float) -> None:
+        await asyncio.sleep(self.ramp_up * index / self.users)
+        careers_page = await self._new_user()
+        try:
+            while time.perf_counter() < deadline:
+                scenario = next(self._next)
+                await self._run_scenario(careers_page, scenario, time.perf_counter())
+        finally:
+            await careers_page.page.context.close()
+
+    async def _open_model(self, deadline: float) -> None:
+        idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(self.users):
+            idle.put_nowait(await self._new_user())
+
+        async def dispatch(scheduled: float) -> None:
+            careers_page = await idle.get()
+            try:
+                await self._run_scenario(careers_page, next(self._next), scheduled)
+            finally:
+                idle.put_nowait(careers_page)
+
+        # Finished scenarios are dropped, so a long soak run does not accumulate tasks
+        tasks = set()
+        scheduled = time.perf_counter()
+        try:
+            while scheduled < deadline:
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                task = asyncio.ensure_future(dispatch(scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                scheduled += 1 / self.rate
+            await asyncio.gather(*tasks)
+        finally:
+            while not idle.empty():
+                await idle.get_nowait().page.context.close()
+
+    async def run(self) -> Dict[str, Any]:
+        """Runs the stage and returns its report."""
+        self._started = time.perf_counter()
+        deadline = self._started + self.duration
+        if self.rate:
+            await self._open_model(deadline)
+        else:
+            await asyncio.gather(
+                *(self._closed_user(index, deadline) for index in range(self.users))
+            )
+        elapsed = self._now()
+        return {
+            "users": self.users,
+            "rate": self.rate,
+            "elapsed_s": round(elapsed, 3),
+            "summary": self.recorder.summary(elapsed),
+            "windows": self.recorder.windows(),
+        }
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Starts the site and the browser and runs one stage per user count."""
+    scenarios = build_scenarios(args.keywords)
+    stages = []
+    async with AsyncExitStack() as stack:
+        url = args.careers_url
+        if url is None:
+            site = StandInSite(catalogue_size=args.jobs, latency_ms=args.latency_ms)
+            url = stack.enter_context(site).careers_url
+        playwright = await stack.enter_async_context(async_playwright())
+        browser = await playwright.chromium.launch(args=BROWSER_LAUNCH_ARGS)
+        stack.push_async_callback(browser.close)
+        state_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        consent_state = await warm_up_consent_state(
+            browser, Path(state_dir) / "consent.json", CONTEXT_OPTIONS, url=url
+        )
+        for users in args.users:
+            logger.info("Running %d users for %.0fs", users, args.duration)
+            stage = await LoadRun(
+                browser,
+                url,
+                scenarios,
+                users=users,
+                duration=args.duration,
+                rate=args.rate,
+                ramp_up=args.ramp_up,
+                consent_state=consent_state,
+                resource_profile=args.resource_profile,
+                window=args.window,
+            ).run()
+            stages.append(stage)
+            print(f"\n{users} users ({stage['elapsed_s']:.0f}s):")
+            print("\n".join(format_summary(stage["summary"])))
+    return stages
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--users", type=int, nargs="+", default=[4],
+        help="Concurrent users (contexts); several values run one stage each",
+    )
+    parser.add_argument("--duration", type=float, default=60, help="Seconds per stage")
+    parser.add_argument(
+        "--rate", type=float, default=None,
+        help="Scenarios started per second across all users (default: back to back)",
+    )
+    parser.add_argument(
+        "--ramp-up", type=float, default=0, help="Seconds over which the users start"
+    )
+    parser.add_argument("--keywords", nargs="+", default=DEFAULT_KEYWORDS)
+    parser.add_argument("--careers-url", default=None, help="Load a real site instead")
+    parser.add_argument("--jobs", type=int, default=200, help="Stand-in site catalogue size")
+    parser.add_argument(
+        "--latency-ms", type=float, default=0, help="Latency added by the stand-in site"
+    )
+    parser.add_argument(
+        "--resource-profile", choices=sorted(PROFILES), default="full",
+        help="Requests blocked in the users' contexts",
+    )
+    parser.add_argument(
+        "--window", type=float, default=10, help="Seconds per throughput window"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None,
+        help="Report file (default: .benchmarks/load-<commit>.json)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+    stages = asyncio.run(run(args))
+
+    degraded = find_degradation(stages)
+    if len(stages) > 1:
+        print(
+            f"\nDegraded at {degraded['users']} users" if degraded
+            else "\nNo degradation across the stages"
+        )
+    output = args.output or DEFAULT_RESULTS_DIR / f"load-{git_revision()}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "site": args.careers_url or f"stand-in (latency {args.latency_ms} ms)",
+        "duration_s": args.duration,
+        "rate": args.rate,
+        "degraded_at_users": degraded["users"] if degraded else None,
+        "stages": stages,
+    }
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nSaved report to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Latency histograms, error rates and throughput of a load run."""
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+REPORTED_PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """Latencies in logarithmic buckets, so a long soak run keeps constant memory.
+
+    Each bucket is ``growth`` times wider than the previous one, which bounds
+    the relative error of a percentile by ``growth - 1`` (2.5% by default).
+    The exact minimum and maximum are kept as well.
+    """
+
+    def __init__(self, growth: float = 1.025, lowest_ms: float = 0.1):
+        self.growth = growth
+        self.lowest_ms = lowest_ms
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def _bucket(self, ms: float) -> int:
+        if ms <= self.lowest_ms:
+            return 0
+        return int(math.log(ms / self.lowest_ms, self.growth)) + 1
+
+    def _upper_bound(self, bucket: int) -> float:
+        return self.lowest_ms * self.growth**bucket
+
+    def record(self, ms: float) -> None:
+        self.buckets[self._bucket(ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q: float) -> float:
+        """Returns the q-th percentile (0-100), as the upper bound of its bucket."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(max(self._upper_bound(bucket), self.min_ms), self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+@dataclass
+class ActionStats:
+    """Outcomes of one action (e.g. "filter_by_location") during a run."""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def ok(self) -> int:
+        return self.latency.count
+
+    @property
+    def failed(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def error_rate(self) -> float:
+        total = self.ok + self.failed
+        return self.failed / total if total else 0.0
+
+
+class LoadRecorder:
+    """Collects the outcome of every action of a load run.
+
+    Successful actions go to a latency histogram; failed ones are counted by
+    error type. Completions are also counted per ``window`` seconds, which
+    shows throughput and errors changing over a soak run.
+    """
+
+    def __init__(self, window: float = 10.0):
+        self.window = window
+        self.actions: Dict[str, ActionStats] = {}
+        self.timeline: Dict[int, Counter] = {}
+
+    def _stats(self, action: str) -> ActionStats:
+        return self.actions.setdefault(action, ActionStats())
+
+    def _tick(self, at: float, outcome: str) -> None:
+        self.timeline.setdefault(int(at // self.window), Counter())[outcome] += 1
+
+    def success(self, action: str, ms: float, at: float) -> None:
+        """Records a completed action.
+
+        Args:
+            action (str): Name of the action.
+            ms (float): Its latency in milliseconds.
+            at (float): Seconds since the start of the run.
+        """
+        self._stats(action).latency.record(ms)
+        self._tick(at, "ok")
+
+    def failure(self, action: str, error: BaseException, at: float) -> None:
+        """Records a failed action under its error type."""
+        self._stats(action).errors[type(error).__name__] += 1
+        self._tick(at, "failed")
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        """Returns the stats of every action over a run of `elapsed` seconds."""
+        summary = {}
+        for action, stats in self.actions.items():
+            entry = {
+                "ok": stats.ok,
+                "failed": stats.failed,
+                "error_rate": round(stats.error_rate, 4),
+                "throughput_per_s": round(stats.ok / elapsed, 3) if elapsed else 0.0,
+                "mean_ms": round(stats.latency.mean_ms, 1),
+                "max_ms": round(stats.latency.max_ms, 1),
+                "errors": dict(stats.errors),
+            }
+            for q in REPORTED_PERCENTILES:
+                entry[f"p{q}_ms"] = round(stats.latency.percentile(q), 1)
+            summary[action] = entry
+        return summary
+
+    def windows(self) -> List[Dict[str, Any]]:
+        """Returns the completions of each window, oldest first."""
+        return [
+            {
+                "start_s": index * self.window,
+                "ok": counts["ok"],
+                "failed": counts["failed"],
+                "per_s": round((counts["ok"] + counts["failed"]) / self.window, 3),
+            }
+            for index, counts in sorted(self.timeline.items())
+        ]
+
+
+def format_summary(summary: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Formats one line per action with its throughput, errors and percentiles."""
+    width = max((len(action) for action in summary), default=6)
+    header = (
+        f"{'action':<{width}}  {'ok':>6} {'err%':>6} {'ops/s':>7}"
+        + "".join(f"{f'p{q}':>9}" for q in REPORTED_PERCENTILES)
+        + f"{'max':>9}"
+    )
+    lines = [header + "   (ms)"]
+    for action, entry in summary.items():
+        lines.append(
+            f"{action:<{width}}  {entry['ok']:>6} {entry['error_rate'] * 100:>6.1f}"
+            f" {entry['throughput_per_s']:>7.2f}"
+            + "".join(f"{entry[f'p{q}_ms']:>9.1f}" for q in REPORTED_PERCENTILES)
+            + f"{entry['max_ms']:>9.1f}"
+        )
+    return lines
+
+
+def find_degradation(
+    stages: List[Dict[str, Any]],
+    action: str = "scenario",
+    latency_factor: float = 2.0,
+    max_error_rate: float = 0.01,
+) -> Optional[Dict[str, Any]]:
+    """Returns the first stage where the results page degraded, if any.
+
+    A stage has degraded when the action's p95 is ``latency_factor`` times
+    that of the first stage, or its error rate exceeds ``max_error_rate``.
+
+    Args:
+        stages (list): Stage reports, each with "users" and "summary".
+    """
+    if not stages or action not in stages[0]["summary"]:
+        return None
+    baseline = stages[0]["summary"][action]["p95_ms"]
+    for stage in stages:
+        entry = stage["summary"].get(action)
+        if entry is None:
+            continue
+        if entry["error_rate"] > max_error_rate or (
+            baseline and entry["p95_ms"] > latency_factor * baseline
+        ):
+            return stage
+    return None
@@ -0,0 +1,323 @@
+"""Benchmarks of the suite's fixtures and page-object operations.
+
+Runs against the in-process stand-in site by default, so results only move
+when the code does; pass --careers-url to measure a real site instead. Every
+run is saved to .benchmarks/<commit>.json and can be compared with an
+earlier one. Run with ``python -m benchmarks.run``.
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from playwright.async_api import Browser, Playwright, async_playwright
+
+from benchmarks.harness import (
+    DEFAULT_RESULTS_DIR,
+    BenchmarkResult,
+    Timer,
+    collect,
+    compare_results,
+    format_results,
+    load_results,
+    save_results,
+)
+from pages.careers_page import CareersPage
+from utils.browser_pool import BROWSER_LAUNCH_ARGS, CONTEXT_OPTIONS
+from utils.consent_state import warm_up_consent_state
+from utils.keyword_matcher import KeywordMatcher
+from utils.standin_site import StandInSite, build_catalogue
+from utils.tracing import TRACE_START_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+QA_KEYWORDS = ["qa", "quality", "test"]
+
+
+@dataclass
+class Environment:
+    """What the benchmarks run against."""
+
+    playwright: Optional[Playwright]
+    browser: Optional[Browser]
+    url: str
+    consent_state: Optional[Path]
+    repeat: int
+    warmup: int
+    sizes: List[int]
+    standin: bool
+    latency_ms: float
+
+    @asynccontextmanager
+    async def careers_page(
+        self, url: Optional[str] = None, cached: bool = True
+    ) -> AsyncIterator[CareersPage]:
+        """Yields a careers page on a fresh context, not yet navigated."""
+        state = str(self.consent_state) if cached and self.consent_state else None
+        context = await self.browser.new_context(**CONTEXT_OPTIONS, storage_state=state)
+        try:
+            page = await context.new_page()
+            yield CareersPage(page, consent_cached=state is not None, url=url or self.url)
+        finally:
+            await context.close()
+
+
+def _results(samples: Dict[str, List[float]], **params) -> List[BenchmarkResult]:
+    return [BenchmarkResult(name, values, dict(params)) for name, values in samples.items()]
+
+
+async def bench_fixtures(env: Environment) -> List[BenchmarkResult]:
+    """Cost of what the browser, context and page fixtures create and close."""
+
+    async def launch() -> Dict[str, float]:
+        with Timer() as launched:
+            browser = await env.playwright.chromium.launch(args=BROWSER_LAUNCH_ARGS)
+        with Timer() as closed:
+            await browser.close()
+        return {"browser_launch": launched.ms, "browser_close": closed.ms}
+
+    async def context_and_page() -> Dict[str, float]:
+        with Timer() as created:
+            context = await env.browser.new_context(**CONTEXT_OPTIONS)
+        with Timer() as opened:
+            page = await context.new_page()
+        with Timer() as page_closed:
+            await page.close()
+        with Timer() as closed:
+            await context.close()
+        return {
+            "context_create": created.ms,
+            "page_create": opened.ms,
+            "page_close": page_closed.ms,
+            "context_close": closed.ms,
+        }
+
+    # Launches are slow and vary little, so they get fewer repetitions
+    samples = await collect(launch, min(env.repeat, 5), env.warmup)
+    samples.update(await collect(context_and_page, env.repeat, env.warmup))
+    return _results(samples)
+
+
+async def bench_navigate(env: Environment) -> List[BenchmarkResult]:
+    """navigate() latency with the full consent probe and with a cached consent state."""
+
+    async def navigate() -> Dict[str, float]:
+        timings = {}
+        for name, cached in (("navigate_cold", False), ("navigate_cached", True)):
+            if cached and env.consent_state is None:
+                continue
+            async with env.careers_page(cached=cached) as careers_page:
+                with Timer() as timer:
+                    await careers_page.navigate()
+                timings[name] = timer.ms
+        return timings
+
+    return _results(await collect(navigate, env.repeat, env.warmup))
+
+
+async def bench_actions(env: Environment) -> List[BenchmarkResult]:
+    """Round-trips of search_jobs() and the filters, each on a freshly loaded page."""
+    actions: Dict[str, Callable[[CareersPage], object]] = {
+        "search_jobs": lambda page: page.search_jobs("Developer"),
+        "filter_by_location": lambda page: page.filter_by_location("All Cities in Poland"),
+        "filter_by_job_type": lambda page: page.filter_by_job_type("Remote"),
+    }
+
+    async def run_actions() -> Dict[str, float]:
+        timings = {}
+        for name, action in actions.items():
+            async with env.careers_page() as careers_page:
+                await careers_page.navigate()
+                with Timer() as timer:
+                    await action(careers_page)
+                timings[name] = timer.ms
+        return timings
+
+    return _results(await collect(run_actions, env.repeat, env.warmup))
+
+
+async def bench_extraction(env: Environment) -> List[BenchmarkResult]:
+    """get_job_titles() and one iter_job_listings() batch across result-set sizes."""
+    results = []
+    sizes = env.sizes if env.standin else [None]
+    for size in sizes:
+        site = None
+        url = env.url
+        if size is not None:
+            site = StandInSite(
+                catalogue_size=size, page_size=size, latency_ms=env.latency_ms
+            ).start()
+            url = site.careers_url
+        try:
+            async with env.careers_page(url=url, cached=False) as careers_page:
+                await careers_page.navigate()
+
+                async def extract() -> Dict[str, float]:
+                    with Timer() as titles:
+                        job_titles = await careers_page.get_job_titles()
+                    with Timer() as listings:
+                        async for _ in careers_page.iter_job_listings(max_pages=1):
+                            pass
+                    with Timer() as matching:
+                        careers_page.get_job_title(job_titles, QA_KEYWORDS)
+                    return {
+                        "get_job_titles": titles.ms,
+                        "iter_job_listings": listings.ms,
+                        "get_job_title": matching.ms,
+                    }
+
+                samples = await collect(extract, env.repeat, env.warmup)
+                results += _results(samples, size=size if size is not None else "live")
+        finally:
+            if site is not None:
+                site.stop()
+    return results
+
+
+async def bench_tracing(env: Environment) -> List[BenchmarkResult]:
+    """Overhead of each tracing level on a navigate-and-search test."""
+    results = []
+    with tempfile.TemporaryDirectory() as trace_dir:
+        for policy in ("off", "lightweight", "full"):
+            options = TRACE_START_OPTIONS.get(policy)
+
+            async def traced_test() -> Dict[str, float]:
+                async with env.careers_page() as careers_page:
+                    tracing = careers_page.page.context.tracing
+                    with Timer() as total:
+                        with Timer() as started:
+                            if options:
+                                await tracing.start(**options)
+                        await careers_page.navigate()
+                        await careers_page.search_jobs("Developer")
+                        with Timer() as stopped:
+                            if options:
+                                await tracing.stop(path=str(Path(trace_dir) / "trace.zip"))
+                    return {
+                        "traced_test": total.ms,
+                        "trace_overhead": started.ms + stopped.ms,
+                    }
+
+            samples = await collect(traced_test, env.repeat, env.warmup)
+            if not options:
+                samples.pop("trace_overhead")
+            results += _results(samples, policy=policy)
+    return results
+
+
+async def bench_keyword_matching(env: Environment) -> List[BenchmarkResult]:
+    """KeywordMatcher on synthetic titles, no browser involved."""
+    results = []
+    for size in env.sizes:
+        titles = [job.title for job in build_catalogue(size)]
+
+        async def match() -> Dict[str, float]:
+            with Timer() as timer:
+                KeywordMatcher(QA_KEYWORDS).match(titles)
+            return {"keyword_matching": timer.ms}
+
+        results += _results(await collect(match, env.repeat, env.warmup), size=size)
+    return results
+
+
+BENCHMARKS = {
+    "fixtures": bench_fixtures,
+    "navigate": bench_navigate,
+    "actions": bench_actions,
+    "extraction": bench_extraction,
+    "tracing": bench_tracing,
+    "keyword_matching": bench_keyword_matching,
+}
+
+# Benchmarks that run without launching a browser
+BROWSERLESS = {"keyword_matching"}
+
+
+async def run(args: argparse.Namespace) -> List[BenchmarkResult]:
+    """Starts the site and, when needed, the browser and runs the selected benchmarks."""
+    selected = args.only or list(BENCHMARKS)
+    site = None
+    url = args.careers_url
+    if url is None:
+        site = StandInSite(latency_ms=args.latency_ms).start()
+        url = site.careers_url
+    env = Environment(
+        playwright=None,
+        browser=None,
+        url=url,
+        consent_state=None,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        sizes=args.sizes,
+        standin=site is not None,
+        latency_ms=args.latency_ms,
+    )
+    results: List[BenchmarkResult] = []
+    try:
+        async with AsyncExitStack() as stack:
+            if any(name not in BROWSERLESS for name in selected):
+                env.playwright = await stack.enter_async_context(async_playwright())
+                env.browser = await env.playwright.chromium.launch(args=BROWSER_LAUNCH_ARGS)
+                stack.push_async_callback(env.browser.close)
+                state_dir = stack.enter_context(tempfile.TemporaryDirectory())
+                env.consent_state = await warm_up_consent_state(
+                    env.browser, Path(state_dir) / "consent.json", CONTEXT_OPTIONS, url=url
+                )
+            for name in selected:
+                logger.info("Running %s benchmarks", name)
+                results += await BENCHMARKS[name](env)
+    finally:
+        if site is not None:
+            site.stop()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10, help="Recorded samples per benchmark")
+    parser.add_argument("--warmup", type=int, default=1, help="Discarded samples per benchmark")
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run (default: all)"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1000],
+        help="Result-set sizes for the extraction and keyword matching benchmarks",
+    )
+    parser.add_argument("--careers-url", default=None, help="Measure a real site instead")
+    parser.add_argument(
+        "--latency-ms", type=float, default=0, help="Latency added by the stand-in site"
+    )
+    parser.add_argument("--results-dir", type=Path, default=DEFAULT_RESULTS_DIR)
+    parser.add_argument(
+        "--compare", metavar="REF", help="Saved results to compare with: a commit, ref or file"
+    )
+    parser.add_argument("--no-save", action="store_true", help="Do not save the results")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+    results = asyncio.run(run(args))
+    print("\n".join(format_results(results)))
+
+    if args.compare:
+        baseline = load_results(args.compare, args.results_dir)
+        if baseline is None:
+            print(f"\nNo saved results for {args.compare}")
+        else:
+            print(f"\nCompared with {args.compare}:")
+            print("\n".join(compare_results(results, baseline)))
+    if not args.no_save:
+        metadata = {
+            "repeat": args.repeat,
+            "site": args.careers_url or f"stand-in (latency {args.latency_ms} ms)",
+        }
+        path = save_results(results, metadata, args.results_dir)
+        print(f"\nSaved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
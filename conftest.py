@@ -1,104 +1,1182 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Generator, Optional
 import logging
+import os
+import time
+import allure
+import pytest
 import pytest_asyncio
 from pathlib import Path
+from _pytest.runner import call_and_report, runtestprotocol
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from pages.careers_page import CareersPage
 from pages.job_details_page import JobDetailsPage
+from utils.artifact_store import (
+    ArtifactSettings,
+    ArtifactStore,
+    default_store,
+    set_default_store,
+)
+from utils.browser_pool import CONTEXT_OPTIONS, BrowserPool, summarize_pool_stats
+from utils.completion import (
+    ACTION_LATENCIES,
+    FALLBACKS,
+    SETTINGS as COMPLETION_SETTINGS,
+    summarize_latencies,
+)
+from utils.consent_state import (
+    consent_state_path,
+    is_state_fresh,
+    warm_up_consent_state,
+)
+from utils.har import (
+    HAR_MODES,
+    HAR_SCOPES,
+    SHARED_HAR_NAME,
+    attach_har,
+    har_name,
+    merge_hars,
+)
+from utils.job_crawler import JobDetailsCrawler
+from utils.logging_setup import LoggingSettings, SuiteLogging
+from utils.page_pool import WarmPage, WarmPagePool, summarize_warm_pages
+from utils.phase_profiler import (
+    PhaseProfiler,
+    find_regressions,
+    load_baseline,
+    profile_phase,
+    save_baseline,
+    slowest_phases,
+    summarize_phases,
+    write_chrome_trace,
+)
+from utils.readiness import READINESS_STATS, ReadinessEngine, summarize_hit_rates
+from utils.resource_blocking import KNOWN_SIZES, PROFILES, ResourceBlocker
+from utils.resource_monitor import MIB, ResourceMonitor, summarize_resources
+from utils.responsive_matrix import MATRIX_MODES, ResponsiveMatrix
+from utils.scheduling import DurationHistory
+from utils.selector_cache import SELECTOR_CACHE, SELECTOR_CACHE_KEY
+from utils.standin_site import StandInSite
+from utils.tracing import TRACE_POLICIES, AdaptiveTracer
+from utils.web_perf import (
+    PERF_BUDGET_MARKER,
+    WebPerfRecorder,
+    budgets_from_markers,
+    check_budgets,
+)
+from utils.xdist_scheduler import DurationScheduling
 
-
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+KNOWN_SIZES_CACHE_KEY = "resource_blocking/known_sizes"
+
+# Per-worker statistics shipped to the xdist controller for the run summary
+WORKER_OUTPUT_KEYS = (
+    "browser_pool",
+    "readiness",
+    "trace_fallbacks",
+    "action_latencies",
+    "phase_profile",
+    "warm_pages",
+    "resource_monitor",
+    "recorded_hars",
+)
+
 
+@pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """Set report attribute for each phase of a call (setup, call, teardown).
-    Simply set the report attribute - the CallInfo object is the result itself
+    """Set report attribute for each phase of a call (setup, call, teardown)."""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Save the test's web performance metrics and check them against its budgets.
+
+    Budgets fail the test only with --perf-budgets; otherwise violations are
+    logged, so runs against production do not fail on its variable timings.
     """
-    setattr(item, f"rep_{call.when}", call)
+    outcome = yield
+    recorder = item.funcargs.get("web_perf")
+    if recorder is None or not recorder.samples:
+        return
+    path = recorder.save(
+        Path(item.config.getoption("web_perf_dir")) / f"{har_name(item.nodeid)}.json"
+    )
+    allure.attach.file(
+        str(path), name="Web performance", attachment_type=allure.attachment_type.JSON
+    )
+    budgets = budgets_from_markers(item.iter_markers(PERF_BUDGET_MARKER))
+    violations = check_budgets(recorder.samples, budgets)
+    if not violations:
+        return
+    message = "Web performance over budget: " + "; ".join(map(str, violations))
+    if not item.config.getoption("perf_budgets"):
+        logger.warning("%s (not enforced without --perf-budgets)", message)
+    elif outcome.excinfo is None:
+        outcome.force_exception(AssertionError(message))
+
+
+def pytest_runtest_logstart(nodeid, location):
+    """Link the artifacts stored from now on to the starting test."""
+    default_store().current_test = nodeid
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    """Stop linking artifacts to the finished test."""
+    default_store().current_test = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    """Attach the test's screenshots and traces to its Allure result."""
+    yield
+    for artifact in item.config.suite_artifacts.artifacts_for(item.nodeid):
+        allure.attach.file(
+            str(artifact.path),
+            name=f"{artifact.kind}: {artifact.name}",
+            extension=artifact.path.suffix.lstrip("."),
+        )
+
+
+def _retry_item(item):
+    """Copy a test item, as pytest-asyncio does, for a rerun with its own request."""
+    retry = type(item).from_parent(
+        item.parent,
+        name=item.name,
+        callspec=getattr(item, "callspec", None),
+        callobj=item.obj,
+        fixtureinfo=item._fixtureinfo,
+        keywords=item.keywords,
+        originalname=item.originalname,
+    )
+    retry.own_markers = item.own_markers
+    retry._trace_retry = True
+    return retry
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Rerun failed browser tests with full tracing under the on-failure-retry policy.
+
+    Untraced baseline tests of the adaptive tracer are rerun the same way.
+    The first run's reports are the ones logged, so a test that passes on the
+    traced rerun still counts as failed; the rerun only produces the trace.
+    It runs on a copy of the item that the first run's teardown treats as the
+    next test, so only function-scoped fixtures are set up again. Tests
+    without a browser context are neither baselines nor rerun.
+    """
+    tracer = getattr(item.config, "suite_tracer", None)
+    if tracer is None or "context" not in item.fixturenames:
+        return None
+    item._trace_baseline = tracer.takes_baseline()
+    if not tracer.retries_failures and not item._trace_baseline:
+        return None
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    failed = False
+    if call_and_report(item, "setup").passed:
+        failed = call_and_report(item, "call").failed
+    retry = None
+    if item.session.shouldfail or item.session.shouldstop:
+        # The session is ending: tear everything down, as pytest does
+        nextitem = None
+    elif failed and tracer.take_rerun():
+        retry = _retry_item(item)
+    elif failed:
+        logger.warning(
+            "Not rerunning %s: %d traced reruns already taken",
+            item.nodeid,
+            tracer.max_reruns,
+        )
+    call_and_report(item, "teardown", nextitem=retry or nextitem)
+    if retry is not None:
+        logger.info("Rerunning %s with tracing to capture the failure", item.nodeid)
+        runtestprotocol(retry, nextitem=nextitem, log=False)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Balance `-n` runs by historical test durations instead of test count."""
+    if config.getoption("dist") != "load" or config.getoption("no_duration_scheduling"):
+        return None
+    return DurationScheduling(config, log, history=config.suite_durations)
+
+
+def pytest_addoption(parser):
+    """Register the suite's command line options."""
+    group = parser.getgroup("careers suite")
+    group.addoption(
+        "--browser-pool-size",
+        type=int,
+        default=1,
+        help="Number of browsers kept alive per worker (default: 1)",
+    )
+    group.addoption(
+        "--browser-max-uses",
+        type=int,
+        default=50,
+        help="Number of tests a pooled browser serves before it is restarted",
+    )
+    group.addoption(
+        "--resource-monitor",
+        action="store_true",
+        default=False,
+        help="Sample browser RSS, CPU, JS heap and open contexts around each "
+        "test and report leaks",
+    )
+    group.addoption(
+        "--leak-threshold-mb",
+        type=float,
+        default=50,
+        help="Browser RSS growth across --leak-window tests reported as a leak",
+    )
+    group.addoption(
+        "--leak-window",
+        type=int,
+        default=10,
+        help="Consecutive tests over which growth must persist to be a leak",
+    )
+    group.addoption(
+        "--browser-memory-ceiling-mb",
+        type=float,
+        default=None,
+        help="Restart a browser whose RSS exceeds this after a test "
+        "(implies --resource-monitor)",
+    )
+    group.addoption(
+        "--careers-url",
+        default=None,
+        help="Careers page under test (default: $CAREERS_URL or the production site)",
+    )
+    group.addoption(
+        "--standin-site",
+        action="store_true",
+        default=False,
+        help="Run against the in-process stand-in careers site",
+    )
+    group.addoption(
+        "--standin-jobs",
+        type=int,
+        default=200,
+        help="Number of job listings served by the stand-in site",
+    )
+    group.addoption(
+        "--standin-latency-ms",
+        type=float,
+        default=0,
+        help="Latency added to every stand-in site response",
+    )
+    group.addoption(
+        "--warm-pages",
+        type=int,
+        default=1,
+        help="Careers pages navigated in the background ahead of the tests; "
+        "0 navigates each test's page in its own setup (default: 1)",
+    )
+    group.addoption(
+        "--no-consent-cache",
+        action="store_true",
+        default=False,
+        help="Run the full verification/cookie probe in every test",
+    )
+    group.addoption(
+        "--no-selector-cache",
+        action="store_true",
+        default=False,
+        help="Check the readiness selectors in their declared order, without "
+        "the order learnt on previous runs",
+    )
+    group.addoption(
+        "--consent-state-max-age",
+        type=float,
+        default=3600,
+        help="Seconds a saved consent state is reused before a new warm-up",
+    )
+    group.addoption(
+        "--resource-profile",
+        choices=sorted(PROFILES),
+        default="full",
+        help="Requests to block in test contexts, unless a test sets the "
+        "resource_profile marker (default: full)",
+    )
+    group.addoption(
+        "--trace-policy",
+        choices=TRACE_POLICIES,
+        default="full",
+        help="Tracing of test contexts: off, on-failure-retry (rerun failures "
+        "with tracing), lightweight (no snapshots/sources) or full",
+    )
+    group.addoption(
+        "--trace-budget",
+        type=float,
+        default=0.1,
+        help="Trace overhead, as a fraction of test time, above which tracing "
+        "falls back to a lighter policy; 0 disables the fallback (default: 0.1)",
+    )
+    group.addoption(
+        "--trace-baseline-every",
+        type=int,
+        default=10,
+        help="Run every N-th test untraced to measure the action latency that "
+        "tracing adds; 0 counts only tracing start/stop time (default: 10)",
+    )
+    group.addoption(
+        "--trace-max-reruns",
+        type=int,
+        default=5,
+        help="Failed tests rerun per worker with tracing to capture a trace, "
+        "under on-failure-retry or as baselines; 0 disables reruns (default: 5)",
+    )
+    group.addoption(
+        "--completion-fallback",
+        choices=FALLBACKS,
+        default="networkidle",
+        help="What page actions do when their completion signal does not fire: "
+        "wait for networkidle or fail (default: networkidle)",
+    )
+    group.addoption(
+        "--crawl-concurrency",
+        type=int,
+        default=4,
+        help="Job details pages read at the same time by the crawler (default: 4)",
+    )
+    group.addoption(
+        "--crawl-retries",
+        type=int,
+        default=2,
+        help="Retries, with exponential backoff, per job details page (default: 2)",
+    )
+    group.addoption(
+        "--responsive-mode",
+        choices=MATRIX_MODES,
+        default="in-turn",
+        help="Check the device matrix by resizing the loaded page in turn, or "
+        "in parallel contexts created from its storage state (default: in-turn)",
+    )
+    group.addoption(
+        "--no-web-perf",
+        action="store_true",
+        default=False,
+        help="Do not collect web performance metrics in the page objects",
+    )
+    group.addoption(
+        "--web-perf-dir",
+        default="web_perf",
+        help="Directory of the per-test web performance JSON files (default: web_perf)",
+    )
+    group.addoption(
+        "--perf-budgets",
+        action="store_true",
+        default=False,
+        help="Fail tests whose web performance goes over their perf_budget "
+        "markers; without it violations are only logged",
+    )
+    group.addoption(
+        "--phase-profile",
+        default=None,
+        metavar="PATH",
+        help="Time fixture setup/teardown, test calls and page-object methods "
+        "and write a Chrome trace-event timeline to PATH",
+    )
+    group.addoption(
+        "--phase-baseline",
+        default=None,
+        metavar="PATH",
+        help="Compare the phase timings with a baseline, created on the first run",
+    )
+    group.addoption(
+        "--phase-update-baseline",
+        action="store_true",
+        default=False,
+        help="Overwrite the phase baseline with this run's timings",
+    )
+    group.addoption(
+        "--phase-threshold",
+        type=float,
+        default=0.2,
+        help="Growth of a phase's mean time over the baseline reported as a "
+        "regression, as a fraction (default: 0.2)",
+    )
+    group.addoption(
+        "--phase-fail-on-regression",
+        action="store_true",
+        default=False,
+        help="Fail the run when a phase regressed against the baseline",
+    )
+    group.addoption(
+        "--log-json",
+        default=LoggingSettings.json_path,
+        metavar="PATH",
+        help="JSON lines file receiving every log record, tagged with the test "
+        "and phase; empty to disable (default: %(default)s)",
+    )
+    group.addoption(
+        "--log-max-chars",
+        type=int,
+        default=LoggingSettings.max_chars,
+        help="Longest log message or string argument kept (default: %(default)s)",
+    )
+    group.addoption(
+        "--log-max-items",
+        type=int,
+        default=LoggingSettings.max_items,
+        help="Items of a list or dict log argument kept (default: %(default)s)",
+    )
+    group.addoption(
+        "--no-duration-scheduling",
+        action="store_true",
+        default=False,
+        help="Use xdist's own load scheduling instead of balancing workers by "
+        "the tests' recorded durations",
+    )
+    group.addoption(
+        "--artifacts-dir",
+        default=ArtifactSettings.root,
+        help="Directory of the error screenshots and traces (default: %(default)s)",
+    )
+    group.addoption(
+        "--artifacts-max-mb",
+        type=float,
+        default=ArtifactSettings.max_bytes / 1024 / 1024,
+        help="Size of the artifacts kept; the oldest are deleted beyond it, "
+        "0 keeps everything (default: %(default)s)",
+    )
+    group.addoption(
+        "--artifacts-max-age-days",
+        type=float,
+        default=ArtifactSettings.max_age_days,
+        help="Days an artifact is kept, 0 keeps them forever (default: %(default)s)",
+    )
+    group.addoption(
+        "--artifacts-compress",
+        action="store_true",
+        default=False,
+        help="Deflate the trace archives before storing them",
+    )
+    group.addoption(
+        "--har-mode",
+        choices=HAR_MODES,
+        default="off",
+        help="Record each test's traffic to a HAR archive or replay it from disk",
+    )
+    group.addoption(
+        "--har-scope",
+        choices=HAR_SCOPES,
+        default="test",
+        help="Replay from one archive per test or from one shared archive",
+    )
+    group.addoption(
+        "--har-dir",
+        default="hars",
+        help="Directory holding the HAR archives (default: hars)",
+    )
 
 
 def pytest_configure(config):
     """Configure pytest."""
     config.addinivalue_line("markers", "asyncio: mark test as async")
+    # Every module logs through here; the level follows pytest's --log-level
+    config.suite_logging = SuiteLogging(
+        LoggingSettings(
+            level=(config.getoption("log_level") or "INFO").upper(),
+            json_path=config.getoption("log_json") or None,
+            max_chars=config.getoption("log_max_chars"),
+            max_items=config.getoption("log_max_items"),
+        )
+    )
+    config.suite_logging.start()
+    config.pluginmanager.register(config.suite_logging.plugin, "suite_logging")
+    # None when the cacheprovider plugin is disabled (-p no:cacheprovider)
+    cache = getattr(config, "cache", None)
+    config.suite_worker_output = {}
+    config.suite_recorded_hars = set()
+    config.suite_schedule = None
+    config.suite_durations = None
+    if not hasattr(config, "workerinput"):
+        # Test reports reach the controller, which keeps the durations
+        config.suite_durations = DurationHistory.load(cache)
+        config.pluginmanager.register(config.suite_durations, "duration_history")
+    config.suite_artifacts = ArtifactStore(
+        ArtifactSettings(
+            root=config.getoption("artifacts_dir"),
+            max_bytes=int(config.getoption("artifacts_max_mb") * 1024 * 1024),
+            max_age_days=config.getoption("artifacts_max_age_days"),
+            compress=config.getoption("artifacts_compress"),
+        )
+    )
+    # Page objects created without a store (e.g. in the consent warm-up) use it too
+    set_default_store(config.suite_artifacts)
+    COMPLETION_SETTINGS.fallback = config.getoption("completion_fallback")
+    config.suite_tracer = AdaptiveTracer(
+        config.getoption("trace_policy"),
+        config.getoption("trace_budget"),
+        baseline_every=config.getoption("trace_baseline_every"),
+        max_reruns=config.getoption("trace_max_reruns"),
+    )
+    if cache is not None:
+        KNOWN_SIZES.update(cache.get(KNOWN_SIZES_CACHE_KEY, {}))
+    SELECTOR_CACHE.enabled = not config.getoption("no_selector_cache")
+    if SELECTOR_CACHE.enabled and cache is not None:
+        SELECTOR_CACHE.load(cache.get(SELECTOR_CACHE_KEY, {}))
+    config.suite_resource_monitor = None
+    ceiling = config.getoption("browser_memory_ceiling_mb")
+    if config.getoption("resource_monitor") or ceiling:
+        config.suite_resource_monitor = ResourceMonitor(
+            leak_threshold_mb=config.getoption("leak_threshold_mb"),
+            window=config.getoption("leak_window"),
+            ceiling_mb=ceiling,
+        )
+    config.suite_profiler = None
+    if config.getoption("phase_profile"):
+        profiler = PhaseProfiler()
+        profiler.instrument(BrowserPool, "browser")
+        profiler.instrument(ReadinessEngine, "readiness")
+        profiler.instrument(CareersPage, "page")
+        profiler.instrument(JobDetailsPage, "page")
+        profiler.start()
+        config.pluginmanager.register(profiler, "phase_profiler")
+        config.suite_profiler = profiler
+
+
+def pytest_unconfigure(config):
+    """Undo the phase profiler's instrumentation and flush the artifacts and logs."""
+    profiler = getattr(config, "suite_profiler", None)
+    if profiler is not None:
+        profiler.stop()
+    artifacts = getattr(config, "suite_artifacts", None)
+    if artifacts is not None:
+        artifacts.close()
+        set_default_store(None)
+    suite_logging = getattr(config, "suite_logging", None)
+    if suite_logging is not None:
+        suite_logging.stop()
+
+
+def _record_worker_output(config, key, value):
+    """Store per-worker data for the summary, shipping it to the xdist controller."""
+    if hasattr(config, "workeroutput"):
+        config.workeroutput[key] = value
+    else:
+        config.suite_worker_output.setdefault(key, []).append(value)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect the data recorded by an xdist worker once it shuts down."""
+    output = getattr(node, "workeroutput", {})
+    for key in WORKER_OUTPUT_KEYS:
+        if key in output:
+            node.config.suite_worker_output.setdefault(key, []).append(output[key])
+
+
+def _report_phases(session):
+    """Write the phase timeline and compare the timings with the baseline."""
+    config = session.config
+    events = [
+        event
+        for worker_events in config.suite_worker_output.get("phase_profile", [])
+        for event in worker_events
+    ]
+    path = write_chrome_trace(events, Path(config.getoption("phase_profile")))
+    summary = summarize_phases(events)
+    report = {"timeline": str(path), "slowest": slowest_phases(summary), "regressions": []}
+
+    baseline_path = config.getoption("phase_baseline")
+    if baseline_path:
+        baseline_path = Path(baseline_path)
+        baseline = load_baseline(baseline_path)
+        if baseline is None or config.getoption("phase_update_baseline"):
+            save_baseline(summary, baseline_path)
+            logger.info("Saved phase baseline to %s", baseline_path)
+        else:
+            report["regressions"] = find_regressions(
+                summary, baseline, config.getoption("phase_threshold")
+            )
+            if report["regressions"] and config.getoption("phase_fail_on_regression"):
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    config.suite_phase_report = report
+
+
+# Last, so session-scoped fixtures are already torn down (and profiled)
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    """Hand this worker's collected statistics to the summary."""
+    config = session.config
+    cache = getattr(config, "cache", None)
+    if cache is not None and KNOWN_SIZES:
+        # Merge rather than overwrite: xdist workers share the same cache entry
+        known_sizes = KNOWN_SIZES.merge(cache.get(KNOWN_SIZES_CACHE_KEY, {}))
+        cache.set(KNOWN_SIZES_CACHE_KEY, known_sizes)
+    if cache is not None and SELECTOR_CACHE.enabled and SELECTOR_CACHE.session:
+        # Other workers may have saved since this one loaded, so add to their entry
+        selectors = SELECTOR_CACHE.dump(cache.get(SELECTOR_CACHE_KEY, {}))
+        cache.set(SELECTOR_CACHE_KEY, selectors)
+    if config.suite_recorded_hars:
+        recorded_hars = sorted(config.suite_recorded_hars)
+        _record_worker_output(config, "recorded_hars", recorded_hars)
+    if (
+        config.getoption("har_mode") == "record"
+        and config.getoption("har_scope") == "shared"
+        and not hasattr(config, "workerinput")
+    ):
+        # Only this session's archives: older ones in the directory may be stale
+        har_dir = Path(config.getoption("har_dir"))
+        shared = har_dir / f"{SHARED_HAR_NAME}.har"
+        recorded = {
+            name
+            for names in config.suite_worker_output.get("recorded_hars", [])
+            for name in names
+        }
+        entries = merge_hars((har_dir / name for name in recorded), shared)
+        logger.info("Merged %d recorded entries into %s", entries, shared)
+    if config.suite_durations is not None:
+        config.suite_durations.save(cache)
+    if config.suite_tracer.fallbacks:
+        _record_worker_output(config, "trace_fallbacks", config.suite_tracer.fallbacks)
+    readiness = READINESS_STATS.snapshot()
+    if readiness:
+        _record_worker_output(config, "readiness", readiness)
+    latencies = ACTION_LATENCIES.snapshot()
+    if latencies:
+        _record_worker_output(config, "action_latencies", latencies)
+    monitor = config.suite_resource_monitor
+    if monitor is not None and monitor.tests:
+        _record_worker_output(config, "resource_monitor", monitor.snapshot())
+    if config.suite_profiler is not None:
+        _record_worker_output(config, "phase_profile", config.suite_profiler.events)
+        if not hasattr(config, "workerinput"):
+            _report_phases(session)
+
+
+def _teardown_properties(terminalreporter):
+    """Yield each test's node id and user properties, once per test."""
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) == "teardown":
+                yield report.nodeid, dict(report.user_properties)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report suite infrastructure statistics at the end of the run."""
+    outputs = getattr(config, "suite_worker_output", {})
+    pool_summary = summarize_pool_stats(outputs.get("browser_pool", []))
+    if pool_summary:
+        terminalreporter.write_sep("-", "browser pool")
+        terminalreporter.write_line(pool_summary)
+    warm_summary = summarize_warm_pages(outputs.get("warm_pages", []))
+    if warm_summary:
+        terminalreporter.write_sep("-", "warm page pool")
+        terminalreporter.write_line(warm_summary)
+    readiness_lines = summarize_hit_rates(outputs.get("readiness", []))
+    if readiness_lines:
+        terminalreporter.write_sep("-", "readiness selector hit rates")
+        for line in readiness_lines:
+            terminalreporter.write_line(line)
+
+    resource_lines = summarize_resources(outputs.get("resource_monitor", []))
+    if resource_lines:
+        terminalreporter.write_sep("-", "browser resources")
+        for line in resource_lines:
+            terminalreporter.write_line(line)
+
+    latency_lines = summarize_latencies(outputs.get("action_latencies", []))
+    if latency_lines:
+        terminalreporter.write_sep("-", "page action latency")
+        for line in latency_lines:
+            terminalreporter.write_line(line)
+
+    blocked = saved = 0
+    trace_overheads = {}
+    for nodeid, props in _teardown_properties(terminalreporter):
+        blocked += props.get("blocked_requests", 0)
+        saved += props.get("blocked_bytes_saved", 0)
+        if "trace_overhead_s" in props:
+            trace_overheads[nodeid] = props["trace_overhead_s"]
+    if blocked:
+        terminalreporter.write_sep("-", "resource blocking")
+        terminalreporter.write_line(
+            f"{blocked} requests blocked, ~{saved / 1024:.0f} KiB saved"
+        )
+
+    if trace_overheads:
+        terminalreporter.write_sep("-", "trace overhead")
+        total = sum(trace_overheads.values())
+        terminalreporter.write_line(
+            f"{total:.2f}s over {len(trace_overheads)} traced tests "
+            f"({total / len(trace_overheads):.2f}s per test)"
+        )
+        slowest = sorted(trace_overheads.items(), key=lambda i: -i[1])[:5]
+        for nodeid, overhead in slowest:
+            terminalreporter.write_line(f"  {overhead:.3f}s {nodeid}")
+        for fallbacks in outputs.get("trace_fallbacks", []):
+            terminalreporter.write_line(f"Fell back: {', '.join(fallbacks)}")
+
+    plan = getattr(config, "suite_schedule", None)
+    if plan is not None:
+        terminalreporter.write_sep("-", "duration scheduling")
+        terminalreporter.write_line(
+            f"Planned {plan.makespan:.1f}s on {len(plan.workers)} workers "
+            f"(ideal {plan.ideal:.1f}s): "
+            + ", ".join(f"{load:.1f}s" for load in plan.loads)
+        )
+
+    phase_report = getattr(config, "suite_phase_report", None)
+    if phase_report:
+        terminalreporter.write_sep("-", "slowest phases")
+        for line in phase_report["slowest"]:
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Timeline: {phase_report['timeline']}")
+        if phase_report["regressions"]:
+            terminalreporter.write_sep("-", "phase regressions", yellow=True)
+            for line in phase_report["regressions"]:
+                terminalreporter.write_line(line)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def browser_pool(pytestconfig) -> AsyncGenerator[BrowserPool, None]:
+    """Start Playwright once per worker and share a pool of browsers."""
+    logger.info("Starting browser pool")
+    async with async_playwright() as p:
+        pool = BrowserPool(
+            p,
+            size=pytestconfig.getoption("browser_pool_size"),
+            max_uses=pytestconfig.getoption("browser_max_uses"),
+            headless=True,  # Set to False if you want to see the browser
+            launch_timeout=60000,  # 60 seconds timeout
+        )
+        try:
+            yield pool
+        finally:
+            stats = pool.stats()
+            logger.info("Browser pool stats: %s", stats)
+            _record_worker_output(pytestconfig, "browser_pool", stats)
+            await pool.close()
 
 
 @pytest_asyncio.fixture(scope="function")
-async def browser() -> AsyncGenerator[Browser, None]:
-    """Launch a browser instance for the tests."""
+async def browser(
+    browser_pool: BrowserPool, request
+) -> AsyncGenerator[Browser, None]:
+    """Lease a pooled browser instance for the test."""
     logger.info("Starting browser fixture")
     try:
-        async with async_playwright() as p:
-            logger.debug("Launching browser")
-            browser_instance = await p.chromium.launch(
-                headless=True,  # Set to False if you want to see the browser
-                args=[
-                    "--start-maximized",
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                ],
-                timeout=60000,  # 60 seconds timeout
+        entry = await browser_pool.acquire()
+    except Exception as e:
+        logger.error("Error in browser fixture: %s", e)
+        raise
+    monitor = request.config.suite_resource_monitor
+    before = None
+    try:
+        if monitor is not None:
+            before = await monitor.sample(entry.browser)
+        yield entry.browser
+    finally:
+        if before is not None:
+            await _record_resources(monitor, browser_pool, entry, before, request.node)
+        await browser_pool.release(entry)
+
+
+async def _record_resources(monitor, browser_pool, entry, before, node):
+    """Attribute the browser's growth to the test, restarting it over the ceiling.
+
+    Runs after the test's pages and context were closed, so whatever they left
+    behind counts against the test.
+    """
+    try:
+        after = await monitor.sample(entry.browser)
+    except Exception as e:
+        logger.error("Error sampling browser resources: %s", e)
+        return
+    usage = monitor.record(
+        entry.browser,
+        node.nodeid,
+        before,
+        after,
+        js_heap_bytes=getattr(node, "js_heap_bytes", None),
+    )
+    logger.info("Browser resources after test: %s", usage)
+    if usage.rss_growth is not None:
+        node.user_properties.append(
+            ("browser_rss_growth_mb", round(usage.rss_growth / MIB, 1))
+        )
+    if usage.contexts_left > 0:
+        logger.warning("%s left %d browser contexts open", node.nodeid, usage.contexts_left)
+    if monitor.over_ceiling(usage):
+        logger.warning(
+            "Browser RSS %.0f MiB is over the ceiling, restarting it",
+            usage.rss_bytes / MIB,
+        )
+        monitor.restarts += 1
+        await browser_pool.restart(entry)
+
+
+def _resource_profile(request):
+    """Resolve the resource profile from the test's marker or the CLI option."""
+    marker = request.node.get_closest_marker("resource_profile")
+    name = marker.args[0] if marker else request.config.getoption("resource_profile")
+    if name not in PROFILES:
+        raise pytest.UsageError(f"Unknown resource profile: {name}")
+    return PROFILES[name]
+
+
+async def _attach_har(browser_context, config, name):
+    """Record or replay the context's traffic as selected by --har-mode."""
+    path = await attach_har(
+        browser_context,
+        config.getoption("har_mode"),
+        Path(config.getoption("har_dir")),
+        name,
+        config.getoption("har_scope"),
+    )
+    if path is not None and config.getoption("har_mode") == "record":
+        config.suite_recorded_hars.add(path.name)
+    return path
+
+
+def _consent_har_name(config) -> str:
+    """Archive name of the consent warm-up, one per xdist worker.
+
+    Workers recording at once would otherwise write the same archive. A replay
+    with other workers than the recording uses another worker's archive.
+    """
+    worker = getattr(config, "workerinput", {}).get("workerid")
+    name = f"consent_warmup_{worker}" if worker else "consent_warmup"
+    har_dir = Path(config.getoption("har_dir"))
+    replay = config.getoption("har_mode") == "replay"
+    if replay and not (har_dir / f"{name}.har").exists():
+        recorded = sorted(har_dir.glob("consent_warmup*.har"))
+        if recorded:
+            name = recorded[0].stem
+    return name
+
+
+@pytest.fixture(scope="session")
+def careers_url(pytestconfig) -> Generator[str, None, None]:
+    """Return the careers page URL, starting the stand-in site if requested."""
+    if pytestconfig.getoption("standin_site"):
+        with StandInSite(
+            catalogue_size=pytestconfig.getoption("standin_jobs"),
+            latency_ms=pytestconfig.getoption("standin_latency_ms"),
+        ) as site:
+            yield site.careers_url
+        return
+    yield (
+        pytestconfig.getoption("careers_url")
+        or os.environ.get("CAREERS_URL")
+        or CareersPage.DEFAULT_URL
+    )
+
+
+@pytest_asyncio.fixture(scope="session")
+async def consent_state(
+    browser_pool: BrowserPool, careers_url: str, pytestconfig
+) -> Optional[Path]:
+    """Accept consent once per worker and return the saved storage state."""
+    if pytestconfig.getoption("no_consent_cache"):
+        return None
+    path = consent_state_path(careers_url)
+    if is_state_fresh(path, pytestconfig.getoption("consent_state_max_age")):
+        logger.info("Reusing saved consent state from %s", path)
+        return path
+    entry = await browser_pool.acquire(for_test=False)
+    try:
+        return await warm_up_consent_state(
+            entry.browser,
+            path,
+            CONTEXT_OPTIONS,
+            prepare_context=lambda c: _attach_har(
+                c, pytestconfig, _consent_har_name(pytestconfig)
+            ),
+            url=careers_url,
+        )
+    finally:
+        await browser_pool.release(entry)
+
+
+async def _stop_tracing(browser_context, node, retry, artifacts):
+    """Stop tracing, handing the trace of failed or retried tests to the artifact store.
+
+    Returns:
+        float: Seconds spent stopping the trace.
+    """
+    started = time.perf_counter()
+    try:
+        # Check if test failed - use the call report stored on the node
+        failed = hasattr(node, "rep_call") and node.rep_call.failed
+        if failed or retry:
+            logger.error("Test %s failed, saving trace", node.name)
+            suffix = "-retry" if retry else ""
+            trace_path = artifacts.staging_path(".zip")
+            await browser_context.tracing.stop(path=str(trace_path))
+            artifacts.save_file(trace_path, f"{node.name}{suffix}", "traces", node.nodeid)
+        else:
+            logger.info("Test %s passed, not saving trace", node.name)
+            await browser_context.tracing.stop()
+    except Exception as e:
+        logger.error("Error in trace handling: %s", e)
+        # Ensure tracing is stopped even if there's an error
+        try:
+            await browser_context.tracing.stop()
+        except Exception as close_error:
+            logger.error("Error stopping trace: %s", close_error)
+    return time.perf_counter() - started
+
+
+async def _open_context(browser, consent_state, config, har, profile, careers_url):
+    """Create a context with the consent state, HAR and resource blocking of a test."""
+    with profile_phase("browser.new_context", "context"):
+        browser_context = await browser.new_context(
+            **CONTEXT_OPTIONS,
+            storage_state=str(consent_state) if consent_state else None,
+        )
+    # Attach the HAR first: routes registered later run first, so blocked
+    # requests never reach the recorder or the replayer
+    await _attach_har(browser_context, config, har)
+    blocker = ResourceBlocker(profile, careers_url)
+    await blocker.install(browser_context)
+    return browser_context, blocker
+
+
+async def _start_tracing(browser_context, trace_options) -> float:
+    """Start tracing if the policy asks for it, returning the seconds it took."""
+    if not trace_options:
+        return 0.0
+    started = time.perf_counter()
+    with profile_phase("tracing.start", "tracing"):
+        await browser_context.tracing.start(**trace_options)
+    return time.perf_counter() - started
+
+
+@pytest_asyncio.fixture(scope="session")
+async def warm_page_pool(
+    browser_pool: BrowserPool,
+    consent_state: Optional[Path],
+    careers_url: str,
+    pytestconfig,
+) -> AsyncGenerator[Optional[WarmPagePool], None]:
+    """Navigate careers pages in the background, ahead of the tests using them."""
+    depth = pytestconfig.getoption("warm_pages")
+    if depth <= 0 or pytestconfig.getoption("har_mode") != "off":
+        # Recorded and replayed traffic is tied to the test, so it cannot be prefetched
+        yield None
+        return
+    if pytestconfig.suite_resource_monitor is not None:
+        # A page prefetched during the previous test would be charged to that test
+        logger.info("Resource monitor enabled, not prefetching careers pages")
+        yield None
+        return
+    profile = PROFILES[pytestconfig.getoption("resource_profile")]
+    tracer = pytestconfig.suite_tracer
+    collect_web_perf = not pytestconfig.getoption("no_web_perf")
+
+    async def prefetch() -> WarmPage:
+        entry = await browser_pool.acquire(for_test=False)
+        browser_context = None
+        try:
+            browser_context, blocker = await _open_context(
+                entry.browser,
+                consent_state,
+                pytestconfig,
+                "warm_page",
+                profile,
+                careers_url,
+            )
+            # Trace from the start, so a failed test's trace shows the navigation
+            trace_options = tracer.start_options()
+            trace_seconds = await _start_tracing(browser_context, trace_options)
+            careers = CareersPage(
+                await browser_context.new_page(),
+                consent_cached=consent_state is not None,
+                url=careers_url,
+                web_perf=WebPerfRecorder(enabled=collect_web_perf),
             )
-            logger.info("Browser launched successfully")
+            await careers.navigate()
+        except BaseException:
+            if browser_context is not None:
+                await browser_context.close()
+            await browser_pool.release(entry)
+            raise
+
+        async def close():
             try:
-                yield browser_instance
+                await browser_context.close()
             finally:
-                logger.debug("Closing browser")
-                try:
-                    await browser_instance.close()
-                    logger.info("Browser closed successfully")
-                except Exception as e:
-                    logger.error(f"Error closing browser: {e}")
-    except Exception as e:
-        logger.error(f"Error in browser fixture: {e}")
-        raise
+                await browser_pool.release(entry)
+
+        return WarmPage(
+            careers,
+            browser_context,
+            close,
+            extras={
+                "blocker": blocker,
+                "trace_options": trace_options,
+                "trace_seconds": trace_seconds,
+            },
+        )
+
+    pool = WarmPagePool(prefetch, depth)
+    try:
+        yield pool
+    finally:
+        stats = pool.stats()
+        logger.info("Warm page pool stats: %s", stats)
+        _record_worker_output(pytestconfig, "warm_pages", stats)
+        await pool.close()
+
+
+def _wants_warm_page(request, retry) -> bool:
+    """Whether the test can take a prefetched careers page.
+
+    Traced reruns, untraced baseline tests and tests with their own resource
+    profile get a fresh context.
+    """
+    return (
+        "careers_page" in request.fixturenames
+        and not retry
+        and not getattr(request.node, "_trace_baseline", False)
+        and request.node.get_closest_marker("resource_profile") is None
+    )
 
 
 @pytest_asyncio.fixture(scope="function")
-async def context(browser: Browser) -> AsyncGenerator[BrowserContext, None]:
-    """Create a new browser context for each test."""
+async def context(
+    browser: Browser,
+    consent_state: Optional[Path],
+    careers_url: str,
+    warm_page_pool: Optional[WarmPagePool],
+    request,
+) -> AsyncGenerator[BrowserContext, None]:
+    """Create a new browser context for each test, or take a prefetched one."""
     logger.debug("Creating new browser context")
+    tracer = request.config.suite_tracer
+    retry = getattr(request.node, "_trace_retry", False)
+    baseline = getattr(request.node, "_trace_baseline", False) and not retry
+    warm = None
     try:
-        browser_context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            viewport={"width": 1920, "height": 1080},
-            ignore_https_errors=True,
-            service_workers="block",  # Disable service workers for better stability
-        )
+        if warm_page_pool is not None and _wants_warm_page(request, retry):
+            warm = await warm_page_pool.acquire()
+            browser_context = warm.context
+            blocker = warm.extras["blocker"]
+            trace_options = warm.extras["trace_options"]
+            trace_overhead = warm.extras["trace_seconds"]
+        else:
+            browser_context, blocker = await _open_context(
+                browser,
+                consent_state,
+                request.config,
+                har_name(request.node.nodeid),
+                _resource_profile(request),
+                careers_url,
+            )
+            trace_options = None if baseline else tracer.start_options(retry)
+            trace_overhead = await _start_tracing(browser_context, trace_options)
+        request.node.warm_page = warm
         logger.info("Browser context created successfully")
+        ACTION_LATENCIES.start_test()
+        test_started = time.perf_counter()
         try:
             yield browser_context
         finally:
+            actions = [
+                (timing.action, timing.seconds)
+                for timing in ACTION_LATENCIES.test_timings
+            ]
+            if not trace_options and not retry:
+                tracer.record_baseline(actions)
+            if trace_options:
+                with profile_phase("tracing.stop", "tracing"):
+                    trace_overhead += await _stop_tracing(
+                        browser_context,
+                        request.node,
+                        retry,
+                        request.config.suite_artifacts,
+                    )
+                if not retry:
+                    duration = time.perf_counter() - test_started + trace_overhead
+                    trace_overhead = tracer.record(trace_overhead, duration, actions)
+                logger.info("Trace overhead: %.3fs", trace_overhead)
+                request.node.user_properties.append(
+                    ("trace_overhead_s", round(trace_overhead, 3))
+                )
+            logger.info("Resource blocking: %s", blocker.summary())
+            request.node.user_properties.append(
+                ("blocked_requests", blocker.blocked_requests)
+            )
+            request.node.user_properties.append(
+                ("blocked_bytes_saved", blocker.bytes_saved)
+            )
             logger.debug("Closing browser context")
             try:
-                await browser_context.close()
+                with profile_phase("context.close", "context"):
+                    if warm is not None:
+                        await warm_page_pool.release(warm)
+                    else:
+                        await browser_context.close()
                 logger.info("Browser context closed successfully")
             except Exception as e:
-                logger.error(f"Error closing browser context: {e}")
+                logger.error("Error closing browser context: %s", e)
     except Exception as e:
-        logger.error(f"Error creating browser context: {e}")
+        logger.error("Error creating browser context: %s", e)
         raise
 
 
 @pytest_asyncio.fixture(scope="function")
-async def page(context: BrowserContext) -> AsyncGenerator[Page, None]:
-    """Create a new page for each test."""
+async def page(context: BrowserContext, request) -> AsyncGenerator[Page, None]:
+    """Create a new page for each test, or hand out the prefetched one."""
+    monitor = request.config.suite_resource_monitor
+    warm = getattr(request.node, "warm_page", None)
+    if warm is not None:
+        # Closed together with its context
+        yield warm.page
+        if monitor is not None:
+            request.node.js_heap_bytes = await monitor.js_heap_bytes(warm.page)
+        return
     new_page = await context.new_page()
-    yield new_page
-    await new_page.close()
+    try:
+        yield new_page
+    finally:
+        try:
+            if monitor is not None:
+                request.node.js_heap_bytes = await monitor.js_heap_bytes(new_page)
+        finally:
+            await new_page.close()
+
+
+@pytest.fixture(scope="function")
+def web_perf(pytestconfig) -> WebPerfRecorder:
+    """Create the recorder of the test's web performance metrics."""
+    return WebPerfRecorder(enabled=not pytestconfig.getoption("no_web_perf"))
 
 
 @pytest_asyncio.fixture(scope="function")
-async def careers_page(page: Page) -> AsyncGenerator[CareersPage, None]:
-    """Create a CareersPage instance for testing."""
+async def careers_page(
+    page: Page,
+    consent_state: Optional[Path],
+    careers_url: str,
+    web_perf: WebPerfRecorder,
+    request,
+) -> AsyncGenerator[CareersPage, None]:
+    """Create a navigated CareersPage instance for testing."""
     try:
-        careers_page_instance = CareersPage(page)
-        await careers_page_instance.navigate()
+        warm = getattr(request.node, "warm_page", None)
+        if warm is not None:
+            careers_page_instance = warm.careers_page
+            web_perf.adopt(careers_page_instance.web_perf)
+            careers_page_instance.web_perf = web_perf
+        else:
+            careers_page_instance = CareersPage(
+                page,
+                consent_cached=consent_state is not None,
+                url=careers_url,
+                web_perf=web_perf,
+            )
+            await careers_page_instance.navigate()
         yield careers_page_instance
     except Exception as e:
-        logger.error(f"Error in careers_page fixture: {e}")
+        logger.error("Error in careers_page fixture: %s", e)
         raise
 
 
@@ -108,30 +1186,34 @@ async def job_details_page(page: Page) -> AsyncGenerator[JobDetailsPage, None]:
     yield JobDetailsPage(page)
 
 
-@pytest_asyncio.fixture(scope="function", autouse=True)
-async def trace_on_failure(context, request):
-    """Start tracing for each test and stop on failure."""
-    logger.debug("Starting trace_on_failure fixture")
+@pytest_asyncio.fixture(scope="function")
+async def responsive_matrix(
+    browser: Browser, careers_url: str, request
+) -> AsyncGenerator[ResponsiveMatrix, None]:
+    """Create a runner checking the careers page on every test device."""
 
-    # Create traces directory if it doesn't exist
-    Path("traces").mkdir(exist_ok=True)
-    await context.tracing.start(screenshots=True, snapshots=True, sources=True)
-    yield
-    try:
-        # Check if test failed - use the CallInfo object directly
-        failed = hasattr(request.node, "rep_call") and request.node.rep_call.failed
-        if failed:
-            logger.error(f"Test {request.node.name} failed, saving trace")
-            trace_path = Path("traces") / f"{request.node.name}.zip"
-            await context.tracing.stop(path=str(trace_path))
-        else:
-            logger.info(f"Test {request.node.name} passed, not saving trace")
-            await context.tracing.stop()
-    except Exception as e:
-        logger.error(f"Error in trace handling: {e}")
-        # Ensure tracing is stopped even if there's an error
-        try:
-            await context.tracing.stop()
-        except Exception as close_error:
-            logger.error(f"Error stopping trace: {close_error}")
-            pass
+    async def prepare_device_context(device_context, device):
+        name = har_name(f"{request.node.nodeid}[{device['name']}]")
+        await _attach_har(device_context, request.config, name)
+        await ResourceBlocker(_resource_profile(request), careers_url).install(
+            device_context
+        )
+
+    yield ResponsiveMatrix(
+        mode=request.config.getoption("responsive_mode"),
+        browser=browser,
+        context_options=CONTEXT_OPTIONS,
+        prepare_context=prepare_device_context,
+    )
+
+
+@pytest_asyncio.fixture(scope="function")
+async def job_details_crawler(
+    context: BrowserContext, pytestconfig
+) -> AsyncGenerator[JobDetailsCrawler, None]:
+    """Create a crawler reading job details pages in the test's context."""
+    yield JobDetailsCrawler(
+        context,
+        concurrency=pytestconfig.getoption("crawl_concurrency"),
+        retries=pytestconfig.getoption("crawl_retries"),
+    )
@@ -2,11 +2,47 @@ from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 from playwright._impl._errors import Error as PlaywrightError
 import re
 import logging
-from datetime import datetime
 import os
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional
+
+from utils.artifact_store import ArtifactStore, default_store
+from utils.completion import ActionTiming, CompletionSignal, complete_action
+from utils.keyword_matcher import KeywordMatcher
+from utils.readiness import ReadinessEngine, ReadinessMatch
+from utils.view_state import ViewState, query_view
+from utils.web_perf import WebPerfRecorder
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+# Reads every job card after the first `offset` ones in a single evaluation
+_EXTRACT_LISTINGS = """
+(links, offset) => links.slice(offset).map((link) => {
+    const card = link.closest('li') || link.parentElement;
+    const location = card.querySelector("[class*='location']");
+    const tags = Array.from(card.querySelectorAll("[class*='tag']"))
+        .flatMap((node) => node.textContent.split(','))
+        .map((tag) => tag.trim())
+        .filter(Boolean);
+    return {
+        title: link.textContent.trim(),
+        url: link.href,
+        location: location ? location.textContent.trim() : '',
+        tags,
+    };
+})
+"""
+
+
+@dataclass
+class JobListing:
+    """A job card read from the results list."""
+
+    title: str
+    url: str
+    location: str
+    tags: List[str] = field(default_factory=list)
 
 
 class CareersPage:
@@ -15,182 +51,306 @@ class CareersPage:
     including searching for jobs, filtering by location and job type,
     and retrieving job listings."""
 
+    DEFAULT_URL = "https://www.epam.com/careers"
+
+    # Common selectors for verification iframes
+    VERIFICATION_SELECTORS = [
+        "iframe[title*='challenge']",
+        "iframe[title*='verify']",
+        "iframe[src*='captcha']",
+        "iframe[src*='recaptcha']",
+        "#challenge-stage",
+        "#challenge-running",
+    ]
+
+    # Cookie accept button selectors
+    COOKIE_SELECTORS = [
+        "button[id*='onetrust-accept']",
+        "button[id*='cookie-accept']",
+        "[aria-label*='Accept']",
+        ".cookie-consent button",
+        "#onetrust-accept-btn-handler",
+    ]
+
+    # Selectors that might indicate the page is ready
+    READY_SELECTORS = [
+        # Generic search-related selectors
+        "input[type='search']",
+        "input[placeholder*='search']",
+        "input[placeholder*='Search']",
+        "input[placeholder*='keyword']",
+        "input[placeholder*='Keyword']",
+        # EPAM specific selectors
+        "#jobSearchFilterForm",
+        ".recruitment-search",
+        ".job-search",
+        "form[action*='job-search']",
+        ".top-navigation--epam-sticky",  # EPAM header
+        "[class*='job-search']",
+        "[class*='search-form']",
+        ".search-form",
+        ".job-search__wrapper",
+    ]
+
+    # Time to wait for a page marker, and the grace period for late banners (ms)
+    READY_TIMEOUT = 10000
+    PROBE_GRACE_TIMEOUT = 2000
+
+    # Cookies set by the consent banner once it has been accepted
+    CONSENT_COOKIES = ("OptanonAlertBoxClosed", "OptanonConsent")
+
+    JOB_LINKS_SELECTOR = "//ul/li//div//h5//a"
+    NO_RESULTS_SELECTOR = "div[role='alert']"
+    SEARCH_INPUT_SELECTOR = "#new_form_job_search-keyword"
+    LOCATION_FILTER_SELECTOR = ".select2-selection__rendered[role='textbox']"
+    HAMBURGER_MENU_SELECTOR = ".hamburger-menu-ui.hamburger-menu-ui-23"
+    SKILLS_FILTER_SELECTOR = ".default-label"
+
+    # Elements whose state view_state() reads in a single evaluation
+    VIEW_SELECTORS = {
+        "search_input": SEARCH_INPUT_SELECTOR,
+        "location_filter": LOCATION_FILTER_SELECTOR,
+        "hamburger_menu": HAMBURGER_MENU_SELECTOR,
+        "skills_filter": SKILLS_FILTER_SELECTOR,
+        "job_links": JOB_LINKS_SELECTOR,
+        "no_results": NO_RESULTS_SELECTOR,
+    }
+
+    # Search and filters are complete once new job cards or the no-results
+    # message are rendered, the shown cards are updated, or the vacancy search
+    # responds (same results may not re-render at all)
+    RESULTS_RESPONSE = re.compile(r"/services/vacancy/search")
+    SEARCH_SIGNAL = CompletionSignal(
+        "search_jobs",
+        (JOB_LINKS_SELECTOR, NO_RESULTS_SELECTOR),
+        response_url=RESULTS_RESPONSE,
+    )
+    LOCATION_FILTER_SIGNAL = CompletionSignal(
+        "filter_by_location",
+        (JOB_LINKS_SELECTOR, NO_RESULTS_SELECTOR),
+        response_url=RESULTS_RESPONSE,
+    )
+    JOB_TYPE_FILTER_SIGNAL = CompletionSignal(
+        "filter_by_job_type",
+        (JOB_LINKS_SELECTOR, NO_RESULTS_SELECTOR),
+        response_url=RESULTS_RESPONSE,
+    )
+    NEXT_PAGE_SELECTOR = (
+        "a[rel='next'], .pagination__next, [class*='pagination'] a[class*='next']"
+    )
+    LOAD_MORE_SELECTOR = "[class*='load-more'], [class*='view-more']"
+    NEXT_PAGE_SIGNAL = CompletionSignal(
+        "next_results_page", (JOB_LINKS_SELECTOR, NO_RESULTS_SELECTOR)
+    )
+    LOAD_MORE_SIGNAL = CompletionSignal("load_more_results", (JOB_LINKS_SELECTOR,))
+    # Widest viewport served the mobile layout (hamburger menu, search toggle)
+    MOBILE_BREAKPOINT = 1024
+
+    # The mobile menu is complete once the hamburger reports itself as open
+    MOBILE_MENU_SIGNAL = CompletionSignal(
+        "verify_mobile_menu",
+        (
+            ".hamburger-menu-ui[aria-expanded='true']",
+            "[class*='hamburger-menu'][class*='open']",
+            "[class*='hamburger-menu'][class*='active']",
+        ),
+        require_fresh=False,
+        timeout=3000,
+    )
+
     async def _take_error_screenshot(self, error_type: str) -> None:
         """Takes a screenshot of the current page state for debugging purposes.
-        
+
+        The image is only captured here; the artifact store writes it on its
+        own thread and links it to the running test.
+
         Args:
             error_type (str): Type of error for the screenshot filename
         """
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = f"error_screenshots/{error_type}_{timestamp}.png"
-            os.makedirs("error_screenshots", exist_ok=True)
-            await self.page.screenshot(path=screenshot_path)
-            logger.info("Saved %s screenshot to %s", error_type, screenshot_path)
+            data = await self.page.screenshot()
         except PlaywrightError as screenshot_error:
             logger.error("Failed to take %s screenshot: %s", error_type, screenshot_error)
+            return
+        store = self.artifacts or default_store()
+        store.save_bytes(data, error_type, "screenshots", ".png")
+        self._failure_captured = True
 
-    def __init__(self, page: Page):
+    def __init__(
+        self,
+        page: Page,
+        consent_cached: bool = False,
+        url: Optional[str] = None,
+        web_perf: Optional[WebPerfRecorder] = None,
+        artifacts: Optional[ArtifactStore] = None,
+    ):
         """Initializes the CareersPage with a Playwright Page object.
         Args:
             page (Page): The Playwright Page object to interact with the careers page.
+            consent_cached (bool): Whether the page's context was loaded from a
+                saved consent state, allowing navigate() to skip the probes.
+            url (str, optional): Careers page URL. Defaults to the CAREERS_URL
+                environment variable, then to the production site.
+            web_perf (WebPerfRecorder, optional): Recorder of the web performance
+                metrics of navigate(), search_jobs() and the filters.
+            artifacts (ArtifactStore, optional): Store of the error screenshots.
+                Defaults to the process-wide store.
         """
         self.page = page
-        self.url = "https://www.epam.com/careers"
-        self.search_input = page.locator("#new_form_job_search-keyword")
-        self.find_button = page.get_by_role("button", name="Find")
-        self.location_filter = page.locator(
-            ".select2-selection__rendered[role='textbox']"
+        self.consent_cached = consent_cached
+        self.readiness = ReadinessEngine(
+            [
+                ("verification", self.VERIFICATION_SELECTORS, True),
+                ("cookie", self.COOKIE_SELECTORS, True),
+                ("ready", self.READY_SELECTORS, False),
+            ]
         )
-        self.all_jobs_on_page = page.locator("//ul/li//div//h5//a")
-        self.no_results_message = page.locator("div[role='alert']")
-        self.hamburger_menu = page.locator(".hamburger-menu-ui.hamburger-menu-ui-23")
-        self.skills_filter = page.locator(".default-label")
+        self.url = url or os.environ.get("CAREERS_URL", self.DEFAULT_URL)
+        self.search_input = page.locator(self.SEARCH_INPUT_SELECTOR)
+        self.find_button = page.get_by_role("button", name="Find")
+        self.location_filter = page.locator(self.LOCATION_FILTER_SELECTOR)
+        self.all_jobs_on_page = page.locator(self.JOB_LINKS_SELECTOR)
+        self.no_results_message = page.locator(self.NO_RESULTS_SELECTOR)
+        self.action_timings: List[ActionTiming] = []
+        self.web_perf = web_perf or WebPerfRecorder()
+        self.artifacts = artifacts
+        self._failure_captured = False
+        self.hamburger_menu = page.locator(self.HAMBURGER_MENU_SELECTOR)
+        self.skills_filter = page.locator(self.SKILLS_FILTER_SELECTOR)
 
     async def navigate(self):
-        """Navigates to the careers page and waits for it to load."""
+        """Navigates to the careers page and waits for it to load.
+
+        When the page was created with a cached consent state and the consent
+        cookie is still valid, the verification and cookie probes are skipped.
+        Otherwise the full probe runs, as on a clean browser profile.
+        """
+        self._failure_captured = False
         try:
             logger.info("Navigating to careers page...")
+            await self.web_perf.install(self.page)
             # Navigate with a longer timeout and wait for load
             await self.page.goto(self.url, wait_until="load", timeout=30000)
             logger.info("Navigated to careers page successfully")
 
-            # Check for human verification iframe
-            try:
-                # Common selectors for verification iframes
-                verification_selectors = [
-                    "iframe[title*='challenge']",
-                    "iframe[title*='verify']",
-                    "iframe[src*='captcha']",
-                    "iframe[src*='recaptcha']",
-                    "#challenge-stage",
-                    "#challenge-running",
-                ]
-
-                for selector in verification_selectors:
-                    try:
-                        frame = await self.page.wait_for_selector(
-                            selector, timeout=5000
-                        )
-                        if frame:
-                            logger.info(
-                                "Human verification detected, waiting for completion..."
-                            )
-                            # Wait for verification to complete (timeout after 2 minutes)
-                            await self.page.wait_for_selector(
-                                selector, state="hidden", timeout=120000
-                            )
-                            logger.info("Human verification completed")
-                            break
-                    except PlaywrightTimeoutError:
-                        continue
-
-            except PlaywrightTimeoutError:
-                logger.debug("No verification frame found, proceeding...")
-
-            # Accept cookies if present
-            try:
-                # Try multiple cookie accept button selectors
-                cookie_selectors = [
-                    "button[id*='onetrust-accept']",
-                    "button[id*='cookie-accept']",
-                    "[aria-label*='Accept']",
-                    "button[contains(text(), 'Accept')]",
-                    ".cookie-consent button",
-                    "#onetrust-accept-btn-handler",
-                ]
-
-                for cookie_selector in cookie_selectors:
-                    try:
-                        button = self.page.locator(cookie_selector)
-                        if await button.is_visible(timeout=2000):
-                            await button.click()
-                            logger.info(
-                                "Accepted cookies using selector: %s", cookie_selector
-                            )
-                            await self.page.wait_for_timeout(1000)
-                            break
-                    except PlaywrightTimeoutError:
-                        continue
+            if self.consent_cached and await self.has_valid_consent():
+                logger.info("Cached consent state is valid, skipping probes")
+                pending = set()
+            else:
+                if self.consent_cached:
+                    logger.info("Cached consent state is stale, running full probe")
+                pending = {"verification", "cookie"}
+
+            await self._wait_until_ready(pending)
+            await self.readiness.check_fingerprint(self.page)
+            await self.web_perf.collect(self.page, "navigate")
 
+        except PlaywrightError as e:
+            logger.error("Failed to navigate to careers page: %s", e)
+            # A failed readiness check has already captured the page state
+            if not self._failure_captured:
+                await self._take_error_screenshot("navigation_error")
+            raise  # Re-raise the original navigation error
+
+    async def reload(self):
+        """Reloads the page, dropping any UI state, and waits for it to be ready.
+
+        Consent was handled when the page was first loaded, so only the page
+        markers are waited for.
+        """
+        self._failure_captured = False
+        try:
+            await self.page.reload(wait_until="load", timeout=30000)
+            await self._wait_until_ready(set())
+        except PlaywrightError as e:
+            logger.error("Failed to reload careers page: %s", e)
+            if not self._failure_captured:
+                await self._take_error_screenshot("navigation_error")
+            raise
+
+    async def has_valid_consent(self) -> bool:
+        """Checks whether the browser context holds an unexpired consent cookie."""
+        now = time.time()
+        for cookie in await self.page.context.cookies(self.url):
+            if cookie["name"] in self.CONSENT_COOKIES and (
+                cookie.get("expires", -1) == -1 or cookie["expires"] > now
+            ):
+                return True
+        return False
+
+    async def _handle_match(self, match: ReadinessMatch):
+        """Resolves a verification frame or cookie banner found by the readiness engine."""
+        if match.kind == "verification":
+            logger.info("Human verification detected, waiting for completion...")
+            # Wait for verification to complete (timeout after 2 minutes)
+            await self.page.wait_for_selector(
+                match.selector, state="hidden", timeout=120000
+            )
+            logger.info("Human verification completed")
+        elif match.kind == "cookie":
+            try:
+                button = self.page.locator(match.selector).first
+                await button.click()
+                await button.wait_for(state="hidden", timeout=2000)
+                logger.info("Accepted cookies using selector: %s", match.selector)
             except PlaywrightError as e:
                 logger.debug("Error handling cookie banner: %s", e)
 
-            # Wait for initial page content and log the page state
-            await self.page.wait_for_selector("body", timeout=5000)
-
-            # Debug: Log current URL to verify redirection
-            current_url = self.page.url
-            logger.info("Current page URL: %s", current_url)
-
-            # Try multiple selectors that might indicate the page is ready
-            selectors = [
-                # Generic search-related selectors
-                "input[type='search']",
-                "input[placeholder*='search']",
-                "input[placeholder*='Search']",
-                "input[placeholder*='keyword']",
-                "input[placeholder*='Keyword']",
-                # EPAM specific selectors
-                "#jobSearchFilterForm",
-                ".recruitment-search",
-                ".job-search",
-                "form[action*='job-search']",
-                ".top-navigation--epam-sticky",  # EPAM header
-                "[class*='job-search']",
-                "[class*='search-form']",
-                ".search-form",
-                ".job-search__wrapper",
-            ]
+    async def _wait_until_ready(self, pending: set):
+        """Waits until one of the known page markers is present.
 
-            # Try to find any of the selectors
-            found_element = False
-            page_content = await self.page.content()
-            logger.debug("Page content length: %d", len(page_content))
+        Args:
+            pending (set): Interruptions still to be handled ("verification",
+                "cookie"). They are detected in the same evaluation as the
+                page markers, so each wait resolves on whichever shows up first.
 
-            for selector in selectors:
-                try:
-                    # First check if element exists without timeout
-                    is_visible = await self.page.locator(selector).is_visible()
-                    if is_visible:
-                        logger.info("Found visible element with selector: %s", selector)
-                        found_element = True
-                        break
-                    else:
-                        element = await self.page.query_selector(selector)
-                        if element:
-                            logger.info(
-                                "Found hidden element with selector: %s", selector
-                            )
-                            found_element = True
-                            break
-                except PlaywrightError as e:
-                    logger.debug("Error checking selector %s: %s", selector, str(e))
-                    continue
-
-            if not found_element:
-                # Log the actual page content for debugging
-                logger.error(
-                    "Could not find any known elements. Current URL: %s", self.page.url
-                )
-                logger.error("Page title: %s", await self.page.title())
-                await self._take_error_screenshot("page_state")
-                raise PlaywrightError(
-                    "Could not verify page load - no known elements found"
+        Raises:
+            PlaywrightError: If none of the awaited kinds showed up in time.
+        """
+        try:
+            while True:
+                kinds = pending | {"ready"}
+                match = await self.readiness.wait(
+                    self.page, kinds, timeout=self.READY_TIMEOUT
                 )
+                if match.kind == "ready":
+                    logger.info("Found page marker with selector: %s", match.selector)
+                    break
+                pending.discard(match.kind)
+                await self._handle_match(match)
 
-        except PlaywrightError as e:
-            logger.error("Failed to navigate to careers page: %s", e)
-            await self._take_error_screenshot("navigation_error")
-            raise  # Re-raise the original navigation error
+            # Consent banners are often injected after the page markers, so give
+            # them one short combined grace period instead of probing each selector
+            if pending:
+                try:
+                    match = await self.readiness.wait(
+                        self.page, pending, timeout=self.PROBE_GRACE_TIMEOUT
+                    )
+                    await self._handle_match(match)
+                except PlaywrightTimeoutError:
+                    logger.debug("No verification frame or cookie banner found")
+
+        except PlaywrightTimeoutError:
+            # Name the kinds in priority order, e.g. "verification, cookie, ready"
+            awaited = ", ".join(k for k in self.readiness.groups if k in kinds)
+            logger.error(
+                "Could not find any known elements (waited for: %s). Current URL: %s",
+                awaited,
+                self.page.url,
+            )
+            logger.error("Page title: %s", await self.page.title())
+            await self._take_error_screenshot("page_state")
+            raise PlaywrightError(
+                "Could not verify page load - no known elements found "
+                f"(waited for: {awaited})"
+            )
 
-    async def search_jobs(self, keyword: str):
+    async def search_jobs(self, keyword: str) -> ActionTiming:
         """Searches for jobs using the provided keyword."""
         await self.search_input.fill(keyword)
-        await self.find_button.click()
-        await self.page.wait_for_load_state("networkidle")
+        return await self._measured(self.SEARCH_SIGNAL, self.find_button.click)
 
-    async def filter_by_location(self, location: str):
+    async def filter_by_location(self, location: str) -> ActionTiming:
         """Filters job listings by the specified location.
 
         Args:
@@ -204,14 +364,25 @@ class CareersPage:
         await self.page.get_by_role("combobox").filter(has_text=re.compile(r"^$")).fill(
             f"{location}"
         )
-        await self.find_button.click()
-        await self.page.wait_for_load_state("networkidle")
+        return await self._measured(self.LOCATION_FILTER_SIGNAL, self.find_button.click)
 
-    async def filter_by_job_type(self, filter_type: str):
+    async def filter_by_job_type(self, filter_type: str) -> ActionTiming:
         """Filters job listings by the specified job type."""
         await self.page.get_by_text(filter_type, exact=True).click()
-        await self.find_button.click()
-        await self.page.wait_for_load_state("networkidle")
+        return await self._measured(self.JOB_TYPE_FILTER_SIGNAL, self.find_button.click)
+
+    async def _complete(self, signal: CompletionSignal, action) -> ActionTiming:
+        """Runs an action, waits for its completion signal and records its latency."""
+        timing = await complete_action(self.page, signal, action)
+        self.action_timings.append(timing)
+        return timing
+
+    async def _measured(self, signal: CompletionSignal, action) -> ActionTiming:
+        """Like _complete, also recording the action's web performance metrics."""
+        mark = await self.web_perf.mark(self.page)
+        timing = await self._complete(signal, action)
+        await self.web_perf.collect(self.page, signal.name, mark)
+        return timing
 
     async def get_job_titles(self):
         """Retrieves the titles of all job cards displayed on the page."""
@@ -220,28 +391,85 @@ class CareersPage:
         # )
         return await self.all_jobs_on_page.all_text_contents()
 
+    async def iter_job_listings(
+        self, max_pages: Optional[int] = None
+    ) -> AsyncIterator[List[JobListing]]:
+        """Streams the listings of all result pages, one batch per page.
+
+        Each batch is read with a single in-page evaluation. The generator
+        then follows the "load more" button or the next-page link, so callers
+        can process thousands of listings without holding them all in memory.
+
+        Args:
+            max_pages (int, optional): Stop after this many pages or loads.
+
+        Yields:
+            List[JobListing]: The listings newly shown on the page.
+        """
+        offset = 0
+        pages = 0
+        while True:
+            batch = await self.all_jobs_on_page.evaluate_all(_EXTRACT_LISTINGS, offset)
+            if not batch:
+                # An empty page, or a load that added nothing: the list is exhausted
+                return
+            yield [JobListing(**item) for item in batch]
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                return
+
+            load_more = self.page.locator(self.LOAD_MORE_SELECTOR).first
+            if await load_more.is_visible():
+                offset += len(batch)
+                await self._complete(self.LOAD_MORE_SIGNAL, load_more.click)
+                continue
+
+            next_page = self.page.locator(self.NEXT_PAGE_SELECTOR).first
+            if not await next_page.is_visible():
+                return
+            offset = 0
+            await self._complete(self.NEXT_PAGE_SIGNAL, next_page.click)
+
     async def is_no_results_displayed(self):
         """Checks if the no results message is displayed."""
         return await self.no_results_message.is_visible()
 
     async def verify_mobile_menu(self):
         """Verifies the mobile menu functionality."""
-        await self.hamburger_menu.click()
-        await self.page.wait_for_load_state("networkidle")
+        await self._complete(self.MOBILE_MENU_SIGNAL, self.hamburger_menu.click)
         return await self.hamburger_menu.is_visible()
 
+    async def open_mobile_search(self):
+        """Opens the search form hidden behind the Search button in mobile view."""
+        await self.page.get_by_role("button", name="Search").click()
+
     async def check_if_search_input_visible(self):
         """Checks if the search input is visible."""
-        await self.page.get_by_role("button", name="Search").click()
+        await self.open_mobile_search()
         return await self.search_input.is_visible()
 
     async def check_if_filters_visible(self):
         """Checks if the filters are visible in mobile view."""
         return await self.location_filter.is_visible()
 
-    async def get_job_title(self, job_list: list, keyword: list):
-        """Retrieves the job title from the job list."""
-        for job in job_list:
-            for kw in keyword:
-                if kw.lower() in job.lower():
-                    yield job
+    async def view_state(
+        self, *names: str, wait_for: Optional[str] = None, timeout: float = 10000
+    ) -> ViewState:
+        """Reads the state of several page elements in a single round-trip.
+
+        Args:
+            names (str): Keys of VIEW_SELECTORS to read, all of them by default.
+            wait_for (str, optional): Name of an element to wait for first.
+            timeout (float): Maximum time to wait for it in milliseconds.
+
+        Returns:
+            ViewState: Visibility, texts, count and attributes of each element.
+        """
+        selectors = {
+            name: self.VIEW_SELECTORS[name] for name in names or self.VIEW_SELECTORS
+        }
+        return await query_view(self.page, selectors, wait_for, timeout)
+
+    def get_job_title(self, job_list: List[str], keyword: List[str]) -> List[str]:
+        """Returns the job titles from the job list that contain any of the keywords."""
+        return KeywordMatcher(keyword).match(job_list).matched_titles
@@ -1,19 +1,58 @@
+from dataclasses import dataclass
+from typing import Optional
+
 from playwright.async_api import Page
 
+from utils.completion import ActionTiming, CompletionSignal, complete_action
+from utils.view_state import ViewState, query_view
+
+
+@dataclass
+class JobDetails:
+    """The fields of a job details page, read in one evaluation."""
+
+    url: str
+    title: Optional[str]
+    location: Optional[str]
+    description: str
+    has_apply_button: bool
+
 
 class JobDetailsPage:
     """Class representing the job details page of the website."""
 
+    # Applying is complete once the page navigates or the application form is
+    # rendered; other forms on the page (e.g. the header search) do not count
+    APPLY_SIGNAL = CompletionSignal(
+        "click_apply",
+        ("form[action*='apply']", "iframe[src*='apply']"),
+        url_change=True,
+    )
+
+    TITLE_SELECTOR = "h1[class='vacancy-details-23__job-title']"
+    LOCATION_SELECTOR = ".vacancy-details-23__location"
+    DESCRIPTION_SELECTOR = "div[class='vacancy-details-23__content-holder']"
+    APPLY_BUTTON_SELECTOR = "[data-auto='apply-button']"
+
+    # Elements whose state view_state() reads in a single evaluation
+    VIEW_SELECTORS = {
+        "title": TITLE_SELECTOR,
+        "location": LOCATION_SELECTOR,
+        "description": DESCRIPTION_SELECTOR,
+        "description_items": f"{DESCRIPTION_SELECTOR} li",
+        "apply_button": APPLY_BUTTON_SELECTOR,
+    }
+
     def __init__(self, page: Page):
         """Initializes the JobDetailsPage with a Playwright Page object.
         Args:
             page (Page): The Playwright Page object to interact with the job details page.
         """
         self.page = page
-        self.job_title = page.locator("h1[class='vacancy-details-23__job-title']")
-        self.job_location = page.locator(".vacancy-details-23__location")
-        self.job_description = page.locator("div[class='vacancy-details-23__content-holder']")
-        self.apply_button = page.locator("[data-auto='apply-button']")
+        self.job_title = page.locator(self.TITLE_SELECTOR)
+        self.job_location = page.locator(self.LOCATION_SELECTOR)
+        self.job_description = page.locator(self.DESCRIPTION_SELECTOR)
+        self.apply_button = page.locator(self.APPLY_BUTTON_SELECTOR)
 
     async def get_job_title(self):
         """Retrieves the job title from the job details page."""
@@ -28,7 +67,47 @@ class JobDetailsPage:
         all_descriptions = await self.job_description.locator("li").all_text_contents()
         return " ".join(all_descriptions).strip() if all_descriptions else ""
 
-    async def click_apply(self):
+    async def view_state(
+        self, *names: str, wait_for: Optional[str] = None, timeout: float = 10000
+    ) -> ViewState:
+        """Reads the state of several page elements in a single round-trip.
+
+        Args:
+            names (str): Keys of VIEW_SELECTORS to read, all of them by default.
+            wait_for (str, optional): Name of an element to wait for first.
+            timeout (float): Maximum time to wait for it in milliseconds.
+
+        Returns:
+            ViewState: Visibility, texts, count and attributes of each element.
+        """
+        selectors = {
+            name: self.VIEW_SELECTORS[name] for name in names or self.VIEW_SELECTORS
+        }
+        return await query_view(self.page, selectors, wait_for, timeout)
+
+    async def read_details(self, timeout: float = 10000) -> JobDetails:
+        """Reads all fields of the job details page in a single round-trip.
+
+        Args:
+            timeout (float): Time to wait for the job title in milliseconds.
+                Fields that did not render in time are returned as None.
+
+        Returns:
+            JobDetails: The title, location, description and apply button state.
+        """
+        view = await self.view_state(
+            "title", "location", "description_items", "apply_button",
+            wait_for="title",
+            timeout=timeout,
+        )
+        return JobDetails(
+            url=view.url,
+            title=view.text("title"),
+            location=view.text("location"),
+            description=" ".join(view["description_items"].texts).strip(),
+            has_apply_button=view["apply_button"].count > 0,
+        )
+
+    async def click_apply(self) -> ActionTiming:
         """Clicks the apply button on the job details page."""
-        await self.apply_button.click()
-        await self.page.wait_for_load_state("networkidle")
+        return await complete_action(self.page, self.APPLY_SIGNAL, self.apply_button.click)
@@ -0,0 +1,92 @@
+import os
+import time
+import zipfile
+
+from utils.artifact_store import ArtifactSettings, ArtifactStore
+
+
+def make_store(tmp_path, **settings):
+    return ArtifactStore(ArtifactSettings(root=str(tmp_path / "artifacts"), **settings))
+
+
+class TestArtifactStore:
+    """Class to test the background, deduplicated artifact store."""
+
+    def test_same_content_is_stored_once(self, tmp_path):
+        """Tests that a second copy of the same content links to the stored file."""
+        store = make_store(tmp_path)
+        store.current_test = "tests/test_a.py::test_b"
+        store.save_bytes(b"page", "page_state", "screenshots", ".png")
+        store.save_bytes(b"page", "navigation_error", "screenshots", ".png")
+        store.save_bytes(b"other page", "navigation_error", "screenshots", ".png")
+        artifacts = store.artifacts_for("tests/test_a.py::test_b")
+        store.close()
+
+        assert [a.name for a in artifacts] == ["page_state", "navigation_error"]
+        assert store.deduplicated == 1
+        assert len(list((tmp_path / "artifacts" / "screenshots").iterdir())) == 2
+        assert store.artifacts_for("tests/test_a.py::test_b") == []
+
+    def test_duplicates_across_runs(self, tmp_path):
+        """Tests that content stored by an earlier run is not written again."""
+        first = make_store(tmp_path)
+        stored = first.save_bytes(b"page", "page_state", "screenshots", ".png").result()
+        first.close()
+
+        second = make_store(tmp_path)
+        artifact = second.save_bytes(b"page", "page_state", "screenshots", ".png").result()
+        second.close()
+        assert artifact.duplicate
+        assert artifact.path == stored.path
+
+    def test_oldest_artifacts_pruned_over_size_cap(self, tmp_path):
+        """Tests that the oldest artifacts are deleted once the total is over the cap."""
+        store = make_store(tmp_path, max_bytes=25)
+        old = store.save_bytes(b"a" * 10, "old", "screenshots", ".png").result()
+        store.save_bytes(b"b" * 10, "mid", "screenshots", ".png").result()
+        newest = store.save_bytes(b"c" * 10, "new", "screenshots", ".png").result()
+        store.close()
+
+        assert not old.path.exists()
+        assert newest.path.exists()
+        assert store.pruned == 1
+
+    def test_expired_artifacts_pruned_on_start(self, tmp_path):
+        """Tests that artifacts past the age limit are deleted when the store starts."""
+        first = make_store(tmp_path)
+        stale = first.save_bytes(b"page", "page_state", "screenshots", ".png").result()
+        first.close()
+        week_ago = time.time() - 8 * 86400
+        os.utime(stale.path, (week_ago, week_ago))
+
+        make_store(tmp_path, max_age_days=7).close()
+        assert not stale.path.exists()
+
+    def test_trace_moved_and_compressed(self, tmp_path):
+        """Tests that a staged trace is moved into the store with deflated entries."""
+        store = make_store(tmp_path, compress=True)
+        staged = store.staging_path(".zip")
+        with zipfile.ZipFile(staged, "w", compression=zipfile.ZIP_STORED) as trace:
+            trace.writestr("trace.trace", "event\n" * 1000)
+        artifact = store.save_file(staged, "test_b", "traces", "tests/test_a.py::test_b")
+        artifact = artifact.result()
+        store.close()
+
+        assert not staged.exists()
+        assert artifact.path.parent.name == "traces"
+        with zipfile.ZipFile(artifact.path) as trace:
+            info = trace.getinfo("trace.trace")
+            assert info.compress_type == zipfile.ZIP_DEFLATED
+            assert trace.read(info) == b"event\n" * 1000
+
+    def test_close_keeps_other_workers_staging(self, tmp_path):
+        """Tests that closing one worker's store leaves other workers' staged files."""
+        other = tmp_path / "artifacts" / ".staging" / "99999" / "trace.zip"
+        other.parent.mkdir(parents=True)
+        other.write_bytes(b"staged by another worker")
+        store = make_store(tmp_path)
+        staged = store.staging_path(".zip")
+        staged.write_bytes(b"abandoned")
+        store.close()
+        assert other.exists()
+        assert not staged.parent.exists()
@@ -0,0 +1,38 @@
+import pytest
+
+from benchmarks.harness import BenchmarkResult, compare_results, percentile
+
+
+class TestBenchmarkHarness:
+    """Class to test the statistics and comparisons of the benchmark harness."""
+
+    def test_percentiles_interpolate(self):
+        """Tests percentiles on an even number of samples."""
+        samples = [4.0, 1.0, 3.0, 2.0]
+        assert percentile(samples, 0) == 1.0
+        assert percentile(samples, 50) == pytest.approx(2.5)
+        assert percentile(samples, 100) == 4.0
+        assert percentile([7.0], 99) == 7.0
+
+    def test_result_key_and_stats(self):
+        """Tests that parameters are part of the key and stats cover the samples."""
+        result = BenchmarkResult("get_job_titles", [10.0, 20.0, 30.0], {"size": 100})
+        stats = result.stats()
+        assert result.key == "get_job_titles[size=100]"
+        assert (stats["n"], stats["min"], stats["p50"], stats["max"]) == (3, 10.0, 20.0, 30.0)
+
+    def test_compare_with_baseline(self):
+        """Tests the verdicts of a comparison with saved results."""
+        results = [
+            BenchmarkResult("navigate_cold", [150.0]),
+            BenchmarkResult("search_jobs", [52.0]),
+            BenchmarkResult("context_create", [5.0]),
+            BenchmarkResult("page_create", [3.0]),
+        ]
+        baseline = {
+            "navigate_cold": {"p50": 100.0},
+            "search_jobs": {"p50": 50.0},
+            "context_create": {"p50": 10.0},
+        }
+        verdicts = [line.split()[-1] for line in compare_results(results, baseline)]
+        assert verdicts == ["SLOWER", "unchanged", "faster", "new"]
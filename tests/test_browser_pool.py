@@ -0,0 +1,76 @@
+import pytest
+
+from utils.browser_pool import BrowserPool, summarize_pool_stats
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+
+    async def launch(self, **options):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+
+def stats(pool, launch_seconds=2.0):
+    """Returns the pool statistics as if every launch took launch_seconds."""
+    pool.total_launch_seconds = launch_seconds * pool.launches
+    return pool.stats()
+
+
+@pytest.mark.asyncio
+class TestBrowserPool:
+    """Class to test the leases of the pooled browsers and their statistics."""
+
+    async def test_only_test_leases_counted(self):
+        """Tests that consent and prefetch leases count neither as tests nor savings."""
+        pool = BrowserPool(FakePlaywright())
+        consent = await pool.acquire(for_test=False)
+        await pool.release(consent)
+        for _ in range(3):
+            await pool.release(await pool.acquire())
+        await pool.release(await pool.acquire(for_test=False))
+
+        served = stats(pool)
+        leases = (served["leases"], served["other_leases"])
+        assert (served["launches"], leases) == (1, (3, 2))
+        assert served["launch_seconds_saved"] == pytest.approx(6.0)
+        assert summarize_pool_stats([served]).startswith("3 tests served by 1 browser")
+
+    async def test_first_test_launch_not_saved(self):
+        """Tests that a test whose lease launched the browser saves nothing."""
+        pool = BrowserPool(FakePlaywright())
+        await pool.release(await pool.acquire())
+        await pool.release(await pool.acquire(for_test=False))
+        assert stats(pool)["launch_seconds_saved"] == 0
+
+    async def test_restart_after_max_uses(self):
+        """Tests that a browser used up by its leases is closed and relaunched."""
+        pool = BrowserPool(FakePlaywright(), max_uses=2)
+        first = await pool.acquire(for_test=False)
+        await pool.release(first)
+        await pool.release(await pool.acquire())
+        third = await pool.acquire()
+        await pool.release(third)
+        assert not first.browser.is_connected()
+        assert third.browser is not first.browser
+        served = stats(pool)
+        assert (served["launches"], served["restarts"], served["leases"]) == (2, 1, 2)
+        assert served["launch_seconds_saved"] == pytest.approx(2.0)
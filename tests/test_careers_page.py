@@ -0,0 +1,192 @@
+import pytest
+from playwright._impl._errors import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from pages.careers_page import CareersPage
+from utils.readiness import ReadinessEngine, SelectorHitStats
+
+URL = "https://careers.example.com/careers"
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    @property
+    def first(self):
+        return self
+
+    async def evaluate_all(self, script, offset):
+        return self.page.shown()[offset:]
+
+    async def is_visible(self):
+        return self.page.paging == self.selector and self.page.has_more()
+
+    async def click(self):
+        if self.selector == CareersPage.LOAD_MORE_SELECTOR:
+            self.page.load_more()
+        else:
+            self.page.start += self.page.page_size
+
+
+class FakePage:
+    """Shows a results list paged by "load more" or by next-page links.
+
+    ``paging`` is the selector of the control that pages the results, and
+    ``stuck`` makes loading more add no cards, like a load that failed.
+    """
+
+    url = URL
+
+    def __init__(self, total, page_size=10, paging=None, stuck=False):
+        self.jobs = [
+            {
+                "title": f"Engineer {number}",
+                "url": f"{URL}/vacancy/{number}",
+                "location": "Krakow",
+                "tags": ["Remote"],
+            }
+            for number in range(total)
+        ]
+        self.page_size = page_size
+        self.paging = paging
+        self.stuck = stuck
+        self.start = 0
+        self.count = page_size
+
+    def shown(self):
+        return self.jobs[self.start : self.start + self.count]
+
+    def has_more(self):
+        return self.start + self.count < len(self.jobs)
+
+    def load_more(self):
+        if not self.stuck:
+            self.count += self.page_size
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    def get_by_role(self, role, name=None):
+        return FakeLocator(self, None)
+
+
+class ListingPage(CareersPage):
+    """Completes paging actions at once, recording which signal they waited for."""
+
+    def __init__(self, page):
+        super().__init__(page, url=URL)
+        self.completed = []
+
+    async def _complete(self, signal, action):
+        self.completed.append(signal.name)
+        await action()
+
+
+class BlankPage(FakePage):
+    """A page on which no readiness candidate ever shows up."""
+
+    def __init__(self):
+        super().__init__(0)
+
+    async def evaluate(self, script, selectors):
+        return []
+
+    async def wait_for_function(self, script, arg, timeout):
+        raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+
+    async def title(self):
+        return "Blank"
+
+    async def screenshot(self):
+        return b"png"
+
+
+class FakeStore:
+    def __init__(self):
+        self.saved = []
+
+    def save_bytes(self, data, name, kind, suffix):
+        self.saved.append(name)
+
+
+async def batches(page, max_pages=None):
+    careers = ListingPage(page)
+    found = [batch async for batch in careers.iter_job_listings(max_pages)]
+    return found, careers.completed
+
+
+@pytest.mark.asyncio
+class TestIterJobListings:
+    """Class to test streaming the job listings across result pages."""
+
+    async def test_next_page_links_followed(self):
+        """Tests that each result page is yielded once, following the next links."""
+        page = FakePage(25, paging=CareersPage.NEXT_PAGE_SELECTOR)
+        found, completed = await batches(page)
+        assert [len(batch) for batch in found] == [10, 10, 5]
+        assert [job.title for batch in found for job in batch] == [
+            job["title"] for job in page.jobs
+        ]
+        assert completed == ["next_results_page"] * 2
+
+    async def test_load_more_reads_only_new_cards(self):
+        """Tests that a load reads only the cards after those already yielded."""
+        page = FakePage(25, paging=CareersPage.LOAD_MORE_SELECTOR)
+        found, completed = await batches(page)
+        assert [len(batch) for batch in found] == [10, 10, 5]
+        assert [job.url for batch in found for job in batch] == [
+            job["url"] for job in page.jobs
+        ]
+        assert found[1][0].tags == ["Remote"]
+        assert completed == ["load_more_results"] * 2
+
+    async def test_load_adding_nothing_stops(self):
+        """Tests that a load that adds no cards ends the iteration."""
+        page = FakePage(25, paging=CareersPage.LOAD_MORE_SELECTOR, stuck=True)
+        found, completed = await batches(page)
+        assert [len(batch) for batch in found] == [10]
+        assert completed == ["load_more_results"]
+
+    async def test_max_pages(self):
+        """Tests that no page past max_pages is requested."""
+        page = FakePage(25, paging=CareersPage.NEXT_PAGE_SELECTOR)
+        found, completed = await batches(page, max_pages=2)
+        assert [len(batch) for batch in found] == [10, 10]
+        assert completed == ["next_results_page"]
+
+    async def test_single_page_and_no_results(self):
+        """Tests that a page without paging controls or results ends at once."""
+        found, completed = await batches(FakePage(7))
+        assert ([len(batch) for batch in found], completed) == ([7], [])
+        assert await batches(FakePage(0)) == ([], [])
+
+
+@pytest.mark.asyncio
+class TestWaitUntilReady:
+    """Class to test how a page that never becomes ready is reported."""
+
+    @pytest.mark.parametrize(
+        "pending, awaited",
+        [
+            ({"verification", "cookie"}, "verification, cookie, ready"),
+            (set(), "ready"),
+        ],
+    )
+    async def test_timeout_names_awaited_kinds(self, pending, awaited):
+        """Tests that the error names the kinds of elements that were waited for."""
+        store = FakeStore()
+        careers = CareersPage(BlankPage(), url=URL, artifacts=store)
+        careers.readiness = ReadinessEngine(
+            [
+                ("verification", CareersPage.VERIFICATION_SELECTORS, True),
+                ("cookie", CareersPage.COOKIE_SELECTORS, True),
+                ("ready", CareersPage.READY_SELECTORS, False),
+            ],
+            stats=SelectorHitStats(),
+            cache=None,
+        )
+        with pytest.raises(PlaywrightError, match=f"waited for: {awaited}\\)"):
+            await careers._wait_until_ready(pending)
+        assert store.saved == ["page_state"]
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.completion import (
+    ActionLatencies,
+    CompletionSettings,
+    CompletionSignal,
+    complete_action,
+)
+
+SIGNAL = CompletionSignal("search_jobs", (".card",), response_url="**/search*")
+
+
+class FakeHandle:
+    def __init__(self, value):
+        self.value = value
+
+    async def json_value(self):
+        return self.value
+
+
+class FakePage:
+    """Reports the render signal and the results response after set delays.
+
+    A result of None times out instead, and "destroyed" fails like an
+    evaluation interrupted by a navigation.
+    """
+
+    def __init__(self, rendered=(0.01, "signal"), responded=(1.0, True)):
+        self.rendered = rendered
+        self.responded = responded
+
+    async def evaluate(self, script, arg):
+        return "https://careers.example.com/careers"
+
+    async def wait_for_function(self, script, arg, timeout):
+        delay, result = self.rendered
+        await asyncio.sleep(delay)
+        if result is None:
+            raise PlaywrightTimeoutError("render signal timed out")
+        if result == "destroyed":
+            raise PlaywrightError("Execution context was destroyed")
+        return FakeHandle(result)
+
+    async def wait_for_response(self, url, timeout):
+        delay, result = self.responded
+        await asyncio.sleep(delay)
+        if result is None:
+            raise PlaywrightTimeoutError("response timed out")
+
+    async def wait_for_load_state(self, state, timeout):
+        pass
+
+
+async def click():
+    pass
+
+
+async def run(page, fallback="none"):
+    """Completes a click on the fake page, keeping the timing out of the summary."""
+    latencies = ActionLatencies()
+    timing = await complete_action(
+        page, SIGNAL, click, CompletionSettings(fallback), latencies
+    )
+    assert latencies.test_timings == [timing]
+    return timing
+
+
+@pytest.mark.asyncio
+class TestCompleteAction:
+    """Class to test which signal completes a page action."""
+
+    async def test_in_place_update_completes(self):
+        """Tests that a mutation of the shown results completes the action."""
+        page = FakePage(rendered=(0.01, "mutation"))
+        timing = await run(page)
+        assert timing.completed_by == "mutation"
+
+    async def test_render_preferred_over_response(self):
+        """Tests that a render shortly after the response is what completes it."""
+        page = FakePage(rendered=(0.1, "signal"), responded=(0.01, True))
+        timing = await run(page)
+        assert timing.completed_by == "signal"
+
+    async def test_response_completes_without_render(self):
+        """Tests that the results response completes an action that renders nothing."""
+        page = FakePage(rendered=(0.01, None), responded=(0.05, True))
+        timing = await run(page)
+        assert timing.completed_by == "response"
+
+    async def test_times_out_without_any_signal(self):
+        """Tests that the timeout is raised when no signal fires and none falls back."""
+        page = FakePage(rendered=(0.01, None), responded=(0.01, None))
+        with pytest.raises(PlaywrightTimeoutError):
+            await run(page)
+
+    async def test_destroyed_context_falls_back(self):
+        """Tests that a signal evaluation broken by a navigation falls back."""
+        page = FakePage(rendered=(0.01, "destroyed"), responded=(0.01, None))
+        timing = await run(page, fallback="networkidle")
+        assert timing.completed_by == "networkidle"
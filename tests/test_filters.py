@@ -2,7 +2,6 @@ import logging
 import allure
 import pytest
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -21,12 +20,13 @@ class TestFilters:
             await careers_page.filter_by_location("All Cities in Poland")
             job_titles = await careers_page.get_job_titles()
             assert len(job_titles) > 0, "No jobs found for All Cities in Poland"
-            logger.info(f"Job titles found for All Cities in Poland: {job_titles}")
+            logger.info("Job titles found for All Cities in Poland: %s", job_titles)
         except TypeError as e:
-            logger.error(f"TypeError occurred: {e}")
-            logger.error(f"careers_page type: {type(careers_page)}")
+            logger.error("TypeError occurred: %s", e)
+            logger.error("careers_page type: %s", type(careers_page))
             logger.error(
-                f"filter_by_location method: {getattr(careers_page, 'filter_by_location', None)}"
+                "filter_by_location method: %s",
+                getattr(careers_page, "filter_by_location", None),
             )
             raise
 
@@ -39,7 +39,45 @@ class TestFilters:
         job_titles = await careers_page.get_job_titles()
 
         assert len(job_titles) > 0, "No remote jobs found"
-        logger.info(f"Job titles found for Remote: {job_titles}")
+        logger.info("Job titles found for Remote: %s", job_titles)
+
+    @allure.story("Validate job listings")
+    @allure.severity(allure.severity_level.NORMAL)
+    async def test_job_listings_content(self, careers_page):
+        """Tests that every listing on the first result pages has a title and link."""
+        logger.info("Starting test_job_listings_content")
+        await careers_page.search_jobs("Developer")
+
+        count = 0
+        async for batch in careers_page.iter_job_listings(max_pages=2):
+            for listing in batch:
+                assert listing.title, f"Listing without title: {listing}"
+                assert listing.url.startswith("http"), f"Listing without link: {listing}"
+            count += len(batch)
+
+        assert count > 0, "No Developer jobs found"
+        logger.info("Validated %d job listings", count)
+
+    @allure.story("Validate job details")
+    @allure.severity(allure.severity_level.NORMAL)
+    async def test_job_details_for_location(self, careers_page, job_details_crawler):
+        """Tests that every listing for a location opens a complete job details page."""
+        logger.info("Starting test_job_details_for_location")
+        await careers_page.filter_by_location("All Cities in Poland")
+
+        urls = []
+        async for batch in careers_page.iter_job_listings(max_pages=2):
+            urls.extend(listing.url for listing in batch)
+        assert urls, "No jobs found for All Cities in Poland"
+
+        failures = []
+        async for result in job_details_crawler.crawl(urls):
+            if not result.ok:
+                failures.append(f"{result.url}: {result.error}")
+            elif not (result.details.title and result.details.location):
+                failures.append(f"{result.url}: missing title or location")
+        assert not failures, f"Invalid job details pages: {failures}"
+        logger.info("Validated %d job details pages", len(urls))
 
     @allure.story("Validate job card content")
     @allure.severity(allure.severity_level.NORMAL)
@@ -53,13 +91,19 @@ class TestFilters:
 
         # Click first job card and verify details
         await careers_page.all_jobs_on_page.first.click()
-        job_title = await job_details_page.get_job_title()
-        job_location = await job_details_page.get_job_location()
-        job_description = await job_details_page.get_job_description()
+        details = await job_details_page.read_details()
+        job_title, job_location, job_description = (
+            details.title,
+            details.location,
+            details.description,
+        )
 
         assert job_title, "Job title is empty"
         assert job_location, "Job location is empty"
         assert job_description, "Job description is empty"
         logger.info(
-            f"Job title: {job_title}, Location: {job_location}, Description: {job_description}"
+            "Job title: %s, Location: %s, Description: %s",
+            job_title,
+            job_location,
+            job_description,
         )
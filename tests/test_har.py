@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from utils.har import HarReplayer, merge_hars, normalize_post_data, normalize_url
+
+JOBS = "https://x.com/jobs?q=qa"
+
+
+def entry(url, text, method="GET", post_data=None, status=200):
+    request = {"method": method, "url": url}
+    if post_data is not None:
+        request["postData"] = {"text": post_data}
+    response = {"status": status, "content": {"text": text}}
+    return {"request": request, "response": response}
+
+
+def write_har(path, entries, pages=()):
+    log = {"version": "1.2", "pages": list(pages), "entries": entries}
+    path.write_text(json.dumps({"log": log}), encoding="utf-8")
+    return path
+
+
+class TestNormalization:
+    """Class to test the request normalisation used to match recorded traffic."""
+
+    @pytest.mark.parametrize(
+        "recorded, requested",
+        [
+            # Parameter order
+            ("https://x.com/jobs?q=qa&loc=pl", "https://x.com/jobs?loc=pl&q=qa"),
+            # Volatile cache busters and tracking parameters
+            ("https://x.com/jobs?q=qa", "https://x.com/jobs?q=qa&_=123&utm_source=ad"),
+            ("https://x.com/jobs?q=qa", "https://x.com/jobs?ts=1&q=qa&cb=9"),
+            # Case of names, values and host, surrounding whitespace, fragment
+            ("https://x.com/jobs?q=qa", "https://X.com/jobs?Q=%20QA%20#results"),
+        ],
+    )
+    def test_equivalent_urls(self, recorded, requested):
+        """Tests that equivalent search URLs normalise to the same key."""
+        assert normalize_url(recorded) == normalize_url(requested)
+
+    @pytest.mark.parametrize(
+        "recorded, requested",
+        [
+            ("https://x.com/jobs?q=qa", "https://x.com/jobs?q=dev"),
+            ("https://x.com/jobs?q=qa", "https://x.com/vacancies?q=qa"),
+            ("https://x.com/jobs?page=1", "https://x.com/jobs?page=2"),
+        ],
+    )
+    def test_different_urls(self, recorded, requested):
+        """Tests that different searches keep different keys."""
+        assert normalize_url(recorded) != normalize_url(requested)
+
+    @pytest.mark.parametrize(
+        "body, normalized",
+        [
+            (None, ""),
+            ("", ""),
+            ('{"b": 1, "a": {"d": 2, "c": 3}}', '{"a": {"c": 3, "d": 2}, "b": 1}'),
+            ("q=qa&loc=pl", "loc=pl&q=qa"),
+            ("plain text body", "plain text body"),
+        ],
+    )
+    def test_post_data(self, body, normalized):
+        """Tests that JSON keys and form fields are sorted, other bodies kept."""
+        assert normalize_post_data(body) == normalized
+
+
+class TestHarReplayer:
+    """Class to test the lookup of recorded responses."""
+
+    def test_recorded_order_then_last_repeated(self):
+        """Tests that repeated requests get their responses in recorded order."""
+        replayer = HarReplayer([entry(JOBS, "first"), entry(JOBS, "second")])
+        texts = [
+            replayer.lookup("GET", JOBS + "&_=1", None)["content"]["text"]
+            for _ in range(3)
+        ]
+        assert texts == ["first", "second", "second"]
+
+    def test_method_and_body_matched(self):
+        """Tests that the method and normalised body are part of the key."""
+        api = "https://x.com/api"
+        replayer = HarReplayer(
+            [entry(api, "found", method="POST", post_data='{"q": "qa", "p": 1}')]
+        )
+        assert replayer.lookup("POST", api, '{"p": 1, "q": "qa"}')
+        assert replayer.lookup("POST", api, '{"p": 2, "q": "qa"}') is None
+        assert replayer.lookup("GET", api, None) is None
+
+
+class TestMergeHars:
+    """Class to test merging per-test archives into the shared archive."""
+
+    def test_duplicates_merged_once(self, tmp_path):
+        """Tests that identical recordings are kept once, other responses all kept."""
+        page = {"id": "page@1", "title": "Careers"}
+        first = write_har(
+            tmp_path / "a.har",
+            [entry("https://x.com/careers", "home"), entry(JOBS, "v1")],
+            [page],
+        )
+        second = write_har(
+            tmp_path / "b.har",
+            [entry("https://x.com/careers?_=2", "home"), entry(JOBS, "v2")],
+            [page],
+        )
+        target = tmp_path / "shared.har"
+        write_har(target, [entry("https://x.com/stale", "old")])
+
+        assert merge_hars([second, first, target], target) == 3
+        log = json.loads(target.read_text(encoding="utf-8"))["log"]
+        assert [e["response"]["content"]["text"] for e in log["entries"]] == [
+            "home",
+            "v1",
+            "v2",
+        ]
+        assert log["pages"] == [page]
+
+    def test_nothing_to_merge(self, tmp_path):
+        """Tests that no archive is written when nothing was recorded."""
+        target = tmp_path / "shared.har"
+        assert merge_hars([], target) == 0
+        assert not target.exists()
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.job_crawler import JobDetailsCrawler
+
+BASE = "https://careers.example.com/vacancy/"
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+
+class FakeContext:
+    """Opens fake pages that answer every URL from a script of outcomes.
+
+    Each URL maps to the outcome of its successive attempts: an HTTP status,
+    or "timeout" for a navigation that times out. The last outcome repeats.
+    """
+
+    def __init__(self, outcomes, load_time=0.01):
+        self.outcomes = outcomes
+        self.load_time = load_time
+        self.attempts = {}
+        self.pages = []
+        self.loading = 0
+        self.max_loading = 0
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.closed = False
+
+    async def goto(self, url, wait_until, timeout):
+        context = self.context
+        attempt = context.attempts.get(url, 0)
+        context.attempts[url] = attempt + 1
+        script = context.outcomes.get(url, [200])
+        outcome = script[min(attempt, len(script) - 1)]
+        context.loading += 1
+        context.max_loading = max(context.max_loading, context.loading)
+        try:
+            await asyncio.sleep(context.load_time)
+        finally:
+            context.loading -= 1
+        if outcome == "timeout":
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+        self.url = url
+        return FakeResponse(outcome)
+
+    def locator(self, selector):
+        return selector
+
+    async def evaluate(self, script, arg):
+        title = "Job " + self.url.rsplit("/", 1)[1]
+        return {
+            name: {
+                "count": 1,
+                "visible": True,
+                "texts": [title if name == "title" else ""],
+                "attributes": {},
+            }
+            for name in arg[0]
+        }
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def crawler(context, concurrency=4, retries=2):
+    return JobDetailsCrawler(
+        context, concurrency=concurrency, retries=retries, backoff=0
+    )
+
+
+@pytest.mark.asyncio
+class TestJobDetailsCrawler:
+    """Class to test reading job details pages concurrently with retries."""
+
+    async def test_transient_failure_retried(self):
+        """Tests that throttled and timed-out navigations are retried until read."""
+        context = FakeContext(
+            {BASE + "1": [429, 200], BASE + "2": ["timeout", 503, 200]}
+        )
+        results = await crawler(context).crawl_all([BASE + "1", BASE + "2"])
+        by_url = {result.url: result for result in results}
+        assert all(result.ok and result.error is None for result in results)
+        assert by_url[BASE + "1"].attempts == 2
+        assert by_url[BASE + "2"].attempts == 3
+        assert by_url[BASE + "2"].details.title == "Job 2"
+
+    async def test_permanent_failure_reported(self):
+        """Tests that a 404 is reported at once and a 503 once retries run out."""
+        context = FakeContext({BASE + "1": [404], BASE + "2": [503]})
+        results = await crawler(context).crawl_all([BASE + "1", BASE + "2", BASE + "3"])
+        by_url = {result.url: result for result in results}
+        assert (by_url[BASE + "1"].ok, by_url[BASE + "1"].error) == (False, "HTTP 404")
+        assert by_url[BASE + "1"].attempts == 1
+        assert (by_url[BASE + "2"].ok, by_url[BASE + "2"].error) == (False, "HTTP 503")
+        assert by_url[BASE + "2"].attempts == 3
+        assert by_url[BASE + "3"].ok
+
+    async def test_concurrency_bounded(self):
+        """Tests that no more pages load at once than the concurrency allows."""
+        context = FakeContext({})
+        urls = [BASE + str(number) for number in range(12)]
+        results = await crawler(context, concurrency=3).crawl_all(urls + urls[:4])
+        assert sorted(result.url for result in results) == sorted(urls)
+        assert context.max_loading == 3
+        assert len(context.pages) == 3
+        assert all(page.is_closed() for page in context.pages)
@@ -0,0 +1,40 @@
+import pytest
+
+from utils.keyword_matcher import KeywordMatcher
+
+
+class TestKeywordMatcher:
+    """Class to test matching job titles against keyword sets."""
+
+    def test_substring_match_like_in_operator(self):
+        """Tests that the default matching agrees with `keyword in title`."""
+        titles = ["Senior QA Engineer", "Manual Tester", "Java Developer", "AQA Lead"]
+        keywords = ["qa", "quality", "test"]
+        result = KeywordMatcher(keywords).match(titles)
+        expected = [t for t in titles if any(k in t.lower() for k in keywords)]
+        assert result.matched_titles == expected
+        assert result.total == len(titles)
+
+    def test_overlapping_keywords_are_all_found(self):
+        """Tests that keywords contained in longer keywords are still reported."""
+        matcher = KeywordMatcher(["qa", "qa automation", "automation"])
+        assert matcher.find("QA Automation Engineer") == ["qa", "qa automation", "automation"]
+
+    def test_word_boundary(self):
+        """Tests that word boundary matching skips keywords inside words."""
+        matcher = KeywordMatcher(["test", "qa"], word_boundary=True)
+        assert matcher.find("Manual Tester") == []
+        assert matcher.find("AQA Engineer") == []
+        assert matcher.find("Test Lead (QA)") == ["test", "qa"]
+
+    def test_synonyms_count_towards_keyword(self):
+        """Tests that synonyms are reported and counted as their keyword."""
+        matcher = KeywordMatcher(["qa"], synonyms={"qa": ["quality assurance", "test"]})
+        result = matcher.match(["Quality Assurance Lead", "Test Engineer", "QA", "DevOps"])
+        assert result.counts["qa"] == 3
+        assert result.matched_titles == ["Quality Assurance Lead", "Test Engineer", "QA"]
+
+    def test_empty_keyword_set(self):
+        """Tests that an empty keyword set is rejected."""
+        with pytest.raises(ValueError):
+            KeywordMatcher([""])
@@ -0,0 +1,40 @@
+import pytest
+
+from benchmarks.load_stats import LatencyHistogram, LoadRecorder, find_degradation
+
+
+def stage(users, p95, error_rate=0.0):
+    return {"users": users, "summary": {"scenario": {"p95_ms": p95, "error_rate": error_rate}}}
+
+
+class TestLoadStats:
+    """Class to test the histograms, summaries and degradation check of load runs."""
+
+    def test_histogram_percentiles_within_bucket_error(self):
+        """Tests that bucketed percentiles stay within 2.5% of the exact values."""
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(float(ms))
+        assert histogram.percentile(50) == pytest.approx(500, rel=0.025)
+        assert histogram.percentile(99) == pytest.approx(990, rel=0.025)
+        assert histogram.percentile(100) == 1000
+        assert histogram.mean_ms == pytest.approx(500.5)
+
+    def test_recorder_summary_and_windows(self):
+        """Tests error rates, throughput and per-window counts of a run."""
+        recorder = LoadRecorder(window=5)
+        for at in (1, 2, 6):
+            recorder.success("search_jobs", 100.0, at)
+        recorder.failure("search_jobs", TimeoutError(), 7)
+        entry = recorder.summary(elapsed=10)["search_jobs"]
+        assert (entry["ok"], entry["failed"], entry["error_rate"]) == (3, 1, 0.25)
+        assert entry["throughput_per_s"] == 0.3
+        assert entry["errors"] == {"TimeoutError": 1}
+        windows = recorder.windows()
+        assert [(w["start_s"], w["ok"], w["failed"]) for w in windows] == [(0, 2, 0), (5, 1, 1)]
+
+    def test_degradation_found(self):
+        """Tests that the first stage with doubled p95 or too many errors is reported."""
+        assert find_degradation([stage(1, 100), stage(4, 150), stage(16, 250)])["users"] == 16
+        assert find_degradation([stage(1, 100), stage(4, 110, error_rate=0.05)])["users"] == 4
+        assert find_degradation([stage(1, 100), stage(4, 120)]) is None
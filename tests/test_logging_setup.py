@@ -0,0 +1,67 @@
+import json
+import logging
+import queue
+
+from utils.logging_setup import (
+    ContextQueueHandler,
+    JsonFormatter,
+    LoggingSettings,
+    SuiteLogging,
+)
+
+
+def make_record(msg, *args, **extra):
+    record = logging.LogRecord("suite.test", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestLoggingSetup:
+    """Class to test the queued, structured logging pipeline."""
+
+    def test_arguments_are_bounded_without_formatting(self):
+        """Tests that long strings are cut and large collections sampled before queueing."""
+        handler = ContextQueueHandler(queue.Queue(), LoggingSettings(max_chars=10, max_items=3))
+        titles = [f"Job {index}" for index in range(100)]
+        small = ["a", "b"]
+        record = handler.prepare(make_record("%s | %s | %s", "x" * 50, titles, small))
+
+        # Nothing is formatted yet: msg and args are kept apart
+        assert record.msg == "%s | %s | %s"
+        assert record.args[0] == "x" * 10 + "... (40 chars truncated)"
+        assert str(record.args[1]) == "['Job 0', 'Job 1', 'Job 2', ... +97 more]"
+        small.append("c")
+        assert record.args[2] == ["a", "b"]
+
+    def test_json_formatter_fields(self):
+        """Tests that records become one JSON object with their test, phase and extras."""
+        record = make_record("Found %d jobs", 3, test="tests/test_a.py::test_b", phase="call")
+        record.job_type = "Remote"
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "Found 3 jobs"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "suite.test"
+        assert entry["test"] == "tests/test_a.py::test_b"
+        assert entry["phase"] == "call"
+        assert entry["job_type"] == "Remote"
+        assert "args" not in entry
+
+    def test_records_are_written_by_the_listener(self, tmp_path):
+        """Tests that records logged while started reach the JSON lines file on stop()."""
+        root = logging.getLogger()
+        level = root.level
+        path = tmp_path / "suite.jsonl"
+        suite_logging = SuiteLogging(LoggingSettings(level="DEBUG", json_path=str(path)))
+        suite_logging.start()
+        try:
+            logging.getLogger("suite.test").debug("Listing %s", list(range(50)))
+        finally:
+            suite_logging.stop()
+            root.setLevel(level)
+
+        entries = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [entry["message"] for entry in entries] == [
+            "Listing [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, "
+            "... +30 more]"
+        ]
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import queue
+
+import pytest
+
+from utils.artifact_store import ArtifactSettings, ArtifactStore
+from utils.logging_setup import ContextQueueHandler, LoggingSettings
+from utils.page_pool import PREFETCH_TAG, WarmPage, WarmPagePool
+
+RUNNING_TEST = "tests/test_a.py::test_b"
+
+
+class FakeFactory:
+    """Creates warm pages after a delay, recording which ones were closed."""
+
+    def __init__(self, delay=0.01, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.created = 0
+        self.closed = []
+
+    async def __call__(self):
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("navigation failed")
+        self.created += 1
+        number = self.created
+
+        async def close():
+            self.closed.append(number)
+
+        return WarmPage(careers_page=None, context=None, close=close, extras={"n": number})
+
+
+class ScreenshotFactory(FakeFactory):
+    """Saves a screenshot and logs an error for each failed navigation."""
+
+    def __init__(self, store, failures):
+        super().__init__(failures=failures)
+        self.store = store
+
+    async def __call__(self):
+        try:
+            return await super().__call__()
+        except RuntimeError:
+            self.store.save_bytes(b"blank page", "page_state", "screenshots", ".png")
+            logging.getLogger("suite.page_pool").error("Page did not load")
+            raise
+
+
+@pytest.mark.asyncio
+class TestWarmPagePool:
+    """Class to test the prefetching pool of navigated careers pages."""
+
+    async def test_next_page_loads_during_test(self):
+        """Tests that a replacement page is navigated while the current one is used."""
+        factory = FakeFactory()
+        pool = WarmPagePool(factory, depth=1)
+        first = await pool.acquire()
+        await asyncio.sleep(0.05)  # the test runs
+        second = await pool.acquire()
+        assert (first.extras["n"], second.extras["n"]) == (1, 2)
+        assert pool.stats()["served"] == 2
+        assert pool.stats()["ready"] == 1
+        await pool.close()
+
+    async def test_pages_discarded_after_use(self):
+        """Tests that released and unused pages are all closed, never reused."""
+        factory = FakeFactory()
+        pool = WarmPagePool(factory, depth=2)
+        warm = await pool.acquire()
+        await pool.release(warm)
+        await asyncio.sleep(0.05)
+        await pool.close()
+        assert sorted(factory.closed) == [1, 2, 3]
+
+    async def test_failed_prefetch_replaced(self):
+        """Tests that a page that failed ahead of time is loaded again on demand."""
+        factory = FakeFactory(failures=1)
+        pool = WarmPagePool(factory, depth=1)
+        warm = await pool.acquire()
+        assert warm is not None
+        assert pool.stats()["failed"] == 1
+        await pool.close()
+
+    async def test_failed_prefetch_not_charged_to_running_test(self, tmp_path):
+        """Tests that a background failure is tagged as prefetch, not as the test."""
+        store = ArtifactStore(ArtifactSettings(root=str(tmp_path)))
+        store.current_test = RUNNING_TEST
+        records = queue.Queue()
+        handler = ContextQueueHandler(records, LoggingSettings())
+        logger = logging.getLogger("suite.page_pool")
+        logger.addHandler(handler)
+        try:
+            logger.error("Test started")
+            pool = WarmPagePool(ScreenshotFactory(store, failures=1), depth=1)
+            assert await pool.acquire() is not None
+            store.save_bytes(b"own page", "navigation_error", "screenshots", ".png")
+            logger.error("Test failed")
+            await pool.close()
+        finally:
+            logger.removeHandler(handler)
+
+        started, prefetch, failed = records.queue
+        assert prefetch.test == PREFETCH_TAG
+        assert failed.test == started.test != PREFETCH_TAG
+        assert [a.name for a in store.artifacts_for(PREFETCH_TAG)] == ["page_state"]
+        assert [a.name for a in store.artifacts_for(RUNNING_TEST)] == [
+            "navigation_error"
+        ]
+        store.close()
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from utils.phase_profiler import (
+    PhaseProfiler,
+    find_regressions,
+    summarize_phases,
+    write_chrome_trace,
+)
+
+
+class Widget:
+    async def load(self):
+        await asyncio.sleep(0.01)
+        return self.render()
+
+    def render(self):
+        return "ok"
+
+
+def nested_properly(events):
+    """Checks that the events of every lane nest like a call stack."""
+    for tid in {event["tid"] for event in events}:
+        stack = []
+        for event in sorted(
+            (e for e in events if e["tid"] == tid), key=lambda e: (e["ts"], -e["dur"])
+        ):
+            while stack and stack[-1] <= event["ts"]:
+                stack.pop()
+            if stack and event["ts"] + event["dur"] > stack[-1]:
+                return False
+            stack.append(event["ts"] + event["dur"])
+    return True
+
+
+class TestPhaseProfiler:
+    """Class to test the phase profiler's timing, timeline and baseline comparison."""
+
+    def test_instrumented_methods_are_timed_and_restored(self):
+        """Tests that instrumented methods record nested events until stop()."""
+        original = Widget.load
+        profiler = PhaseProfiler()
+        profiler.instrument(Widget, "page")
+        try:
+            assert asyncio.run(Widget().load()) == "ok"
+        finally:
+            profiler.stop()
+
+        assert Widget.load is original
+        names = [event["name"] for event in profiler.events]
+        assert names == ["Widget.render", "Widget.load"]
+        render, load = profiler.events
+        assert load["ts"] <= render["ts"] and render["dur"] <= load["dur"]
+
+    def test_concurrent_tasks_get_separate_lanes(self):
+        """Tests that overlapping phases of concurrent tasks still nest per lane."""
+        profiler = PhaseProfiler()
+        profiler.instrument(Widget, "page")
+
+        async def run():
+            with profiler.phase("test call", "test"):
+                await asyncio.gather(*(Widget().load() for _ in range(3)))
+
+        try:
+            asyncio.run(run())
+        finally:
+            profiler.stop()
+
+        loads = [event for event in profiler.events if event["name"] == "Widget.load"]
+        assert len({event["tid"] for event in loads}) == 3
+        assert nested_properly(profiler.events)
+
+    def test_chrome_trace_format(self, tmp_path):
+        """Tests that the timeline is a trace-event JSON object."""
+        profiler = PhaseProfiler()
+        with profiler.phase("browser setup", "fixture"):
+            pass
+        path = write_chrome_trace(profiler.events, tmp_path / "timeline.json")
+
+        trace = json.loads(path.read_text())
+        complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert [e["name"] for e in complete] == ["browser setup"]
+        assert {"ts", "dur", "pid", "tid", "cat"} <= complete[0].keys()
+
+    def test_regressions_against_baseline(self):
+        """Tests that only significant growth of a phase's mean is reported."""
+
+        def events(name, *durations_ms):
+            return [{"name": name, "dur": d * 1000} for d in durations_ms]
+
+        baseline = summarize_phases(
+            events("navigate", 1000, 1000) + events("search", 100) + events("click", 10)
+        )
+        summary = summarize_phases(
+            events("navigate", 1500, 1500) + events("search", 110) + events("click", 40)
+        )
+        regressions = find_regressions(summary, baseline, threshold=0.2, min_delta_ms=50)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("navigate: mean 1000.0ms -> 1500.0ms")
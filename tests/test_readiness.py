@@ -0,0 +1,106 @@
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from utils.readiness import ReadinessEngine, SelectorHitStats
+from utils.selector_cache import SelectorCache
+
+URL = "https://careers.example.com/careers"
+GROUPS = [
+    ("verification", ["#challenge-stage", "iframe[src*='captcha']"], True),
+    ("cookie", ["#accept", "button[contains(text(), 'Accept')]", "#agree"], True),
+    ("ready", ["#search-form", ".top-navigation"], False),
+]
+
+
+class FakeHandle:
+    def __init__(self, value):
+        self.value = value
+
+    async def json_value(self):
+        return self.value
+
+    async def dispose(self):
+        pass
+
+
+class FakePage:
+    """Matches the candidate groups against fixed elements, like the page script.
+
+    Elements map a selector to whether it is visible; selectors in ``invalid``
+    are those the browser cannot parse.
+    """
+
+    url = URL
+
+    def __init__(self, elements, invalid=()):
+        self.elements = elements
+        self.invalid = set(invalid)
+        self.validated = []
+        self.waits = []
+
+    async def evaluate(self, script, selectors):
+        self.validated.append(list(selectors))
+        return [s for s in selectors if s in self.invalid]
+
+    async def wait_for_function(self, script, arg, timeout):
+        self.waits.append(arg)
+        for kind, selectors, require_visible in arg:
+            for selector in selectors:
+                if selector in self.elements and (
+                    self.elements[selector] or not require_visible
+                ):
+                    return FakeHandle({"kind": kind, "selector": selector})
+        raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+
+
+def engine(cache=None):
+    return ReadinessEngine(GROUPS, stats=SelectorHitStats(), cache=cache)
+
+
+@pytest.mark.asyncio
+class TestReadinessEngine:
+    """Class to test waiting for the first of several grouped page states."""
+
+    async def test_kinds_in_priority_order(self):
+        """Tests that an earlier kind wins when several kinds are present."""
+        page = FakePage(
+            {"#challenge-stage": True, "#agree": True, ".top-navigation": True}
+        )
+        readiness = engine()
+        assert (await readiness.wait(page)).kind == "verification"
+        match = await readiness.wait(page, {"ready", "cookie"})
+        assert (match.kind, match.selector) == ("cookie", "#agree")
+        assert [kind for kind, _, _ in page.waits[-1]] == ["cookie", "ready"]
+
+    async def test_hidden_elements_match_only_ready(self):
+        """Tests that hidden elements resolve only groups that allow them."""
+        page = FakePage({"#accept": False, "#search-form": False})
+        match = await engine().wait(page, {"cookie", "ready"})
+        assert (match.kind, match.selector) == ("ready", "#search-form")
+
+    async def test_invalid_selectors_dropped_once(self):
+        """Tests that unparsable selectors are validated once and never sent again."""
+        invalid = GROUPS[1][1][1]
+        page = FakePage({"#agree": True}, invalid=[invalid])
+        readiness = engine()
+        for _ in range(2):
+            assert (await readiness.wait(page, {"cookie"})).selector == "#agree"
+        assert page.validated == [GROUPS[1][1]]
+        assert all(invalid not in group[1] for group in page.waits[-1])
+        assert readiness.stats.invalid == {invalid}
+
+    async def test_learnt_winner_checked_first(self):
+        """Tests that the selector that matched before is checked first next time."""
+        page = FakePage({".top-navigation": True})
+        readiness = engine(SelectorCache())
+        await readiness.wait(page, {"ready"})
+        await readiness.wait(page, {"ready"})
+        assert page.waits[0][0][1] == ["#search-form", ".top-navigation"]
+        assert page.waits[1][0][1] == [".top-navigation", "#search-form"]
+        assert readiness.stats.hits == {".top-navigation": 2}
+
+    async def test_times_out_without_match(self):
+        """Tests that the timeout is raised when no candidate matches."""
+        page = FakePage({"#accept": True})
+        with pytest.raises(PlaywrightTimeoutError):
+            await engine().wait(page, {"ready"}, timeout=100)
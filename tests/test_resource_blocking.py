@@ -0,0 +1,37 @@
+from utils.resource_blocking import KnownSizes
+
+
+class TestKnownSizes:
+    """Class to test the response sizes remembered to estimate blocking savings."""
+
+    def test_keyed_without_query(self):
+        """Tests that URLs differing only in their query share one size."""
+        sizes = KnownSizes()
+        sizes.remember("https://cdn.example.com/hero.jpg?v=1", 100)
+        sizes.remember("https://cdn.example.com/hero.jpg?v=2#top", 120)
+        assert len(sizes) == 1
+        assert sizes.get("https://cdn.example.com/hero.jpg?v=3") == 120
+
+    def test_least_recently_seen_dropped(self):
+        """Tests that the cap drops the sizes seen least recently."""
+        sizes = KnownSizes(max_entries=2)
+        sizes.remember("https://example.com/a.png", 1)
+        sizes.remember("https://example.com/b.png", 2)
+        sizes.remember("https://example.com/a.png", 1)
+        sizes.remember("https://example.com/c.png", 3)
+        assert sizes.get("https://example.com/b.png") is None
+        assert sizes.get("https://example.com/a.png") == 1
+
+    def test_merge_caps_saved_sizes(self):
+        """Tests that saved sizes are normalised, updated and capped on merge."""
+        sizes = KnownSizes(max_entries=2)
+        sizes.remember("https://example.com/c.png", 30)
+        stored = {
+            "https://example.com/a.png?cb=1": 1,
+            "https://example.com/b.png": 2,
+            "https://example.com/c.png": 3,
+        }
+        assert sizes.merge(stored) == {
+            "https://example.com/b.png": 2,
+            "https://example.com/c.png": 30,
+        }
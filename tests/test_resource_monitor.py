@@ -0,0 +1,76 @@
+from utils.resource_monitor import (
+    MIB,
+    ResourceMonitor,
+    ResourceSample,
+    process_rss,
+    summarize_resources,
+)
+
+
+def sample(rss_mb, contexts=1, cpu=0.0):
+    return ResourceSample(
+        at=0.0,
+        rss_bytes=int(rss_mb * MIB),
+        cpu_seconds={1: cpu},
+        contexts=contexts,
+        pages=contexts,
+    )
+
+
+def run_tests(monitor, browser, rss_series, contexts_series=None):
+    """Records one test per value, each starting where the previous one ended."""
+    contexts_series = contexts_series or [1] * len(rss_series)
+    previous = sample(rss_series[0], contexts_series[0])
+    for index, (rss, contexts) in enumerate(zip(rss_series, contexts_series)):
+        after = sample(rss, contexts, cpu=index + 1.0)
+        monitor.record(browser, f"test_{index}", previous, after)
+        previous = after
+
+
+class TestResourceMonitor:
+    """Class to test the attribution of browser resources and the leak checks."""
+
+    def test_process_rss_from_proc(self, tmp_path):
+        """Tests that RSS is read from the process status, and None when absent."""
+        (tmp_path / "42").mkdir()
+        (tmp_path / "42" / "status").write_text("Name:\tchrome\nVmRSS:\t  2048 kB\n")
+        assert process_rss(42, tmp_path) == 2 * MIB
+        assert process_rss(43, tmp_path) is None
+
+    def test_growth_attributed_to_test(self):
+        """Tests that a test is charged the RSS, CPU and contexts it added."""
+        monitor = ResourceMonitor()
+        before, after = sample(100, cpu=1.0), sample(130, contexts=2, cpu=3.5)
+        usage = monitor.record(object(), "test_a", before, after)
+        assert usage.rss_growth == 30 * MIB
+        assert usage.cpu_seconds == 2.5
+        assert usage.contexts_left == 1
+
+    def test_persistent_growth_flagged(self):
+        """Tests that steady growth is a leak but a one-off spike is not."""
+        monitor = ResourceMonitor(leak_threshold_mb=50, window=10)
+        steady, spiky = object(), object()
+        run_tests(monitor, steady, [200 + 15 * i for i in range(10)])
+        run_tests(monitor, spiky, [200, 200, 400, 200, 210, 200, 205, 200, 210, 205])
+        assert [(leak["browser"], leak["metric"]) for leak in monitor.leaks] == [
+            ("browser-1", "rss_bytes")
+        ]
+        assert monitor.leaks[0]["suspects"][0] != "test_0"
+
+    def test_unclosed_contexts_flagged(self):
+        """Tests that contexts piling up across tests are reported as a leak."""
+        monitor = ResourceMonitor(window=4)
+        run_tests(monitor, object(), [200] * 4, contexts_series=[1, 2, 3, 4])
+        assert {leak["metric"] for leak in monitor.leaks} == {"contexts", "pages"}
+        lines = summarize_resources([monitor.snapshot()])
+        assert "4 tests sampled" in lines[0]
+        assert any("contexts leak in browser-1" in line for line in lines)
+
+    def test_ceiling(self):
+        """Tests that a browser over the memory ceiling is due for a restart."""
+        monitor = ResourceMonitor(ceiling_mb=500)
+        browser = object()
+        below = monitor.record(browser, "test_a", sample(300), sample(400))
+        above = monitor.record(browser, "test_b", sample(400), sample(600))
+        assert not monitor.over_ceiling(below)
+        assert monitor.over_ceiling(above)
@@ -2,9 +2,37 @@ import pytest
 import allure
 import logging
 
+from utils.responsive_matrix import format_results
+
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+
+
+async def check_device(careers_page, device):
+    """Runs the layout checks that apply to the device's viewport.
+
+    Visibility is read for all elements at once, in a single round-trip.
+    """
+    if device["width"] > careers_page.MOBILE_BREAKPOINT:
+        view = await careers_page.view_state("search_input", "location_filter")
+        return {
+            "search input visible": view.visible("search_input"),
+            "filters visible": view.visible("location_filter"),
+        }
+    # Verify mobile menu functionality
+    menu_functional = await careers_page.verify_mobile_menu()
+    # Open the search form hidden behind the Search button
+    await careers_page.open_mobile_search()
+    view = await careers_page.view_state("search_input", "location_filter", "skills_filter")
+    return {
+        "mobile menu functional": menu_functional,
+        # Check if search functionality is accessible in mobile view
+        "search input visible": view.visible("search_input"),
+        # Check if filters are accessible in mobile view
+        "filters visible": view.visible("location_filter"),
+        # Verify that filter options are visible
+        "filter options visible": view.visible("skills_filter"),
+    }
 
 
 @allure.feature("Responsive Design")
@@ -12,37 +40,17 @@ logging.basicConfig(level=logging.INFO)
 class TestResponsiveness:
     """Class to test the responsiveness of the careers page on different devices."""
 
-    @pytest.mark.parametrize(
-        "device",
-        [
-            {"name": "iPhone 12", "width": 390, "height": 844},
-            {"name": "iPad Air", "width": 820, "height": 1180},
-        ],
-    )
     @allure.story("Mobile responsiveness")
     @allure.severity(allure.severity_level.CRITICAL)
-    async def test_mobile_responsiveness(self, careers_page, device):
-        """Tests the mobile responsiveness of the careers page."""
-        logger.info(f"Testing mobile responsiveness on {device['name']}")
-        await careers_page.page.set_viewport_size(
-            {"width": device["width"], "height": device["height"]}
-        )
-        # Verify mobile menu functionality
-        assert (
-            await careers_page.verify_mobile_menu()
-        ), f"Mobile menu not functional on {device['name']}"
-        # Check if search functionality is accessible in mobile view
-        assert (
-            await careers_page.check_if_search_input_visible()
-        ), f"Search input not visible on {device['name']}"
-        # Check if filters are accessible in mobile view
-        assert (
-            await careers_page.check_if_filters_visible()
-        ), f"Filter toggle not visible on {device['name']}"
-        # Verify that filter options become visible after clicking
-        assert (
-            await careers_page.skills_filter.is_visible()
-        ), f"Filter options not visible after clicking on {device['name']}"
-        logger.info(
-            f"Mobile responsiveness test passed for {device['name']}"
+    async def test_mobile_responsiveness(self, careers_page, responsive_matrix):
+        """Tests the careers page on every device of get_test_devices()."""
+        logger.info("Testing responsiveness in %s mode", responsive_matrix.mode)
+        results = await responsive_matrix.run(careers_page, check_device)
+        report = "\n".join(format_results(results))
+        allure.attach(
+            report, name="Device matrix", attachment_type=allure.attachment_type.TEXT
         )
+        logger.info("Device matrix results:\n%s", report)
+
+        failed = [result.name for result in results if not result.passed]
+        assert not failed, f"Responsiveness checks failed on {failed}:\n{report}"
@@ -0,0 +1,38 @@
+from utils.scheduling import DEFAULT_DURATION, DurationHistory, plan_schedule
+
+
+class TestPlanSchedule:
+    """Class to test the duration-aware distribution of tests across workers."""
+
+    def test_longest_first_reaches_ideal(self):
+        """Tests that LPT balances uneven durations to the ideal wall-clock time."""
+        durations = {"a": 6, "b": 5, "c": 4, "d": 3, "e": 2, "f": 1}
+        plan = plan_schedule(durations, durations, workers=3)
+        assert plan.ideal == 7
+        assert plan.makespan == 7
+        assert sorted(t for tests in plan.workers for t in tests) == sorted(durations)
+
+    def test_slow_test_does_not_stack(self):
+        """Tests that the slowest test gets a worker to itself."""
+        durations = {"slow": 60, "x1": 10, "x2": 10, "x3": 10, "x4": 10}
+        plan = plan_schedule(durations, durations, workers=2)
+        assert ["slow"] in plan.workers
+        assert plan.makespan == 60
+
+
+class TestDurationHistory:
+    """Class to test the recorded test durations."""
+
+    def test_phases_summed_and_smoothed(self):
+        """Tests that setup, call and teardown add up and blend with the history."""
+        history = DurationHistory({"t": 10.0})
+        history.add("t", 2.0)
+        history.add("t", 4.0)
+        history.add("new", 3.0)
+        history.save(None)
+        assert history.durations == {"t": 8.0, "new": 3.0}
+
+    def test_unknown_test_estimate(self):
+        """Tests that unknown tests are assumed to take the median known duration."""
+        assert DurationHistory().estimate("t") == DEFAULT_DURATION
+        assert DurationHistory({"a": 1.0, "b": 3.0, "c": 10.0}).estimate("t") == 3.0
@@ -4,11 +4,13 @@ import logging
 
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 
 @allure.feature("Job Search")
 @pytest.mark.asyncio
+# Budgets at the "poor" thresholds of the Core Web Vitals, enforced with --perf-budgets
+@pytest.mark.perf_budget(action="navigate", lcp_ms=4000, cls=0.25)
+@pytest.mark.perf_budget(action="search_jobs", duration_ms=5000, long_task_ms=1000)
 class TestSearchJobs:
     """Class to test job search functionality on the careers page."""
 
@@ -21,10 +23,9 @@ class TestSearchJobs:
         job_titles = await careers_page.get_job_titles()
 
         assert len(job_titles) > 0, "No QA jobs found"
-        logger.info(f"Job titles found: {job_titles}, type: {type(job_titles)}")
-        assert careers_page.get_job_title(
-            job_titles, ["qa", "quality", "test"]
-        ), "No QA jobs found in job titles"
+        logger.info("Job titles found: %s, type: %s", job_titles, type(job_titles))
+        qa_titles = careers_page.get_job_title(job_titles, ["qa", "quality", "test"])
+        assert qa_titles, "No QA jobs found in job titles"
 
     @allure.story("Search with invalid input")
     @allure.severity(allure.severity_level.NORMAL)
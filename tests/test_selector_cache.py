@@ -0,0 +1,99 @@
+import pytest
+
+from utils.selector_cache import DEAD_AFTER_MISSES, SelectorCache, dom_fingerprint
+
+URL = "https://careers.example.com/careers"
+COOKIE = ["#accept-a", "#accept-b", "button[contains(text(), 'Accept')]", "#accept-c"]
+
+
+LAYOUT = [["header.top", False], ["form#jobSearch", False], ["input#q", False]]
+BANNER = [["button#onetrust-accept-btn-handler", True]]
+
+
+class FakePage:
+    """Answers the fingerprint evaluation with fixed element tokens."""
+
+    url = URL
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    async def evaluate(self, script, arg):
+        return self.elements
+
+
+def learnt_cache():
+    """Returns a cache that saw #accept-c win after the others were passed over."""
+    cache = SelectorCache()
+    cache.observe_fingerprint(URL, "layout-1")
+    cache.record_invalid(URL, "cookie", [COOKIE[2]])
+    for _ in range(DEAD_AFTER_MISSES):
+        cache.record_match(URL, "cookie", COOKIE[:2] + COOKIE[3:], "#accept-c", 0.2)
+    return cache
+
+
+class TestSelectorCache:
+    """Class to test the learnt order of the readiness fallback selectors."""
+
+    def test_winner_first_and_dead_last(self):
+        """Tests that the last winner is tried first and dead candidates last."""
+        cache = learnt_cache()
+        assert cache.order(URL, "cookie", COOKIE) == [
+            "#accept-c",
+            "#accept-a",
+            "#accept-b",
+            COOKIE[2],
+        ]
+        assert cache.order(URL, "ready", ["#a", "#b"]) == ["#a", "#b"]
+        assert cache.order("https://other.example.com/", "cookie", COOKIE) == COOKIE
+
+    def test_order_persists_across_runs(self):
+        """Tests that a new run loads the saved order and adds to the saved counts."""
+        saved = learnt_cache().dump({})
+        cache = SelectorCache()
+        cache.load(saved)
+        assert cache.order(URL, "cookie", COOKIE)[0] == "#accept-c"
+        cache.record_match(URL, "cookie", ["#accept-c"], "#accept-c", 0.1)
+        records = cache.dump(saved)["careers.example.com"]["selectors"]["cookie"]
+        assert records["#accept-c"]["wins"] == DEAD_AFTER_MISSES + 1
+
+    def test_reset_on_dom_change(self):
+        """Tests that a new DOM fingerprint drops what was learnt on the old one."""
+        saved = learnt_cache().dump({})
+        cache = SelectorCache()
+        cache.load(saved)
+        assert not cache.observe_fingerprint(URL, "layout-1")
+        assert cache.observe_fingerprint(URL, "layout-2")
+        assert cache.order(URL, "cookie", COOKIE) == COOKIE
+        assert cache.dump(saved)["careers.example.com"]["fingerprint"] == "layout-2"
+
+    def test_disabled_cache_keeps_declared_order(self):
+        """Tests that a disabled cache neither reorders nor records."""
+        cache = SelectorCache()
+        cache.enabled = False
+        cache.record_match(URL, "cookie", COOKIE, "#accept-c", 0.1)
+        assert cache.order(URL, "cookie", COOKIE) == COOKIE
+        assert cache.dump({}) == {}
+
+
+@pytest.mark.asyncio
+class TestDomFingerprint:
+    """Class to test the DOM fingerprint that invalidates learnt selectors."""
+
+    async def test_consent_banner_ignored(self):
+        """Tests that a page showing the consent banner keeps the learnt order."""
+        saved = learnt_cache().dump({})
+        saved["careers.example.com"]["fingerprint"] = dom_fingerprint(
+            [token for token, _ in LAYOUT]
+        )
+        cache = SelectorCache()
+        cache.load(saved)
+        await cache.check_fingerprint(FakePage(LAYOUT + BANNER))
+        assert cache.order(URL, "cookie", COOKIE)[0] == "#accept-c"
+
+    async def test_layout_change_detected(self):
+        """Tests that changed layout elements outside the banner reset the order."""
+        cache = SelectorCache()
+        cache.load(learnt_cache().dump({}))
+        await cache.check_fingerprint(FakePage([["form#newSearch", False]] + BANNER))
+        assert cache.order(URL, "cookie", COOKIE) == COOKIE
@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import pytest
+
+from utils.standin_site import CONSENT_COOKIE, StandInSite
+
+# Elements that never get a closing tag
+VOID_TAGS = {"meta", "input", "br", "img", "link"}
+
+
+class Elements(HTMLParser):
+    """Collects every element with its attributes and enclosing tags."""
+
+    def __init__(self, markup):
+        super().__init__()
+        self.found = []
+        self.stack = []
+        self.feed(markup)
+
+    def handle_starttag(self, tag, attrs):
+        self.found.append((tag, dict(attrs), tuple(self.stack)))
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.stack:
+            del self.stack[len(self.stack) - 1 - self.stack[::-1].index(tag) :]
+
+    def having(self, tag, **attrs):
+        return [
+            (found_attrs, parents)
+            for found_tag, found_attrs, parents in self.found
+            if found_tag == tag
+            and all(found_attrs.get(name) == value for name, value in attrs.items())
+        ]
+
+    def job_links(self):
+        """Anchors matching the page object's //ul/li//div//h5//a."""
+        return [
+            attrs
+            for attrs, parents in self.having("a")
+            if "h5" in parents and "div" in parents and "li" in parents
+        ]
+
+
+@pytest.fixture(scope="module")
+def site():
+    with StandInSite(catalogue_size=60, page_size=10) as site:
+        yield site
+
+
+def fetch(site, path, cookie=None):
+    request = Request(site.base_url + path)
+    if cookie:
+        request.add_header("Cookie", cookie)
+    with urlopen(request, timeout=5) as response:
+        return Elements(response.read().decode("utf-8"))
+
+
+class TestStandInSite:
+    """Class to test that the stand-in site serves what the page objects expect."""
+
+    def test_careers_page(self, site):
+        """Tests the search form, results list and ready markers of /careers."""
+        page = fetch(site, "/careers")
+        assert page.having("form", id="jobSearchFilterForm")
+        assert page.having("input", id="new_form_job_search-keyword")
+        assert page.having("span", role="textbox")
+        assert page.having("header", **{"class": "top-navigation--epam-sticky"})
+        assert len(page.job_links()) == 10
+
+    def test_consent_banner_until_cookie(self, site):
+        """Tests that the consent banner shows until the consent cookie is sent."""
+        accept = {"id": "onetrust-accept-btn-handler"}
+        assert fetch(site, "/careers").having("button", **accept)
+        page = fetch(site, "/careers", cookie=f"{CONSENT_COOKIE}=2024-01-01")
+        assert not page.having("button", **accept)
+
+    def test_search_and_pagination(self, site):
+        """Tests that job listings filter by keyword and page through the results."""
+        query = "developer"
+        expected = site.search(query)
+        assert len(expected) > site.page_size
+        hrefs = []
+        path = "/careers/job-listings?" + urlencode({"query": query})
+        while path:
+            page = fetch(site, path)
+            hrefs += [link["href"] for link in page.job_links()]
+            next_links = page.having("a", rel="next")
+            path = next_links[0][0]["href"] if next_links else None
+        assert hrefs == [f"/careers/vacancy/{job.id}" for job in expected]
+        assert all(query in job.title.lower() for job in expected)
+
+    def test_no_results_alert(self, site):
+        """Tests that a search without results shows the alert instead of a list."""
+        page = fetch(site, "/careers/job-listings?query=astronaut")
+        assert page.having("div", role="alert")
+        assert not page.job_links()
+
+    def test_requests_counted_across_threads(self, site):
+        """Tests that concurrent requests are all counted."""
+        before = site.requests_served
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: fetch(site, "/careers"), range(40)))
+        assert site.requests_served - before == 40
@@ -0,0 +1,74 @@
+import pytest
+
+from utils.tracing import TRACE_START_OPTIONS, AdaptiveTracer
+
+
+class TestAdaptiveTracer:
+    """Class to test how the tracing policy reacts to measured overhead."""
+
+    def test_full_tracing_within_budget(self):
+        """Tests that tracing stays at the chosen level while within budget."""
+        tracer = AdaptiveTracer("full", budget=0.2)
+        for _ in range(5):
+            tracer.record(start_stop=0.1, duration=2.0)
+        assert tracer.policy == "full"
+        assert tracer.start_options() == TRACE_START_OPTIONS["full"]
+
+    def test_falls_back_when_over_budget(self):
+        """Tests the fallback from full to lightweight to on-failure-retry."""
+        tracer = AdaptiveTracer("full", budget=0.1, min_samples=2)
+        for _ in range(2):
+            tracer.record(start_stop=0.5, duration=1.0)
+        assert tracer.policy == "lightweight"
+        for _ in range(2):
+            tracer.record(start_stop=0.5, duration=1.0)
+        assert tracer.policy == "on-failure-retry"
+        assert tracer.retries_failures
+        assert tracer.start_options() is None
+        assert tracer.start_options(retry=True) == TRACE_START_OPTIONS["full"]
+        assert tracer.fallbacks == ["full -> lightweight", "lightweight -> on-failure-retry"]
+
+    def test_falls_back_on_slower_actions(self):
+        """Tests that action latency above the untraced baseline counts as overhead."""
+        tracer = AdaptiveTracer("full", budget=0.1, min_samples=2)
+        tracer.record_baseline([("search", 1.0), ("filter", 0.5)])
+        overhead = tracer.record(0.05, 3.0, [("search", 1.5), ("filter", 0.5)])
+        assert overhead == pytest.approx(0.55)
+        assert tracer.policy == "full"
+        tracer.record(0.05, 3.0, [("search", 1.5)])
+        assert tracer.policy == "lightweight"
+
+    def test_actions_without_baseline(self):
+        """Tests that only start/stop time counts until an action has a baseline."""
+        tracer = AdaptiveTracer("full", budget=0.1, min_samples=2)
+        for _ in range(3):
+            overhead = tracer.record(0.05, 3.0, [("search", 1.5)])
+        assert overhead == pytest.approx(0.05)
+        assert tracer.policy == "full"
+
+    def test_takes_baseline_every_nth_test(self):
+        """Tests that every n-th test of a tracing policy runs untraced."""
+        tracer = AdaptiveTracer("lightweight", baseline_every=3)
+        taken = [tracer.takes_baseline() for _ in range(6)]
+        assert taken == [False, False, True, False, False, True]
+        assert not AdaptiveTracer("on-failure-retry").takes_baseline()
+        assert not AdaptiveTracer("full", budget=0, baseline_every=1).takes_baseline()
+
+    def test_reruns_limited(self):
+        """Tests that only the first failures up to the limit are rerun."""
+        tracer = AdaptiveTracer("on-failure-retry", max_reruns=2)
+        assert [tracer.take_rerun() for _ in range(4)] == [True, True, False, False]
+        assert (tracer.reruns, tracer.skipped_reruns) == (2, 2)
+        assert not AdaptiveTracer("full", max_reruns=0).take_rerun()
+
+    def test_zero_budget_disables_fallback(self):
+        """Tests that a zero budget keeps the policy regardless of overhead."""
+        tracer = AdaptiveTracer("full", budget=0)
+        for _ in range(5):
+            tracer.record(start_stop=1.0, duration=1.0)
+        assert tracer.policy == "full"
+
+    def test_unknown_policy(self):
+        """Tests that an unknown policy is rejected."""
+        with pytest.raises(ValueError):
+            AdaptiveTracer("verbose")
@@ -0,0 +1,69 @@
+import pytest
+
+from pages.job_details_page import JobDetailsPage
+from utils.view_state import query_view
+
+
+class FakePage:
+    """Answers every evaluation with a fixed view, counting the round-trips."""
+
+    url = "https://careers.example.com/vacancy/1"
+
+    def __init__(self, state):
+        self.state = state
+        self.evaluations = []
+
+    def locator(self, selector):
+        return selector
+
+    async def evaluate(self, script, arg):
+        self.evaluations.append(arg)
+        selectors = arg[0]
+        return {name: self.state[name] for name in selectors}
+
+
+def element(count=1, visible=True, texts=("",), attributes=None):
+    return {
+        "count": count,
+        "visible": visible,
+        "texts": list(texts) if count else [],
+        "attributes": attributes or {},
+    }
+
+
+@pytest.mark.asyncio
+class TestViewState:
+    """Class to test reading the state of several elements in one evaluation."""
+
+    async def test_one_round_trip_for_all_elements(self):
+        """Tests that every named element is read by a single evaluation."""
+        page = FakePage(
+            {
+                "menu": element(attributes={"aria-expanded": "true"}),
+                "search": element(visible=False),
+                "missing": element(count=0, visible=False),
+            }
+        )
+        view = await query_view(page, {"menu": ".menu", "search": "#q", "missing": ".x"})
+        assert len(page.evaluations) == 1
+        assert view.visible("menu") and not view.visible("search")
+        assert view["menu"].attributes["aria-expanded"] == "true"
+        assert (view["missing"].count, view.text("missing")) == (0, None)
+        assert view["search"].selector == "#q"
+
+    async def test_job_details_read_from_view(self):
+        """Tests that the job details are built from one snapshot of the page."""
+        page = FakePage(
+            {
+                "title": element(texts=["QA Engineer"]),
+                "location": element(texts=["Krakow"]),
+                "description_items": element(count=2, texts=[" Write tests", "Review "]),
+                "apply_button": element(count=0, visible=False),
+            }
+        )
+        details = await JobDetailsPage(page).read_details()
+        assert len(page.evaluations) == 1
+        assert page.evaluations[0][1] == "title"
+        assert (details.title, details.location) == ("QA Engineer", "Krakow")
+        assert details.description == "Write tests Review"
+        assert not details.has_apply_button
@@ -0,0 +1,47 @@
+import pytest
+
+from utils.web_perf import PerfSample, budgets_from_markers, check_budgets
+
+
+def sample(action, **metrics):
+    return PerfSample(action=action, url="https://example.com", navigated=True, metrics=metrics)
+
+
+class TestPerfBudgets:
+    """Class to test how web performance samples are checked against budgets."""
+
+    def test_within_budget(self):
+        """Tests that samples under every limit pass."""
+        budgets = budgets_from_markers([pytest.mark.perf_budget(lcp_ms=4000, cls=0.1).mark])
+        assert check_budgets([sample("navigate", lcp_ms=1200, cls=0.02)], budgets) == []
+
+    def test_over_budget(self):
+        """Tests that a metric over its limit is reported with its action."""
+        budgets = budgets_from_markers([pytest.mark.perf_budget(lcp_ms=4000).mark])
+        violations = check_budgets([sample("navigate", lcp_ms=5200.5)], budgets)
+        assert [str(v) for v in violations] == ["navigate: lcp_ms=5200.5 over budget 4000"]
+
+    def test_action_scoped_budget(self):
+        """Tests that a budget restricted to an action ignores other actions."""
+        budgets = budgets_from_markers(
+            [pytest.mark.perf_budget(action="search_jobs", duration_ms=1000).mark]
+        )
+        samples = [sample("navigate", duration_ms=3000), sample("search_jobs", duration_ms=1500)]
+        violations = check_budgets(samples, budgets)
+        assert [(v.action, v.metric) for v in violations] == [("search_jobs", "duration_ms")]
+
+    def test_closest_budget_wins(self):
+        """Tests that a test's marker overrides the limit of a class marker."""
+        budgets = budgets_from_markers(
+            [
+                pytest.mark.perf_budget(cls=0.5).mark,
+                pytest.mark.perf_budget(cls=0.1, lcp_ms=2000).mark,
+            ]
+        )
+        violations = check_budgets([sample("navigate", cls=0.3, lcp_ms=2500)], budgets)
+        assert [v.metric for v in violations] == ["lcp_ms"]
+
+    def test_missing_metric_is_not_a_violation(self):
+        """Tests that metrics the browser did not report are skipped."""
+        budgets = budgets_from_markers([pytest.mark.perf_budget(lcp_ms=100).mark])
+        assert check_budgets([sample("navigate", lcp_ms=None)], budgets) == []
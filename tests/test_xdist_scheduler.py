@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+from utils.scheduling import DurationHistory
+from utils.xdist_scheduler import DurationScheduling
+
+
+class FakeCache(dict):
+    def get(self, key, default):
+        return super().get(key, default)
+
+
+class FakeConfig:
+    def __init__(self, workers):
+        self.cache = FakeCache()
+        self.options = {"tx": ["popen"] * workers, "numprocesses": None, "maxschedchunk": None}
+
+    def getoption(self, name):
+        return self.options.get(name)
+
+    getvalue = getoption
+
+
+class FakeNode:
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def start(durations, workers=2):
+    config = FakeConfig(workers)
+    scheduler = DurationScheduling(config, history=DurationHistory(durations))
+    nodes = [FakeNode(f"gw{i}") for i in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, list(durations))
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def finish_all(scheduler, node):
+    while scheduler.node2pending[node]:
+        scheduler.mark_test_complete(node, scheduler.node2pending[node][0])
+
+
+class TestDurationScheduling:
+    """Class to test the xdist scheduler fed by the duration plan."""
+
+    def test_slow_test_runs_alone(self):
+        """Tests that the slow test's worker is not given the other tests."""
+        scheduler, (first, second) = start({"slow": 30, "a": 5, "b": 5, "c": 5})
+        # The short tests are done while the slow one still runs
+        for node in (second, first):
+            finish_all(scheduler, node)
+        tests = scheduler.collection
+        assert sorted(tests[i] for i in first.sent + second.sent) == sorted(tests)
+        assert [tests[i] for i in first.sent] == ["slow"]
+        assert scheduler.tests_finished
+        assert first.shutting_down and second.shutting_down
+
+    def test_idle_worker_takes_queued_tests(self):
+        """Tests that a worker that ran dry takes tests from the busiest queue."""
+        tests = [f"t{i}" for i in range(8)]
+        scheduler, (first, second) = start(dict.fromkeys(tests, 1.0))
+        assert len(scheduler.queues[first]) == 2
+        # The second worker's first test turns out slower than its estimate
+        finish_all(scheduler, first)
+        assert len(first.sent) > 4
+        finish_all(scheduler, second)
+        assert len(first.sent) + len(second.sent) == 8
+        assert not scheduler.has_pending
+
+    def test_crashed_worker_tests_rerun(self):
+        """Tests that a crashed worker's tests go to a running or replacement worker."""
+        tests = [f"t{i}" for i in range(6)]
+        scheduler, (first, second) = start(dict.fromkeys(tests, 1.0))
+        crashed = scheduler.node2pending[second][0]
+        assert scheduler.remove_node(second) == scheduler.collection[crashed]
+        finish_all(scheduler, first)
+        assert len(set(first.sent)) == 5
+        assert first.shutting_down
+
+        # With every worker shut down, the tests wait for a replacement worker
+        scheduler, (first, second) = start(dict.fromkeys(tests, 1.0))
+        finish_all(scheduler, first)
+        scheduler.remove_node(second)
+        assert scheduler.pending
+        replacement = FakeNode("gw2")
+        scheduler.add_node(replacement)
+        scheduler.add_node_collection(replacement, tests)
+        scheduler.schedule()
+        finish_all(scheduler, replacement)
+        assert replacement.sent and not scheduler.pending
+        assert scheduler.tests_finished
@@ -0,0 +1,301 @@
+import atexit
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stored files are named <name>-<digest>.<ext>, so the digest is read back on start
+_STORED_NAME = re.compile(r"-(?P<digest>[0-9a-f]{16})\.[^.]+$")
+_STAGING_DIR = ".staging"
+
+# Owner of the artifacts saved by the current asyncio task when it works ahead
+# of the running test, e.g. while prefetching a page
+_TASK_OWNER: ContextVar[Optional[str]] = ContextVar("artifact_owner", default=None)
+
+
+def link_task_artifacts(owner: Optional[str]) -> None:
+    """Links the artifacts the current asyncio task saves to ``owner``.
+
+    Tasks run in a copy of their creator's context, so the artifacts of the
+    running test are still linked to it.
+    """
+    _TASK_OWNER.set(owner)
+
+
+@dataclass
+class ArtifactSettings:
+    """Where artifacts are kept and how much of them.
+
+    Attributes:
+        root (str): Directory holding one subdirectory per artifact kind.
+        max_bytes (int): Total size kept; the oldest artifacts are deleted
+            beyond it. 0 disables the cap.
+        max_age_days (float): Artifacts older than this are deleted.
+            0 disables the limit.
+        compress (bool): Re-deflate zip archives (traces) before storing them.
+            Screenshots are PNGs, already compressed, and stored as they are.
+    """
+
+    root: str = "artifacts"
+    max_bytes: int = 500 * 1024 * 1024
+    max_age_days: float = 7
+    compress: bool = False
+
+
+@dataclass
+class Artifact:
+    """A stored screenshot or trace."""
+
+    name: str
+    kind: str
+    path: Path
+    digest: str
+    size: int
+    test: Optional[str] = None
+    duplicate: bool = False
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_") or "artifact"
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _deflate_zip(source: Path, target: Path) -> None:
+    """Rewrites a zip archive with every entry deflated."""
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(
+        target, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9
+    ) as dst:
+        for info in src.infolist():
+            dst.writestr(info.filename, src.read(info), zipfile.ZIP_DEFLATED)
+
+
+class ArtifactStore:
+    """Writes screenshots and traces on a background thread.
+
+    Artifacts are named by a hash of their content, so names never collide
+    and a second copy of the same content (e.g. two screenshots of one
+    unchanged page) is linked to the file already stored instead of being
+    written again. After each write the store deletes artifacts past the age
+    limit, then the oldest ones until the total fits the size cap.
+
+    Callers get a Future for every artifact; artifacts_for() waits for the
+    ones of a test, so they can be attached to its report.
+    """
+
+    def __init__(self, settings: Optional[ArtifactSettings] = None):
+        self.settings = settings or ArtifactSettings()
+        self.root = Path(self.settings.root)
+        # One staging directory per process: xdist workers share the root
+        self.staging_dir = self.root / _STAGING_DIR / str(os.getpid())
+        self.current_test: Optional[str] = None
+        self.deduplicated = 0
+        self.pruned = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifacts")
+        self._pending: Dict[Optional[str], List[Future]] = defaultdict(list)
+        self._lock = threading.Lock()
+        # Owned by the writer thread once started
+        self._by_digest: Dict[str, Path] = {}
+        self._files: Dict[Path, os.stat_result] = {}
+        self._executor.submit(self._index)
+
+    def _index(self) -> None:
+        """Indexes the artifacts kept from earlier runs and applies the caps."""
+        if not self.root.exists():
+            return
+        for path in self.root.rglob("*"):
+            if not path.is_file() or _STAGING_DIR in path.parts:
+                continue
+            self._files[path] = path.stat()
+            match = _STORED_NAME.search(path.name)
+            if match:
+                self._by_digest[match.group("digest")] = path
+        self._prune()
+
+    def staging_path(self, suffix: str = "") -> Path:
+        """Returns a fresh path for a file that will be handed to save_file()."""
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        return self.staging_dir / f"{uuid.uuid4().hex}{suffix}"
+
+    def save_bytes(
+        self, data: bytes, name: str, kind: str, suffix: str, test: Optional[str] = None
+    ) -> "Future[Artifact]":
+        """Queues content, such as a screenshot, to be stored.
+
+        Args:
+            data (bytes): The artifact's content.
+            name (str): Readable part of the file name, e.g. the error type.
+            kind (str): Subdirectory of the artifact, e.g. "screenshots".
+            suffix (str): File extension, e.g. ".png".
+            test (str, optional): Node id of the test the artifact belongs to.
+                Defaults to the running test.
+        """
+        return self._submit(test, self._store_bytes, data, name, kind, suffix)
+
+    def save_file(
+        self, source: Path, name: str, kind: str, test: Optional[str] = None
+    ) -> "Future[Artifact]":
+        """Queues a file written elsewhere, such as a trace, to be moved into the store.
+
+        The source file is consumed: it is moved, or deleted when its content
+        is already stored.
+        """
+        return self._submit(test, self._store_file, Path(source), name, kind)
+
+    def _submit(self, test: Optional[str], store, *args) -> "Future[Artifact]":
+        if test is None:
+            test = _TASK_OWNER.get() or self.current_test
+        future = self._executor.submit(store, *args, test)
+        with self._lock:
+            self._pending[test].append(future)
+        return future
+
+    def _store_bytes(self, data, name, kind, suffix, test) -> Artifact:
+        digest = _digest(data)
+        existing = self._existing(digest, name, kind, test)
+        if existing is not None:
+            return existing
+        path = self._target(name, kind, digest, suffix)
+        path.write_bytes(data)
+        return self._added(path, name, kind, digest, test)
+
+    def _store_file(self, source, name, kind, test) -> Artifact:
+        digest = _digest(source.read_bytes())
+        existing = self._existing(digest, name, kind, test)
+        if existing is not None:
+            source.unlink()
+            return existing
+        path = self._target(name, kind, digest, source.suffix)
+        if self.settings.compress and zipfile.is_zipfile(source):
+            _deflate_zip(source, path)
+            source.unlink()
+        else:
+            shutil.move(str(source), str(path))
+        return self._added(path, name, kind, digest, test)
+
+    def _existing(self, digest, name, kind, test) -> Optional[Artifact]:
+        path = self._by_digest.get(digest)
+        if path is None or not path.exists():
+            return None
+        self.deduplicated += 1
+        logger.debug("Artifact %s has the same content as %s", name, path)
+        # Refresh the mtime so a reused artifact is not the next one pruned
+        os.utime(path)
+        self._files[path] = path.stat()
+        return Artifact(name, kind, path, digest, path.stat().st_size, test, True)
+
+    def _target(self, name, kind, digest, suffix) -> Path:
+        directory = self.root / kind
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f"{_safe_name(name)}-{digest}{suffix}"
+
+    def _added(self, path, name, kind, digest, test) -> Artifact:
+        self._by_digest[digest] = path
+        self._files[path] = path.stat()
+        logger.info("Saved %s %s to %s", kind, name, path)
+        self._prune(keep=path)
+        return Artifact(name, kind, path, digest, self._files[path].st_size, test)
+
+    def _prune(self, keep: Optional[Path] = None) -> None:
+        """Deletes expired artifacts, then the oldest ones over the size cap."""
+        expired = []
+        if self.settings.max_age_days > 0:
+            cutoff = time.time() - self.settings.max_age_days * 86400
+            expired = [p for p, st in self._files.items() if st.st_mtime < cutoff]
+        for path in expired:
+            self._delete(path)
+        if self.settings.max_bytes <= 0:
+            return
+        total = sum(st.st_size for st in self._files.values())
+        for path in sorted(self._files, key=lambda p: self._files[p].st_mtime):
+            if total <= self.settings.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= self._files[path].st_size
+            self._delete(path)
+
+    def _delete(self, path: Path) -> None:
+        self._files.pop(path, None)
+        match = _STORED_NAME.search(path.name)
+        if match and self._by_digest.get(match.group("digest")) == path:
+            del self._by_digest[match.group("digest")]
+        try:
+            path.unlink()
+            self.pruned += 1
+        except FileNotFoundError:
+            pass
+
+    def artifacts_for(self, test: Optional[str]) -> List[Artifact]:
+        """Waits for a test's queued artifacts and returns the stored ones."""
+        with self._lock:
+            futures = self._pending.pop(test, [])
+        artifacts: Dict[Path, Artifact] = {}
+        for future in futures:
+            try:
+                artifact = future.result()
+            except Exception as e:
+                logger.error("Failed to store artifact of %s: %s", test, e)
+                continue
+            # The same content captured twice in one test is linked once
+            artifacts.setdefault(artifact.path, artifact)
+        return list(artifacts.values())
+
+    def close(self) -> None:
+        """Waits for every queued write and stops the writer thread.
+
+        Writes no test collected (e.g. of the consent warm-up) are checked here,
+        so their failures are still logged.
+        """
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            unread = dict(self._pending)
+            self._pending.clear()
+        for test, futures in unread.items():
+            for future in futures:
+                if future.exception() is not None:
+                    logger.error(
+                        "Failed to store artifact of %s: %s", test, future.exception()
+                    )
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        try:
+            # Only succeeds once the last worker has removed its own directory
+            self.staging_dir.parent.rmdir()
+        except OSError:
+            pass
+
+
+_default_store: Optional[ArtifactStore] = None
+
+
+def default_store() -> ArtifactStore:
+    """Returns the process-wide store, creating one with the default settings."""
+    global _default_store
+    if _default_store is None:
+        set_default_store(ArtifactStore())
+    return _default_store
+
+
+def set_default_store(store: Optional[ArtifactStore]) -> None:
+    """Makes page objects created without a store use this one."""
+    global _default_store
+    if _default_store is not None and _default_store is not store:
+        atexit.unregister(_default_store.close)
+    _default_store = store
+    if store is not None:
+        atexit.register(store.close)
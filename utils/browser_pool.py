@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from playwright.async_api import Browser, Playwright, Error as PlaywrightError
+
+logger = logging.getLogger(__name__)
+
+BROWSER_LAUNCH_ARGS = [
+    "--start-maximized",
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+]
+
+# Options of every test context, shared with the benchmarks
+CONTEXT_OPTIONS = {
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "viewport": {"width": 1920, "height": 1080},
+    "ignore_https_errors": True,
+    "service_workers": "block",  # Disable service workers for better stability
+}
+
+
+@dataclass
+class PooledBrowser:
+    """A browser owned by the pool together with its usage counters."""
+
+    browser: Browser
+    launch_seconds: float
+    uses: int = 0
+    leases: int = 0
+    retired: bool = False
+
+
+class BrowserPool:
+    """Pool of long-lived browsers shared by the tests of one worker.
+
+    Launching Chromium is the most expensive part of a test setup, so the pool
+    launches each browser once and hands it out to many tests. Isolation is
+    kept at the context level: callers still create a fresh BrowserContext per
+    test. A browser is restarted once it has served ``max_uses`` tests or
+    fails its health check.
+    """
+
+    def __init__(
+        self,
+        playwright: Playwright,
+        size: int = 1,
+        max_uses: int = 50,
+        headless: bool = True,
+        launch_timeout: int = 60000,
+    ):
+        """Initializes the pool without launching any browser yet.
+
+        Args:
+            playwright (Playwright): Started Playwright driver used to launch browsers.
+            size (int): Maximum number of browsers kept alive at the same time.
+            max_uses (int): Number of leases after which a browser is restarted.
+            headless (bool): Whether to run the browsers headless.
+            launch_timeout (int): Browser launch timeout in milliseconds.
+        """
+        self.playwright = playwright
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.headless = headless
+        self.launch_timeout = launch_timeout
+        self._entries: List[PooledBrowser] = []
+        self._lock = asyncio.Lock()
+        self.launches = 0
+        self.restarts = 0
+        self.total_leases = 0
+        self.test_leases = 0
+        self.test_launches = 0
+        self.total_launch_seconds = 0.0
+
+    async def _launch(self) -> PooledBrowser:
+        """Launches a new browser and registers it in the pool."""
+        logger.debug("Launching pooled browser")
+        start = time.perf_counter()
+        browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=BROWSER_LAUNCH_ARGS,
+            timeout=self.launch_timeout,
+        )
+        elapsed = time.perf_counter() - start
+        self.launches += 1
+        self.total_launch_seconds += elapsed
+        entry = PooledBrowser(browser=browser, launch_seconds=elapsed)
+        self._entries.append(entry)
+        logger.info("Pooled browser launched in %.2fs", elapsed)
+        return entry
+
+    async def _discard(self, entry: PooledBrowser) -> None:
+        """Removes a browser from the pool and closes it."""
+        if entry in self._entries:
+            self._entries.remove(entry)
+        try:
+            await entry.browser.close()
+        except PlaywrightError as e:
+            logger.error("Error closing pooled browser: %s", e)
+
+    @staticmethod
+    def is_healthy(entry: PooledBrowser) -> bool:
+        """Checks whether a pooled browser can still serve new contexts."""
+        return not entry.retired and entry.browser.is_connected()
+
+    async def acquire(self, for_test: bool = True) -> PooledBrowser:
+        """Leases a healthy browser, launching or restarting one if needed.
+
+        Args:
+            for_test (bool): Whether the lease serves a test. Other leases,
+                such as the consent warm-up or prefetched pages, are left out
+                of the tests served and the launch time saved.
+        """
+        async with self._lock:
+            for entry in list(self._entries):
+                if not entry.browser.is_connected():
+                    logger.warning("Pooled browser disconnected, discarding it")
+                    entry.retired = True
+                if entry.retired and entry.leases == 0:
+                    await self._discard(entry)
+
+            candidates = [e for e in self._entries if self.is_healthy(e)]
+            if not candidates or (
+                len(self._entries) < self.size
+                and all(e.leases > 0 for e in candidates)
+            ):
+                entry = await self._launch()
+                self.test_launches += for_test
+            else:
+                entry = min(candidates, key=lambda e: (e.leases, e.uses))
+
+            entry.uses += 1
+            entry.leases += 1
+            self.total_leases += 1
+            self.test_leases += for_test
+            return entry
+
+    async def release(self, entry: PooledBrowser) -> None:
+        """Returns a leased browser and restarts it once it is used up."""
+        async with self._lock:
+            entry.leases = max(0, entry.leases - 1)
+            if entry.uses >= self.max_uses and not entry.retired:
+                logger.info(
+                    "Pooled browser served %d tests, scheduling restart", entry.uses
+                )
+                entry.retired = True
+                self.restarts += 1
+            if entry.retired and entry.leases == 0:
+                await self._discard(entry)
+
+    async def restart(self, entry: PooledBrowser) -> None:
+        """Retires a browser so that the next lease gets a fresh one."""
+        async with self._lock:
+            if not entry.retired:
+                entry.retired = True
+                self.restarts += 1
+            if entry.leases == 0:
+                await self._discard(entry)
+
+    async def close(self) -> None:
+        """Closes every browser owned by the pool."""
+        async with self._lock:
+            for entry in list(self._entries):
+                await self._discard(entry)
+
+    def stats(self) -> Dict[str, float]:
+        """Returns launch statistics, including the launch time saved by pooling.
+
+        The saving is estimated as the average launch time multiplied by the
+        number of test leases that did not need a launch of their own.
+        """
+        average = self.total_launch_seconds / self.launches if self.launches else 0.0
+        reused = self.test_leases - self.test_launches
+        return {
+            "launches": self.launches,
+            "restarts": self.restarts,
+            "leases": self.test_leases,
+            "other_leases": self.total_leases - self.test_leases,
+            "launch_seconds": round(self.total_launch_seconds, 3),
+            "average_launch_seconds": round(average, 3),
+            "launch_seconds_saved": round(average * reused, 3),
+        }
+
+
+def summarize_pool_stats(stats: List[Dict[str, float]]) -> Optional[str]:
+    """Formats the pool statistics of one or more workers as a summary line."""
+    if not stats:
+        return None
+    launches = sum(s["launches"] for s in stats)
+    leases = sum(s["leases"] for s in stats)
+    spent = sum(s["launch_seconds"] for s in stats)
+    saved = sum(s["launch_seconds_saved"] for s in stats)
+    return (
+        f"{leases} tests served by {launches} browser launches "
+        f"({spent:.1f}s spent launching, ~{saved:.1f}s saved)"
+    )
@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Pattern, Tuple, Union
+
+from playwright.async_api import Error as PlaywrightError, Page
+
+logger = logging.getLogger(__name__)
+
+FALLBACKS = ("networkidle", "none")
+
+# Seconds the render signal gets to fire once the results response arrived
+RESPONSE_GRACE = 0.5
+
+# Shared by both scripts: resolves CSS selectors, or XPath ones starting with "/"
+_QUERY_ALL = """
+const queryAll = (selector) => {
+    if (!selector.startsWith('/')) {
+        return Array.from(document.querySelectorAll(selector));
+    }
+    const found = document.evaluate(
+        selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return Array.from({length: found.snapshotLength}, (_, i) => found.snapshotItem(i));
+};
+"""
+
+# Marks the elements already on the page so only newly rendered ones count, and
+# watches them for in-place updates: a re-render that keeps the nodes but
+# changes their text or children (or those of their container) is a mutation
+_STAMP_SCRIPT = (
+    "(selectors) => {"
+    + _QUERY_ALL
+    + """
+    for (const selector of selectors) {
+        for (const el of queryAll(selector)) {
+            el.setAttribute('data-pw-stale', '');
+        }
+    }
+    if (window.__pwCompletion) {
+        window.__pwCompletion.observer.disconnect();
+    }
+    const state = {mutated: false};
+    state.observer = new MutationObserver((mutations) => {
+        if (state.mutated) {
+            return;
+        }
+        const watched = selectors.flatMap((selector) => queryAll(selector));
+        state.mutated = mutations.some((mutation) => watched.some(
+            (el) => el.contains(mutation.target) || el.parentNode === mutation.target));
+    });
+    if (selectors.length) {
+        state.observer.observe(
+            document, {childList: true, characterData: true, subtree: true});
+    }
+    window.__pwCompletion = state;
+    return location.href;
+}"""
+)
+
+# Resolves to what completed the action: "signal" or "mutation"
+_SIGNAL_SCRIPT = (
+    "([selectors, requireFresh, startUrl, urlChange]) => {"
+    + _QUERY_ALL
+    + """
+    const done = (by) => {
+        if (window.__pwCompletion) {
+            window.__pwCompletion.observer.disconnect();
+        }
+        return by;
+    };
+    if (urlChange && location.href !== startUrl && document.readyState !== 'loading') {
+        return done('signal');
+    }
+    if (selectors.some((selector) => queryAll(selector).some(
+            (el) => !requireFresh || !el.hasAttribute('data-pw-stale')))) {
+        return done('signal');
+    }
+    const state = window.__pwCompletion;
+    return requireFresh && state && state.mutated ? done('mutation') : false;
+}"""
+)
+
+
+@dataclass(frozen=True)
+class CompletionSignal:
+    """Describes what marks an action as complete.
+
+    Attributes:
+        name (str): Name used when reporting latencies.
+        selectors (tuple): CSS or XPath selectors of the elements the action renders.
+        require_fresh (bool): Only count elements rendered after the action
+            started, i.e. new or re-rendered nodes, not the ones already shown.
+            Updates to the text or children of the shown ones also count.
+        url_change (bool): Also complete once the page navigated to another URL.
+        response_url (str or Pattern, optional): URL glob or pattern of the
+            response carrying the action's results; it completes the action
+            too, e.g. when the same results come back and nothing re-renders.
+        timeout (float): Time to wait for the signal in milliseconds.
+    """
+
+    name: str
+    selectors: Tuple[str, ...]
+    require_fresh: bool = True
+    url_change: bool = False
+    response_url: Optional[Union[str, Pattern]] = None
+    timeout: float = 10000
+
+
+@dataclass
+class CompletionSettings:
+    """Suite-wide completion behaviour, configured once from conftest.py.
+
+    Attributes:
+        fallback (str): "networkidle" to fall back to waiting for network
+            idle when the signal does not fire, "none" to fail instead.
+        fallback_timeout (float): Timeout of the fallback in milliseconds.
+    """
+
+    fallback: str = "networkidle"
+    fallback_timeout: float = 30000
+
+
+SETTINGS = CompletionSettings()
+
+
+@dataclass
+class ActionTiming:
+    """Latency of one page-object action."""
+
+    action: str
+    seconds: float
+    completed_by: str
+
+
+class ActionLatencies:
+    """Collects action latencies for the run summary and the current test."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.fallbacks: Dict[str, int] = {}
+        self.test_timings: List[ActionTiming] = []
+
+    def start_test(self) -> None:
+        """Starts collecting the timings of a new test in test_timings."""
+        self.test_timings = []
+
+    def record(self, timing: ActionTiming) -> None:
+        self.samples.setdefault(timing.action, []).append(timing.seconds)
+        self.test_timings.append(timing)
+        if timing.completed_by == "networkidle":
+            self.fallbacks[timing.action] = self.fallbacks.get(timing.action, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Returns the latencies as plain data, suitable for xdist transport."""
+        return {
+            action: {"samples": samples, "fallbacks": self.fallbacks.get(action, 0)}
+            for action, samples in self.samples.items()
+        }
+
+
+ACTION_LATENCIES = ActionLatencies()
+
+
+async def _rendered(page: Page, signal: CompletionSignal, start_url: str) -> str:
+    handle = await page.wait_for_function(
+        _SIGNAL_SCRIPT,
+        arg=[list(signal.selectors), signal.require_fresh, start_url, signal.url_change],
+        timeout=signal.timeout,
+    )
+    return await handle.json_value()
+
+
+async def _responded(page: Page, signal: CompletionSignal) -> str:
+    await page.wait_for_response(signal.response_url, timeout=signal.timeout)
+    return "response"
+
+
+async def _first_signal(waiters: List[asyncio.Future]) -> str:
+    """Returns what completed first, raising only once every waiter failed.
+
+    The results response usually arrives just before they are rendered, so it
+    leaves the other signals RESPONSE_GRACE seconds to report the render.
+    """
+    pending = set(waiters)
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for waiter in [waiter for waiter in waiters if waiter in done]:
+                if waiter.exception() is not None:
+                    error = error or waiter.exception()
+                    continue
+                if waiter.result() == "response" and pending:
+                    rendered, pending = await asyncio.wait(
+                        pending, timeout=RESPONSE_GRACE
+                    )
+                    for other in rendered:
+                        if other.exception() is None:
+                            return other.result()
+                return waiter.result()
+        raise error
+    finally:
+        for waiter in pending:
+            waiter.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def complete_action(
+    page: Page,
+    signal: CompletionSignal,
+    action: Callable[[], Awaitable[None]],
+    settings: Optional[CompletionSettings] = None,
+    latencies: Optional[ActionLatencies] = None,
+) -> ActionTiming:
+    """Performs an action and waits until its completion signal fires.
+
+    The signal is evaluated in the page on every animation frame, so the wait
+    returns as soon as the results are rendered, or updated in place, instead
+    of waiting for a quiet network. A signal with a response URL also
+    completes once that response arrives. If none of them fires within the
+    timeout, the configured fallback (network idle) is used, or the timeout is
+    raised.
+
+    Args:
+        page (Page): Page the action runs on.
+        signal (CompletionSignal): What marks the action as complete.
+        action (Callable): Coroutine function triggering the action.
+        settings (CompletionSettings, optional): Fallback settings, the
+            suite-wide SETTINGS by default.
+        latencies (ActionLatencies, optional): Collector of the timing, the
+            suite-wide ACTION_LATENCIES by default.
+
+    Returns:
+        ActionTiming: How long the action took and what completed it.
+    """
+    settings = settings or SETTINGS
+    start_url = await page.evaluate(
+        _STAMP_SCRIPT, list(signal.selectors) if signal.require_fresh else []
+    )
+    # Listen before acting, so a fast response is not missed
+    waiters = []
+    if signal.response_url is not None:
+        waiters.append(asyncio.ensure_future(_responded(page, signal)))
+    start = time.perf_counter()
+    try:
+        await action()
+    except BaseException:
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        raise
+    waiters.insert(0, asyncio.ensure_future(_rendered(page, signal, start_url)))
+    try:
+        completed_by = await _first_signal(waiters)
+    except PlaywrightError as e:
+        # Timeouts, and evaluation errors such as a context destroyed by a
+        # navigation, which leave the signal unknown just the same
+        if settings.fallback != "networkidle":
+            raise
+        logger.warning(
+            "Completion signal for %s did not fire (%s), falling back to networkidle",
+            signal.name,
+            e,
+        )
+        await page.wait_for_load_state("networkidle", timeout=settings.fallback_timeout)
+        completed_by = "networkidle"
+
+    timing = ActionTiming(signal.name, time.perf_counter() - start, completed_by)
+    (latencies or ACTION_LATENCIES).record(timing)
+    logger.info(
+        "Action %s completed by %s in %.3fs",
+        timing.action,
+        timing.completed_by,
+        timing.seconds,
+    )
+    return timing
+
+
+def summarize_latencies(snapshots: List[Dict[str, Dict]]) -> List[str]:
+    """Merges worker snapshots into one report line per action."""
+    merged: Dict[str, Dict] = {}
+    for snapshot in snapshots:
+        for action, data in snapshot.items():
+            entry = merged.setdefault(action, {"samples": [], "fallbacks": 0})
+            entry["samples"].extend(data["samples"])
+            entry["fallbacks"] += data["fallbacks"]
+
+    lines = []
+    for action, entry in sorted(merged.items()):
+        samples = sorted(entry["samples"])
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        lines.append(
+            f"{action}: n={len(samples)} mean={sum(samples) / len(samples):.3f}s "
+            f"p95={p95:.3f}s fallbacks={entry['fallbacks']}"
+        )
+    return lines
@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, BrowserContext, Error as PlaywrightError
+
+from pages.careers_page import CareersPage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_DIR = Path(".auth")
+
+
+def consent_state_path(url: str, state_dir: Path = DEFAULT_STATE_DIR) -> Path:
+    """Returns where the consent state of a site is saved, one file per host."""
+    host = urlsplit(url).hostname or "default"
+    return state_dir / f"consent_state_{host}.json"
+
+
+def is_state_fresh(path: Path, max_age: float) -> bool:
+    """Checks whether a saved storage state can be reused.
+
+    Args:
+        path (Path): Location of the saved storage state.
+        max_age (float): Maximum age of the file in seconds.
+
+    Returns:
+        bool: True if the file is recent and holds an unexpired consent cookie.
+    """
+    try:
+        if time.time() - path.stat().st_mtime > max_age:
+            return False
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+
+    now = time.time()
+    return any(
+        cookie.get("name") in CareersPage.CONSENT_COOKIES
+        and (cookie.get("expires", -1) == -1 or cookie["expires"] > now)
+        for cookie in state.get("cookies", [])
+    )
+
+
+async def warm_up_consent_state(
+    browser: Browser,
+    path: Path,
+    context_options: Dict[str, Any],
+    prepare_context: Optional[Callable[[BrowserContext], Awaitable[Any]]] = None,
+    url: Optional[str] = None,
+) -> Optional[Path]:
+    """Accepts consent once on a clean context and saves its storage state.
+
+    Args:
+        browser (Browser): Browser used for the warm-up.
+        path (Path): Where to save the storage state.
+        context_options (dict): Options used to create test contexts, so the
+            warm-up sees the same site variant as the tests.
+        prepare_context (Callable, optional): Coroutine function applied to
+            the warm-up context before navigating, e.g. to replay a HAR.
+        url (str, optional): Careers page URL to warm up against.
+
+    Returns:
+        Optional[Path]: The saved state, or None if no consent was recorded.
+    """
+    logger.info("Warming up consent state")
+    context = await browser.new_context(**context_options)
+    try:
+        if prepare_context is not None:
+            await prepare_context(context)
+        page = await context.new_page()
+        careers_page = CareersPage(page, url=url)
+        await careers_page.navigate()
+        if not await careers_page.has_valid_consent():
+            logger.warning("No consent cookie after warm-up, not caching state")
+            return None
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so parallel workers never read a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        await context.storage_state(path=str(tmp_path))
+        os.replace(tmp_path, path)
+        logger.info("Saved consent state to %s", path)
+        return path
+    except PlaywrightError as e:
+        logger.warning("Consent warm-up failed, tests will run the full probe: %s", e)
+        return None
+    finally:
+        await context.close()
@@ -0,0 +1,243 @@
+import base64
+import json
+import logging
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from playwright.async_api import BrowserContext, Error as PlaywrightError, Route
+
+logger = logging.getLogger(__name__)
+
+HAR_MODES = ("off", "record", "replay")
+HAR_SCOPES = ("test", "shared")
+SHARED_HAR_NAME = "shared"
+
+# Query parameters that change between runs without changing the response
+VOLATILE_PARAMS = {
+    "_",
+    "cb",
+    "t",
+    "ts",
+    "timestamp",
+    "nocache",
+    "rnd",
+    "random",
+    "requestid",
+    "sessionid",
+}
+
+# Response headers that no longer apply once the body is served decoded from disk
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+RequestKey = Tuple[str, str, str]
+
+
+def har_name(nodeid: str) -> str:
+    """Turns a test node id into a file-system friendly archive name."""
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+
+
+def normalize_url(url: str) -> str:
+    """Normalises a URL so equivalent search and filter requests compare equal.
+
+    The fragment and volatile cache-busting parameters are dropped, parameter
+    names are lower-cased and parameters are sorted, so the order in which a
+    form serialises its fields does not matter. Values are compared
+    case-insensitively with surrounding whitespace removed.
+    """
+    parts = urlsplit(url)
+    params = sorted(
+        (name.lower(), value.strip().lower())
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in VOLATILE_PARAMS and not name.lower().startswith("utm_")
+    )
+    return urlunsplit(
+        (parts.scheme, parts.netloc.lower(), parts.path, urlencode(params), "")
+    )
+
+
+def normalize_post_data(post_data: Optional[str]) -> str:
+    """Normalises a request body, sorting JSON keys and form fields."""
+    if not post_data:
+        return ""
+    try:
+        return json.dumps(json.loads(post_data), sort_keys=True)
+    except ValueError:
+        pass
+    if "=" in post_data and " " not in post_data:
+        return urlencode(sorted(parse_qsl(post_data, keep_blank_values=True)))
+    return post_data
+
+
+def request_key(method: str, url: str, post_data: Optional[str]) -> RequestKey:
+    """Builds the lookup key of a request."""
+    return method.upper(), normalize_url(url), normalize_post_data(post_data)
+
+
+class HarReplayer:
+    """Serves a context's requests from a recorded HAR archive.
+
+    Requests are matched on method, normalised URL and normalised body, so
+    searches still match recordings made with different parameter order or
+    cache busters. When the same request was recorded several times, the
+    responses are served in recorded order and the last one is repeated.
+    Requests missing from the archive are aborted, never sent to the network.
+    """
+
+    def __init__(self, entries: Iterable[Dict]):
+        """Indexes HAR entries by request key.
+
+        Args:
+            entries (Iterable[dict]): The "log.entries" of a HAR archive.
+        """
+        self._responses: Dict[RequestKey, List[Dict]] = defaultdict(list)
+        self._served: Dict[RequestKey, int] = defaultdict(int)
+        for entry in entries:
+            request = entry["request"]
+            key = request_key(
+                request["method"],
+                request["url"],
+                request.get("postData", {}).get("text"),
+            )
+            self._responses[key].append(entry["response"])
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "HarReplayer":
+        """Loads a replayer from a HAR file."""
+        with open(path, encoding="utf-8") as har_file:
+            return cls(json.load(har_file)["log"]["entries"])
+
+    async def install(self, context: BrowserContext) -> None:
+        """Routes every request of the context through the archive."""
+        await context.route("**/*", self._handle)
+
+    def lookup(self, method: str, url: str, post_data: Optional[str]) -> Optional[Dict]:
+        """Returns the recorded response for a request, if any."""
+        key = request_key(method, url, post_data)
+        responses = self._responses.get(key)
+        if not responses:
+            return None
+        index = min(self._served[key], len(responses) - 1)
+        self._served[key] += 1
+        return responses[index]
+
+    async def _handle(self, route: Route) -> None:
+        request = route.request
+        response = self.lookup(request.method, request.url, request.post_data)
+        if response is None:
+            self.misses += 1
+            logger.warning("No recorded response for %s %s", request.method, request.url)
+            await route.abort("internetdisconnected")
+            return
+
+        self.hits += 1
+        content = response.get("content", {})
+        body = content.get("text", "")
+        if content.get("encoding") == "base64":
+            body = base64.b64decode(body)
+        headers = {
+            header["name"]: header["value"]
+            for header in response.get("headers", [])
+            if header["name"].lower() not in _DROPPED_HEADERS
+        }
+        try:
+            await route.fulfill(status=response["status"], headers=headers, body=body)
+        except PlaywrightError as e:
+            logger.debug("Could not fulfill %s: %s", request.url, e)
+
+
+_SHARED_REPLAYERS: Dict[Path, HarReplayer] = {}
+
+
+async def attach_har(
+    context: BrowserContext, mode: str, har_dir: Path, name: str, scope: str
+) -> Optional[Path]:
+    """Records or replays a context's traffic according to the HAR mode.
+
+    Args:
+        context (BrowserContext): The context to attach to.
+        mode (str): One of "off", "record" or "replay".
+        har_dir (Path): Directory holding the archives.
+        name (str): Archive name of this context (usually the test name).
+        scope (str): "test" for one archive per test, "shared" to replay every
+            test from one merged archive.
+
+    Returns:
+        Optional[Path]: The archive being recorded or replayed.
+    """
+    if mode == "off":
+        return None
+
+    if mode == "record":
+        path = har_dir / f"{name}.har"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await context.route_from_har(
+            str(path), update=True, update_content="embed", update_mode="full"
+        )
+        logger.info("Recording traffic to %s", path)
+        return path
+
+    if scope == "shared":
+        path = har_dir / f"{SHARED_HAR_NAME}.har"
+        if path not in _SHARED_REPLAYERS:
+            _SHARED_REPLAYERS[path] = HarReplayer.load(path)
+        replayer = _SHARED_REPLAYERS[path]
+    else:
+        path = har_dir / f"{name}.har"
+        replayer = HarReplayer.load(path)
+    await replayer.install(context)
+    logger.info("Replaying traffic from %s", path)
+    return path
+
+
+def _entry_key(entry: Dict) -> Tuple[RequestKey, int, str]:
+    """Identifies an entry by its request key and its recorded response."""
+    request, response = entry["request"], entry["response"]
+    return (
+        request_key(
+            request["method"], request["url"], request.get("postData", {}).get("text")
+        ),
+        response.get("status", 0),
+        response.get("content", {}).get("text", ""),
+    )
+
+
+def merge_hars(paths: Iterable[Path], target: Path) -> int:
+    """Merges recorded archives into one shared archive.
+
+    Requests that several tests recorded with the same response (e.g. the
+    careers page itself) are kept once; different responses to the same
+    request are all kept, in archive order, for the replayer to serve in turn.
+
+    Returns:
+        int: The number of entries written.
+    """
+    merged = None
+    seen_entries = set()
+    seen_pages = set()
+    for path in sorted(paths):
+        if path == target:
+            continue
+        with open(path, encoding="utf-8") as har_file:
+            log = json.load(har_file)["log"]
+        if merged is None:
+            merged = {"log": {**log, "pages": [], "entries": []}}
+        for page in log.get("pages", []):
+            if page.get("id") not in seen_pages:
+                seen_pages.add(page.get("id"))
+                merged["log"]["pages"].append(page)
+        for entry in log.get("entries", []):
+            key = _entry_key(entry)
+            if key not in seen_entries:
+                seen_entries.add(key)
+                merged["log"]["entries"].append(entry)
+    if merged is None:
+        return 0
+    with open(target, "w", encoding="utf-8") as har_file:
+        json.dump(merged, har_file)
+    return len(merged["log"]["entries"])
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, List, Optional
+
+from playwright.async_api import (
+    BrowserContext,
+    Page,
+    Error as PlaywrightError,
+    TimeoutError as PlaywrightTimeoutError,
+)
+
+from pages.job_details_page import JobDetails, JobDetailsPage
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: the site throttling us or failing transiently
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CrawlError(Exception):
+    """Raised for a job details page that cannot be read."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of reading one job details page.
+
+    Attributes:
+        url (str): The job URL that was requested.
+        details (JobDetails, optional): The page fields, None if every attempt failed.
+        error (str, optional): Why the last attempt failed.
+        attempts (int): Number of attempts made.
+        seconds (float): Time spent on the URL, backoff included.
+    """
+
+    url: str
+    details: Optional[JobDetails] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.details is not None
+
+
+class JobDetailsCrawler:
+    """Reads many job details pages concurrently inside one browser context.
+
+    Up to ``concurrency`` pages are opened in the context and reused across
+    URLs, so the cost of a URL is one navigation plus one evaluation. Failed
+    navigations and throttled responses are retried with exponential backoff
+    and jitter. Results are yielded as soon as each page has been read, in
+    completion order.
+    """
+
+    def __init__(
+        self,
+        context: BrowserContext,
+        concurrency: int = 4,
+        retries: int = 2,
+        backoff: float = 0.5,
+        navigation_timeout: float = 30000,
+        read_timeout: float = 10000,
+    ):
+        """Initializes the crawler without opening any page yet.
+
+        Args:
+            context (BrowserContext): Context the pages are opened in, so they
+                share its cookies and consent state.
+            concurrency (int): Maximum number of pages loading at the same time.
+            retries (int): Retries per URL after the first attempt.
+            backoff (float): Base delay in seconds, doubled on every retry.
+            navigation_timeout (float): Navigation timeout in milliseconds.
+            read_timeout (float): Time to wait for the job title in milliseconds.
+        """
+        self.context = context
+        self.concurrency = max(1, concurrency)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.navigation_timeout = navigation_timeout
+        self.read_timeout = read_timeout
+
+    async def crawl(self, urls: Iterable[str]) -> AsyncIterator[CrawlResult]:
+        """Reads every URL and yields its result as soon as it is available.
+
+        Args:
+            urls (Iterable[str]): Job details URLs, duplicates are read once.
+
+        Yields:
+            CrawlResult: One result per distinct URL, in completion order.
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        for url in dict.fromkeys(urls):
+            pending.put_nowait(url)
+        if pending.empty():
+            return
+
+        results: asyncio.Queue = asyncio.Queue()
+        workers = [
+            asyncio.create_task(self._worker(pending, results))
+            for _ in range(min(self.concurrency, pending.qsize()))
+        ]
+        remaining = pending.qsize()
+        try:
+            while remaining:
+                result = await results.get()
+                if isinstance(result, BaseException):
+                    raise result
+                remaining -= 1
+                yield result
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def crawl_all(self, urls: Iterable[str]) -> List[CrawlResult]:
+        """Reads every URL and returns the results once all are done."""
+        return [result async for result in self.crawl(urls)]
+
+    async def _worker(self, pending: asyncio.Queue, results: asyncio.Queue) -> None:
+        """Reads URLs from the queue on its own page until the queue is empty."""
+        page = None
+        try:
+            page = await self.context.new_page()
+            while not pending.empty():
+                url = pending.get_nowait()
+                page = await self._read_with_retries(page, url, results)
+        except Exception as e:
+            # Hand the error to crawl() instead of leaving it waiting for results
+            results.put_nowait(e)
+        finally:
+            if page is not None and not page.is_closed():
+                await page.close()
+
+    async def _read_with_retries(
+        self, page: Page, url: str, results: asyncio.Queue
+    ) -> Page:
+        """Reads one URL, retrying with backoff, and returns the page to reuse."""
+        result = CrawlResult(url=url)
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            result.attempts = attempt + 1
+            try:
+                result.details = await self._read(page, url)
+                result.error = None
+                break
+            except (CrawlError, PlaywrightError) as e:
+                result.error = str(e).splitlines()[0] if str(e) else type(e).__name__
+                if page.is_closed():
+                    page = await self.context.new_page()
+                if isinstance(e, CrawlError) and not e.retryable:
+                    break
+                if attempt < self.retries:
+                    delay = self.backoff * 2**attempt * random.uniform(0.5, 1.5)
+                    logger.info(
+                        "Reading %s failed (%s), retrying in %.2fs", url, result.error, delay
+                    )
+                    await asyncio.sleep(delay)
+
+        result.seconds = time.perf_counter() - start
+        if not result.ok:
+            logger.warning(
+                "Giving up on %s after %d attempts: %s", url, result.attempts, result.error
+            )
+        results.put_nowait(result)
+        return page
+
+    async def _read(self, page: Page, url: str) -> JobDetails:
+        """Opens a job URL and reads the details page in one evaluation."""
+        try:
+            response = await page.goto(
+                url, wait_until="domcontentloaded", timeout=self.navigation_timeout
+            )
+        except PlaywrightTimeoutError as e:
+            raise CrawlError(f"Navigation to {url} timed out") from e
+        if response is not None and response.status >= 400:
+            raise CrawlError(
+                f"HTTP {response.status}", retryable=response.status in RETRY_STATUSES
+            )
+
+        details = await JobDetailsPage(page).read_details(self.read_timeout)
+        if details.title is None:
+            raise CrawlError("Job title did not render")
+        return details
@@ -0,0 +1,167 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Marks the end of a term in the trie, mapping to its canonical keyword
+_END = ""
+
+
+def _is_word_char(char: str) -> bool:
+    """Mirrors the regex notion of a word character."""
+    return char.isalnum() or char == "_"
+
+
+@dataclass
+class MatchResult:
+    """Outcome of matching a list of titles against a keyword set.
+
+    Attributes:
+        matches (list): (title, keywords) pairs for every title with a match,
+            in input order; keywords are canonical and listed once.
+        counts (Counter): Number of matching titles per canonical keyword.
+        total (int): Number of titles checked.
+    """
+
+    matches: List[Tuple[str, List[str]]] = field(default_factory=list)
+    counts: Counter = field(default_factory=Counter)
+    total: int = 0
+
+    @property
+    def matched_titles(self) -> List[str]:
+        """The titles that matched at least one keyword."""
+        return [title for title, _ in self.matches]
+
+
+class KeywordMatcher:
+    """Matches titles against a keyword set compiled once into a single regex.
+
+    The keywords and their synonyms are compiled into a trie-shaped regular
+    expression, so each title is scanned once in C regardless of the number
+    of keywords, in the spirit of an Aho-Corasick automaton. Matching is
+    case-insensitive and, like ``keyword in title``, finds keywords inside
+    words unless ``word_boundary`` is set.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        word_boundary: bool = False,
+        synonyms: Optional[Dict[str, Iterable[str]]] = None,
+    ):
+        """Compiles the keyword set.
+
+        Args:
+            keywords (Iterable[str]): Keywords to look for.
+            word_boundary (bool): Only match whole words, so "test" does not
+                match "Tester".
+            synonyms (dict, optional): Extra terms per keyword, reported as
+                the keyword they belong to (e.g. {"qa": ["quality"]}).
+        """
+        self.word_boundary = word_boundary
+        terms: Dict[str, str] = {}
+        for keyword in keywords:
+            terms.setdefault(keyword.lower(), keyword.lower())
+        for keyword, alternatives in (synonyms or {}).items():
+            for term in alternatives:
+                terms.setdefault(term.lower(), keyword.lower())
+        terms.pop("", None)
+        if not terms:
+            raise ValueError("KeywordMatcher needs at least one non-empty keyword")
+        self.keywords = sorted(set(terms.values()))
+
+        self._trie: Dict = {}
+        for term, keyword in terms.items():
+            node = self._trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[_END] = keyword
+
+        body = f"({self._trie_regex(self._trie)})"
+        if word_boundary:
+            body = rf"\b{body}\b"
+        if self._can_overlap(terms):
+            # A lookahead tries every position, so a term starting inside
+            # another match is still found, at about twice the scanning cost
+            body = f"(?={body})"
+        # Titles are lower-cased before matching, which is cheaper than IGNORECASE
+        self._pattern = re.compile(body)
+        self._found_cache: Dict[str, List[str]] = {}
+
+    def _can_overlap(self, terms: Iterable[str]) -> bool:
+        """Checks whether a term can occur starting inside another term's match.
+
+        That is the case when a term contains another one past its first
+        character, or ends with the beginning of another term. Terms that are
+        only prefixes of each other are handled by _keywords_in instead.
+        """
+        for term in terms:
+            for start in range(1, len(term)):
+                node = self._trie
+                for char in term[start:]:
+                    node = node.get(char)
+                    if node is None:
+                        break
+                    if _END in node:
+                        return True
+                else:
+                    return True
+        return False
+
+    @classmethod
+    def _trie_regex(cls, node: Dict) -> str:
+        """Turns a trie node into a regex sharing common prefixes."""
+        branches = [
+            re.escape(char) + cls._trie_regex(child)
+            for char, child in sorted(node.items())
+            if char != _END
+        ]
+        if not branches:
+            return ""
+        group = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if _END in node:
+            # Greedy optional: prefer the longest term, fall back to the shorter one
+            return f"(?:{group})?" if len(branches) == 1 else f"{group}?"
+        return group
+
+    def _keywords_in(self, term: str) -> List[str]:
+        """Lists the keywords of every term that is a prefix of a matched term."""
+        if term in self._found_cache:
+            return self._found_cache[term]
+        found = []
+        node = self._trie
+        for index, char in enumerate(term):
+            node = node.get(char)
+            if node is None:
+                break
+            at_boundary = index + 1 == len(term) or not (
+                _is_word_char(term[index]) and _is_word_char(term[index + 1])
+            )
+            if _END in node and (at_boundary or not self.word_boundary):
+                found.append(node[_END])
+        self._found_cache[term] = found
+        return found
+
+    def _keywords_for(self, terms: List[str]) -> List[str]:
+        """Maps the matched terms of one title to its keywords, each listed once."""
+        if len(terms) == 1:
+            return list(self._keywords_in(terms[0]))
+        return list(dict.fromkeys(k for term in terms for k in self._keywords_in(term)))
+
+    def find(self, title: str) -> List[str]:
+        """Returns the keywords found in a title, each listed once."""
+        terms = self._pattern.findall(title.lower())
+        return self._keywords_for(terms) if terms else []
+
+    def match(self, titles: Iterable[str]) -> MatchResult:
+        """Matches every title and counts the titles per keyword."""
+        titles = list(titles)
+        found = map(self._pattern.findall, map(str.lower, titles))
+        matches = [
+            (title, self._keywords_for(terms))
+            for title, terms in zip(titles, found)
+            if terms
+        ]
+        counts = Counter(chain.from_iterable(keywords for _, keywords in matches))
+        return MatchResult(matches=matches, counts=counts, total=len(titles))
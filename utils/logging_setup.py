@@ -0,0 +1,217 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+@dataclass
+class LoggingSettings:
+    """The suite's logging configuration, set once from conftest.py.
+
+    Attributes:
+        level (str): Level of the suite's loggers.
+        json_path (str, optional): JSON lines file receiving every record;
+            xdist workers write to one file each.
+        max_chars (int): Longest string argument or message kept, in characters.
+        max_items (int): Items of a list, tuple, set or dict argument kept.
+        noisy_loggers (tuple): Third-party loggers held at WARNING.
+    """
+
+    level: str = "INFO"
+    json_path: Optional[str] = "logs/suite.jsonl"
+    max_chars: int = 2000
+    max_items: int = 20
+    noisy_loggers: tuple = ("asyncio", "urllib3", "websockets")
+
+
+class _Sampled:
+    """A large collection argument reduced to its first items and a count."""
+
+    def __init__(self, items: Any, keep: int):
+        self.total = len(items)
+        if isinstance(items, dict):
+            self.kind = dict
+            self.items = list(items.items())[:keep]
+        else:
+            self.kind = type(items)
+            self.items = list(items)[:keep]
+
+    def __str__(self) -> str:
+        more = f", ... +{self.total - len(self.items)} more"
+        if self.kind is dict:
+            body = ", ".join(f"{k!r}: {v!r}" for k, v in self.items)
+            return "{" + body + more + "}"
+        return "[" + ", ".join(map(repr, self.items)) + more + "]"
+
+    __repr__ = __str__
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... ({len(text) - max_chars} chars truncated)"
+
+
+class _LogContext:
+    """The test and phase the current records belong to."""
+
+    test: Optional[str] = None
+    phase: Optional[str] = None
+
+
+# What the records of the current asyncio task belong to when it works ahead
+# of the running test, e.g. while prefetching a page
+_TASK_TAG: ContextVar[Optional[str]] = ContextVar("log_tag", default=None)
+
+
+def tag_task_logs(tag: Optional[str]) -> None:
+    """Tags the records the current asyncio task logs with ``tag``, not the test.
+
+    Tasks run in a copy of their creator's context, so the running test's
+    records keep their own tag.
+    """
+    _TASK_TAG.set(tag)
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """Queues records without formatting them on the calling thread.
+
+    The standard QueueHandler formats each record before queueing it, which
+    would run on the asyncio event loop driving Playwright. This handler only
+    bounds the arguments: long strings are cut and large collections are
+    sampled, which is cheap and keeps them safe to format later. The listener
+    thread does the formatting and writing.
+    """
+
+    def __init__(self, log_queue: queue.Queue, settings: LoggingSettings):
+        super().__init__(log_queue)
+        self.settings = settings
+
+    def _bound(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return _truncate(value, self.settings.max_chars)
+        if isinstance(value, (list, tuple, set, frozenset, dict)):
+            if len(value) > self.settings.max_items:
+                return _Sampled(value, self.settings.max_items)
+            # Snapshot small collections, they may change before formatting
+            return value.copy() if isinstance(value, (list, dict, set)) else value
+        return value
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        tag = _TASK_TAG.get()
+        record.test = tag or _LogContext.test
+        record.phase = None if tag else _LogContext.phase
+        if isinstance(record.msg, str) and not record.args:
+            # A format string is left whole, cutting it could split a placeholder
+            record.msg = _truncate(record.msg, self.settings.max_chars)
+        if isinstance(record.args, dict):
+            record.args = {key: self._bound(value) for key, value in record.args.items()}
+        elif record.args:
+            record.args = tuple(self._bound(arg) for arg in record.args)
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def __init__(self, max_chars: int = 2000):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _truncate(record.getMessage(), self.max_chars),
+            "test": getattr(record, "test", None),
+            "phase": getattr(record, "phase", None),
+            "worker": os.environ.get("PYTEST_XDIST_WORKER", "main"),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _LogContextPlugin:
+    """Pytest plugin tagging records with the running test and its phase."""
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        _LogContext.test = nodeid
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        _LogContext.test = None
+        _LogContext.phase = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        _LogContext.phase = "setup"
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        _LogContext.phase = "call"
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        _LogContext.phase = "teardown"
+        yield
+
+
+class SuiteLogging:
+    """Routes every record through a queue to handlers on a background thread."""
+
+    def __init__(self, settings: LoggingSettings):
+        self.settings = settings
+        self.plugin = _LogContextPlugin()
+        self._queue: queue.Queue = queue.Queue(-1)
+        self._handler = ContextQueueHandler(self._queue, settings)
+        self._listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self) -> None:
+        """Installs the queue handler on the root logger and starts the listener."""
+        handlers = []
+        if self.settings.json_path:
+            path = Path(self.settings.json_path)
+            worker = os.environ.get("PYTEST_XDIST_WORKER")
+            if worker:
+                path = path.with_name(f"{path.stem}-{worker}{path.suffix}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.FileHandler(path, encoding="utf-8")
+            file_handler.setFormatter(JsonFormatter(self.settings.max_chars))
+            handlers.append(file_handler)
+
+        root = logging.getLogger()
+        root.setLevel(self.settings.level)
+        for name in self.settings.noisy_loggers:
+            logging.getLogger(name).setLevel(logging.WARNING)
+        if handlers:
+            self._listener = logging.handlers.QueueListener(
+                self._queue, *handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            root.addHandler(self._handler)
+
+    def stop(self) -> None:
+        """Flushes the queue and closes the handlers."""
+        logging.getLogger().removeHandler(self._handler)
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from playwright.async_api import BrowserContext, Page
+
+from pages.careers_page import CareersPage
+from utils.artifact_store import link_task_artifacts
+from utils.logging_setup import tag_task_logs
+
+logger = logging.getLogger(__name__)
+
+# Test id given to the screenshots and log records of prefetched pages
+PREFETCH_TAG = "prefetch"
+
+
+@dataclass
+class WarmPage:
+    """A careers page navigated ahead of the test that will use it.
+
+    Attributes:
+        careers_page (CareersPage): The navigated page object.
+        context (BrowserContext): The page's own context, closed after use.
+        ready_seconds (float): Time the navigation took.
+        extras (dict): Whatever the factory attached, e.g. the resource blocker.
+        close (Callable): Coroutine function discarding the context and
+            returning any leased browser.
+    """
+
+    careers_page: CareersPage
+    context: BrowserContext
+    close: Callable[[], Awaitable[None]]
+    ready_seconds: float = 0.0
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def page(self) -> Page:
+        return self.careers_page.page
+
+
+class WarmPagePool:
+    """Navigates careers pages in the background for the tests to come.
+
+    While a test runs, up to ``depth`` pages are created and navigated on the
+    same event loop, so the browser keeps loading the next tests' pages during
+    the current test's assertions. acquire() hands out the oldest one, ready or
+    still in flight, and starts a replacement. Every page lives in its own
+    context and is closed after its test; pages are never reused.
+
+    Screenshots and log records of the background navigations belong to no
+    test yet, so they are tagged as PREFETCH_TAG instead of the running test.
+    """
+
+    def __init__(self, factory: Callable[[], Awaitable[WarmPage]], depth: int = 1):
+        """Initializes the pool without starting any navigation yet.
+
+        Args:
+            factory (Callable): Coroutine function creating, navigating and
+                returning a WarmPage.
+            depth (int): Pages kept navigating or ready ahead of the tests.
+        """
+        self.factory = factory
+        self.depth = max(1, depth)
+        self._inflight: Deque[asyncio.Task] = deque()
+        self.served = 0
+        self.ready_hits = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+        self.navigate_seconds = 0.0
+
+    def _fill(self) -> None:
+        while len(self._inflight) < self.depth:
+            self._inflight.append(asyncio.ensure_future(self._prefetch()))
+
+    async def _prefetch(self) -> WarmPage:
+        # Runs as its own task, so the tags do not leak into the running test
+        link_task_artifacts(PREFETCH_TAG)
+        tag_task_logs(PREFETCH_TAG)
+        return await self._create()
+
+    async def _create(self) -> WarmPage:
+        started = time.perf_counter()
+        warm = await self.factory()
+        warm.ready_seconds = time.perf_counter() - started
+        return warm
+
+    async def acquire(self) -> WarmPage:
+        """Returns the oldest prefetched page, waiting for it if still loading.
+
+        A prefetched page that failed to load is replaced by one navigated on
+        the spot, so a transient failure ahead of time does not fail the test;
+        a failure of that second page is raised.
+        """
+        self._fill()
+        task = self._inflight.popleft()
+        ready = task.done()
+        self._fill()
+        started = time.perf_counter()
+        try:
+            warm = await task
+        except Exception as e:
+            self.failed += 1
+            logger.warning("Prefetched careers page failed, loading another: %s", e)
+            warm = await self._create()
+        self.wait_seconds += time.perf_counter() - started
+        self.navigate_seconds += warm.ready_seconds
+        self.served += 1
+        self.ready_hits += ready
+        logger.info(
+            "Careers page from the warm pool (%s, navigated in %.2fs)",
+            "ready" if ready else "in flight",
+            warm.ready_seconds,
+        )
+        return warm
+
+    async def release(self, warm: WarmPage) -> None:
+        """Discards a used page together with its context."""
+        await warm.close()
+
+    async def close(self) -> None:
+        """Cancels the pending navigations and discards the unused pages."""
+        tasks = list(self._inflight)
+        self._inflight.clear()
+        for task in tasks:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, WarmPage):
+                await result.close()
+
+    def stats(self) -> Dict[str, float]:
+        """Returns how much navigation time the tests did not wait for."""
+        saved = max(0.0, self.navigate_seconds - self.wait_seconds)
+        return {
+            "served": self.served,
+            "ready": self.ready_hits,
+            "failed": self.failed,
+            "navigate_seconds": round(self.navigate_seconds, 3),
+            "wait_seconds": round(self.wait_seconds, 3),
+            "seconds_saved": round(saved, 3),
+        }
+
+
+def summarize_warm_pages(stats: List[Dict[str, float]]) -> Optional[str]:
+    """Formats the warm page pool statistics of one or more workers as a summary line."""
+    if not stats:
+        return None
+    served = sum(s["served"] for s in stats)
+    ready = sum(s["ready"] for s in stats)
+    waited = sum(s["wait_seconds"] for s in stats)
+    saved = sum(s["seconds_saved"] for s in stats)
+    return (
+        f"{served} careers pages prefetched, {ready} ready on arrival "
+        f"({waited:.1f}s waited, ~{saved:.1f}s of navigation hidden)"
+    )
@@ -0,0 +1,262 @@
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+# The profiler of the current run, None when profiling is off
+_ACTIVE: Optional["PhaseProfiler"] = None
+
+
+@contextmanager
+def profile_phase(name: str, category: str = "phase") -> Iterator[None]:
+    """Times a block of code as a phase of the current test, if profiling is on."""
+    if _ACTIVE is None:
+        yield
+        return
+    with _ACTIVE.phase(name, category):
+        yield
+
+
+class PhaseProfiler:
+    """Pytest plugin timing fixture setup and teardown, test calls and page-object methods.
+
+    Every timed phase becomes a complete ("X") event of the Chrome trace-event
+    format, tagged with the test it ran in. Events of concurrent asyncio tasks
+    are spread over separate lanes (trace threads) so that each lane stays
+    properly nested, as flame viewers expect.
+    """
+
+    def __init__(self):
+        self.events: List[Dict] = []
+        self.current_test = "session"
+        self._lanes: List[List[Tuple[Optional[int], Dict]]] = []
+        self._originals: List[Tuple[type, str, object]] = []
+        self._pid = os.getpid()
+
+    def start(self) -> None:
+        """Makes this profiler the target of profile_phase()."""
+        global _ACTIVE
+        _ACTIVE = self
+
+    def stop(self) -> None:
+        """Restores the instrumented classes and deactivates the profiler."""
+        global _ACTIVE
+        for cls, name, original in reversed(self._originals):
+            setattr(cls, name, original)
+        self._originals.clear()
+        if _ACTIVE is self:
+            _ACTIVE = None
+
+    @staticmethod
+    def _task_id() -> Optional[int]:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            return None
+        return id(task) if task is not None else None
+
+    def _open(self, event: Dict) -> None:
+        """Places an event on the first lane where it nests properly."""
+        owner = self._task_id()
+        for tid, lane in enumerate(self._lanes):
+            # Synchronous code blocks the event loop, so anything nests in it
+            if not lane or lane[-1][0] in (None, owner):
+                break
+        else:
+            tid = len(self._lanes)
+            self._lanes.append([])
+        event["tid"] = tid
+        self._lanes[tid].append((owner, event))
+
+    def _close(self, event: Dict) -> None:
+        lane = self._lanes[event["tid"]]
+        for index in range(len(lane) - 1, -1, -1):
+            if lane[index][1] is event:
+                del lane[index]
+                break
+
+    @contextmanager
+    def phase(self, name: str, category: str = "phase") -> Iterator[None]:
+        """Times a block of code as one trace event."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "pid": self._pid,
+            "ts": time.perf_counter_ns() // 1000,
+            "args": {"test": self.current_test},
+        }
+        self._open(event)
+        try:
+            yield
+        finally:
+            event["dur"] = time.perf_counter_ns() // 1000 - event["ts"]
+            self._close(event)
+            self.events.append(event)
+
+    def instrument(self, cls: type, category: str) -> None:
+        """Times every method defined on a class, until stop() is called."""
+        for name, member in list(vars(cls).items()):
+            if name.startswith("__") or not inspect.isfunction(member):
+                continue
+            if inspect.isasyncgenfunction(member):
+                continue
+            setattr(cls, name, self._wrap(member, f"{cls.__name__}.{name}", category))
+            self._originals.append((cls, name, member))
+
+    def _wrap(self, func, name: str, category: str):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def timed_coroutine(*args, **kwargs):
+                with self.phase(name, category):
+                    return await func(*args, **kwargs)
+
+            return timed_coroutine
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            with self.phase(name, category):
+                return func(*args, **kwargs)
+
+        return timed
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self.current_test = nodeid
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        with self.phase(f"{fixturedef.argname} setup", "fixture"):
+            outcome = yield
+        if outcome.excinfo is not None:
+            return
+        # Finalizers run last-in first-out, so this one marks the start of the
+        # teardown; pytest_fixture_post_finalizer marks its end
+        started = {}
+        fixturedef.addfinalizer(
+            lambda: started.setdefault("ts", time.perf_counter_ns() // 1000)
+        )
+        fixturedef._phase_teardown_started = started
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        started = getattr(fixturedef, "_phase_teardown_started", None)
+        if not started or "ts" not in started:
+            return
+        del fixturedef._phase_teardown_started
+        self.events.append(
+            {
+                "name": f"{fixturedef.argname} teardown",
+                "cat": "fixture",
+                "ph": "X",
+                "pid": self._pid,
+                "tid": 0,
+                "ts": started["ts"],
+                "dur": time.perf_counter_ns() // 1000 - started["ts"],
+                "args": {"test": self.current_test},
+            }
+        )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        with self.phase("test call", "test"):
+            yield
+
+
+def write_chrome_trace(events: Iterable[Dict], path: Path) -> Path:
+    """Writes events as a Chrome trace-event JSON file (chrome://tracing, Perfetto)."""
+    events = sorted(events, key=lambda event: event["ts"])
+    metadata = [
+        {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": f"worker {pid}"}}
+        for pid in sorted({event["pid"] for event in events})
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"traceEvents": metadata + events, "displayTimeUnit": "ms"}),
+        encoding="utf-8",
+    )
+    return path
+
+
+def summarize_phases(events: Iterable[Dict]) -> Dict[str, Dict[str, float]]:
+    """Aggregates the events by phase name.
+
+    Returns:
+        dict: Per phase, the number of calls and the total, mean, p95 and
+        maximum duration in milliseconds.
+    """
+    durations: Dict[str, List[float]] = {}
+    for event in events:
+        durations.setdefault(event["name"], []).append(event["dur"] / 1000)
+    summary = {}
+    for name, samples in durations.items():
+        samples.sort()
+        summary[name] = {
+            "count": len(samples),
+            "total_ms": round(sum(samples), 3),
+            "mean_ms": round(sum(samples) / len(samples), 3),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+            "max_ms": round(samples[-1], 3),
+        }
+    return summary
+
+
+def slowest_phases(summary: Dict[str, Dict[str, float]], limit: int = 10) -> List[str]:
+    """Formats the phases with the largest total time, one line each."""
+    ranked = sorted(summary.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    return [
+        f"{stats['total_ms'] / 1000:8.2f}s total  {stats['mean_ms']:9.1f}ms mean  "
+        f"{stats['p95_ms']:9.1f}ms p95  x{stats['count']:<4} {name}"
+        for name, stats in ranked[:limit]
+    ]
+
+
+def find_regressions(
+    summary: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = 0.2,
+    min_delta_ms: float = 50,
+) -> List[str]:
+    """Lists the phases whose mean duration grew beyond the threshold.
+
+    Args:
+        summary (dict): This run's summarize_phases() result.
+        baseline (dict): A stored summarize_phases() result.
+        threshold (float): Allowed growth of the mean, as a fraction.
+        min_delta_ms (float): Growth below this is treated as noise.
+    """
+    regressions = []
+    for name, stats in sorted(summary.items()):
+        base = baseline.get(name)
+        if not base:
+            continue
+        delta = stats["mean_ms"] - base["mean_ms"]
+        if delta > min_delta_ms and delta > base["mean_ms"] * threshold:
+            regressions.append(
+                f"{name}: mean {base['mean_ms']:.1f}ms -> {stats['mean_ms']:.1f}ms "
+                f"(+{delta / base['mean_ms'] * 100 if base['mean_ms'] else 100:.0f}%)"
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Dict[str, float]]]:
+    """Reads a baseline saved by save_baseline(), None if there is none."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(summary: Dict[str, Dict[str, float]], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, indent=2, sort_keys=True), encoding="utf-8")
+    return path
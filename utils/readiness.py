@@ -0,0 +1,219 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from playwright.async_api import Page
+
+from utils.selector_cache import SELECTOR_CACHE, SelectorCache
+
+logger = logging.getLogger(__name__)
+
+# Polls every candidate group in priority order on each animation frame and
+# returns the first selector that matches. Returning a falsy value keeps
+# wait_for_function polling.
+_MATCH_SCRIPT = """
+(groups) => {
+    const isVisible = (el) => {
+        const style = window.getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none'
+            && el.getClientRects().length > 0;
+    };
+    for (const [kind, selectors, requireVisible] of groups) {
+        for (const selector of selectors) {
+            const el = document.querySelector(selector);
+            if (el && (!requireVisible || isVisible(el))) {
+                return {kind, selector};
+            }
+        }
+    }
+    return null;
+}
+"""
+
+_VALIDATE_SCRIPT = """
+(selectors) => selectors.filter((selector) => {
+    try {
+        document.createDocumentFragment().querySelector(selector);
+        return false;
+    } catch (e) {
+        return true;
+    }
+})
+"""
+
+
+@dataclass
+class ReadinessMatch:
+    """The candidate selector that resolved a readiness wait."""
+
+    kind: str
+    selector: str
+    elapsed: float
+
+
+class SelectorHitStats:
+    """Counts how often each candidate selector resolves a readiness wait."""
+
+    def __init__(self):
+        self.waits: Dict[str, int] = {}
+        self.hits: Dict[str, int] = {}
+        self.candidates: Dict[str, Set[str]] = {}
+        self.invalid: Set[str] = set()
+
+    def record_wait(self, kind: str, selectors: Iterable[str]) -> None:
+        """Records that a group of selectors took part in a wait."""
+        self.waits[kind] = self.waits.get(kind, 0) + 1
+        self.candidates.setdefault(kind, set()).update(selectors)
+
+    def record_hit(self, selector: str) -> None:
+        """Records that a selector resolved a wait."""
+        self.hits[selector] = self.hits.get(selector, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Returns the statistics as plain data, suitable for xdist transport."""
+        return {
+            kind: {
+                "waits": self.waits[kind],
+                "hits": {s: self.hits.get(s, 0) for s in sorted(self.candidates[kind])},
+                "invalid": sorted(self.invalid & self.candidates[kind]),
+            }
+            for kind in self.waits
+        }
+
+
+READINESS_STATS = SelectorHitStats()
+
+
+class ReadinessEngine:
+    """Detects page states by checking all candidate selectors in one evaluation.
+
+    Candidates are grouped by kind (for example "verification", "cookie" and
+    "ready"). A wait resolves as soon as any selector of the requested kinds
+    matches, checking kinds in the order they were given. Within a kind, the
+    selector cache puts the candidates that matched on earlier runs first.
+    """
+
+    def __init__(
+        self,
+        groups: Sequence[Tuple[str, Sequence[str], bool]],
+        stats: SelectorHitStats = READINESS_STATS,
+        cache: Optional[SelectorCache] = SELECTOR_CACHE,
+    ):
+        """Initializes the engine with its candidate groups.
+
+        Args:
+            groups (Sequence): Tuples of (kind, selectors, require_visible),
+                in priority order. Hidden elements match only when
+                require_visible is False.
+            stats (SelectorHitStats): Collector for per-selector hit rates.
+            cache (SelectorCache, optional): Learnt candidate order, or None
+                to always check the candidates in the declared order.
+        """
+        self.groups: "OrderedDict[str, Tuple[List[str], bool]]" = OrderedDict(
+            (kind, (list(selectors), require_visible))
+            for kind, selectors, require_visible in groups
+        )
+        self.stats = stats
+        self.cache = cache
+        self._validated: Set[str] = set()
+
+    async def _drop_invalid(self, page: Page, selectors: List[str]) -> List[str]:
+        """Filters out selectors the browser cannot parse as CSS."""
+        unchecked = [s for s in selectors if s not in self._validated]
+        if unchecked:
+            invalid = await page.evaluate(_VALIDATE_SCRIPT, unchecked)
+            for selector in invalid:
+                logger.warning("Ignoring invalid readiness selector: %s", selector)
+            self.stats.invalid.update(invalid)
+            self._validated.update(unchecked)
+        return [s for s in selectors if s not in self.stats.invalid]
+
+    async def wait(
+        self,
+        page: Page,
+        kinds: Optional[Iterable[str]] = None,
+        timeout: float = 10000,
+    ) -> ReadinessMatch:
+        """Waits until the first candidate selector of the given kinds matches.
+
+        Args:
+            page (Page): Page to inspect.
+            kinds (Iterable[str], optional): Kinds to wait for, all by default.
+            timeout (float): Maximum time to wait in milliseconds.
+
+        Returns:
+            ReadinessMatch: The kind and selector that matched first.
+
+        Raises:
+            PlaywrightTimeoutError: If no candidate matches within the timeout.
+        """
+        wanted = set(kinds) if kinds is not None else set(self.groups)
+        groups = []
+        tried: Dict[str, List[str]] = {}
+        for kind, (selectors, require_visible) in self.groups.items():
+            if kind not in wanted:
+                continue
+            valid = await self._drop_invalid(page, selectors)
+            self.stats.record_wait(kind, selectors)
+            if self.cache is not None:
+                if len(valid) < len(selectors):
+                    invalid = [s for s in selectors if s in self.stats.invalid]
+                    self.cache.record_invalid(page.url, kind, invalid)
+                valid = self.cache.order(page.url, kind, valid)
+            tried[kind] = valid
+            groups.append([kind, valid, require_visible])
+
+        start = time.perf_counter()
+        handle = await page.wait_for_function(_MATCH_SCRIPT, arg=groups, timeout=timeout)
+        result = await handle.json_value()
+        await handle.dispose()
+        self.stats.record_hit(result["selector"])
+        match = ReadinessMatch(
+            kind=result["kind"],
+            selector=result["selector"],
+            elapsed=time.perf_counter() - start,
+        )
+        if self.cache is not None:
+            self.cache.record_match(
+                page.url, match.kind, tried[match.kind], match.selector, match.elapsed
+            )
+        logger.debug(
+            "Readiness matched %s selector %s in %.3fs",
+            match.kind,
+            match.selector,
+            match.elapsed,
+        )
+        return match
+
+    async def check_fingerprint(self, page: Page) -> None:
+        """Lets the selector cache check whether the page's DOM has changed."""
+        if self.cache is not None:
+            await self.cache.check_fingerprint(page)
+
+
+def summarize_hit_rates(snapshots: List[Dict[str, Dict]]) -> List[str]:
+    """Merges worker snapshots into report lines, flagging selectors never hit."""
+    merged: Dict[str, Dict] = {}
+    for snapshot in snapshots:
+        for kind, data in snapshot.items():
+            entry = merged.setdefault(kind, {"waits": 0, "hits": {}, "invalid": set()})
+            entry["waits"] += data["waits"]
+            entry["invalid"].update(data["invalid"])
+            for selector, hits in data["hits"].items():
+                entry["hits"][selector] = entry["hits"].get(selector, 0) + hits
+
+    lines = []
+    for kind, entry in merged.items():
+        waits = entry["waits"]
+        lines.append(f"{kind}: {waits} waits")
+        for selector, hits in sorted(entry["hits"].items(), key=lambda i: -i[1]):
+            if selector in entry["invalid"]:
+                note = "invalid selector"
+            elif hits == 0:
+                note = "never matched"
+            else:
+                note = f"{hits / waits:.0%} hit rate"
+            lines.append(f"  {selector}: {hits} hits ({note})")
+    return lines
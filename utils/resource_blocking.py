@@ -0,0 +1,173 @@
+import ipaddress
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Error as PlaywrightError, Response, Route
+
+logger = logging.getLogger(__name__)
+
+MEDIA_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+
+@dataclass(frozen=True)
+class ResourceProfile:
+    """Describes which requests a test context is allowed to make."""
+
+    name: str
+    blocked_types: FrozenSet[str] = frozenset()
+    first_party_only: bool = False
+
+    @property
+    def blocks_anything(self) -> bool:
+        """Whether the profile needs a route handler at all."""
+        return bool(self.blocked_types) or self.first_party_only
+
+
+PROFILES: Dict[str, ResourceProfile] = {
+    "full": ResourceProfile("full"),
+    "no-media": ResourceProfile("no-media", MEDIA_RESOURCE_TYPES),
+    "first-party-only": ResourceProfile(
+        "first-party-only", MEDIA_RESOURCE_TYPES, first_party_only=True
+    ),
+}
+
+# Most response sizes remembered; the least recently seen are dropped first
+MAX_KNOWN_SIZES = 5000
+
+
+def size_key(url: str) -> str:
+    """Returns the URL without its query and fragment.
+
+    Cache-busting and tracking parameters change on every load, so sizes are
+    remembered per resource rather than per full URL.
+    """
+    return urlsplit(url)._replace(query="", fragment="").geturl()
+
+
+class KnownSizes:
+    """Response sizes learned from allowed requests, least recently seen first.
+
+    Used to estimate what blocking saves. Sizes are keyed by URL without its
+    query and capped at ``max_entries``, also when saved across runs.
+    """
+
+    def __init__(self, max_entries: int = MAX_KNOWN_SIZES):
+        self.max_entries = max_entries
+        self.sizes: "OrderedDict[str, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def get(self, url: str) -> Optional[int]:
+        return self.sizes.get(size_key(url))
+
+    def remember(self, url: str, size: int) -> None:
+        key = size_key(url)
+        self.sizes.pop(key, None)
+        self.sizes[key] = size
+        while len(self.sizes) > self.max_entries:
+            self.sizes.popitem(last=False)
+
+    def update(self, sizes: Dict[str, int]) -> None:
+        """Adds sizes in their order, e.g. those saved by previous runs."""
+        for url, size in sizes.items():
+            self.remember(url, size)
+
+    def merge(self, stored: Dict[str, int]) -> Dict[str, int]:
+        """Returns the stored sizes updated with this run's, for saving.
+
+        Args:
+            stored (dict): Sizes currently saved, possibly by other xdist
+                workers since this run loaded them.
+        """
+        merged = KnownSizes(self.max_entries)
+        merged.update(stored)
+        merged.update(self.sizes)
+        return dict(merged.sizes)
+
+
+KNOWN_SIZES = KnownSizes()
+
+
+def first_party_domain(url: str) -> str:
+    """Returns the registrable domain of a URL (e.g. "epam.com").
+
+    IP addresses and single-label hosts such as "localhost" are returned as-is.
+    """
+    host = urlsplit(url).hostname or ""
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    labels = host.split(".")
+    return ".".join(labels[-2:]) if len(labels) > 2 else host
+
+
+def is_first_party(url: str, domain: str) -> bool:
+    """Checks whether a URL belongs to the given domain or one of its subdomains."""
+    host = urlsplit(url).hostname or ""
+    return host == domain or host.endswith("." + domain)
+
+
+class ResourceBlocker:
+    """Aborts the requests a ResourceProfile does not allow and counts them."""
+
+    def __init__(self, profile: ResourceProfile, site_url: str):
+        """Initializes the blocker.
+
+        Args:
+            profile (ResourceProfile): Profile deciding which requests are blocked.
+            site_url (str): URL of the site under test, defining first-party requests.
+        """
+        self.profile = profile
+        self.domain = first_party_domain(site_url)
+        self.blocked_requests = 0
+        self.bytes_saved = 0
+        self.unknown_sizes = 0
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Decides whether a request is blocked under the profile."""
+        if resource_type in self.profile.blocked_types:
+            return True
+        if self.profile.first_party_only and url.startswith("http"):
+            return not is_first_party(url, self.domain)
+        return False
+
+    async def install(self, context: BrowserContext) -> None:
+        """Attaches the blocker to a browser context."""
+        context.on("response", self._remember_size)
+        if self.profile.blocks_anything:
+            await context.route("**/*", self._handle)
+
+    async def _handle(self, route: Route) -> None:
+        request = route.request
+        if not self.should_block(request.url, request.resource_type):
+            await route.fallback()
+            return
+        self.blocked_requests += 1
+        size = KNOWN_SIZES.get(request.url)
+        if size is None:
+            self.unknown_sizes += 1
+        else:
+            self.bytes_saved += size
+        try:
+            await route.abort("blockedbyclient")
+        except PlaywrightError as e:
+            logger.debug("Could not abort %s: %s", request.url, e)
+
+    @staticmethod
+    def _remember_size(response: Response) -> None:
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            KNOWN_SIZES.remember(response.url, int(length))
+
+    def summary(self) -> str:
+        """Describes what was blocked, for logs and reports."""
+        return (
+            f"profile {self.profile.name}: blocked {self.blocked_requests} requests, "
+            f"~{self.bytes_saved} bytes saved ({self.unknown_sizes} of unknown size)"
+        )
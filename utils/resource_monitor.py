@@ -0,0 +1,319 @@
+import logging
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import Browser, CDPSession, Error as PlaywrightError, Page
+
+logger = logging.getLogger(__name__)
+
+MIB = 1024 * 1024
+PROC_ROOT = Path("/proc")
+
+# Post-test values checked for persistent growth
+LEAK_METRICS = ("rss_bytes", "contexts", "pages")
+
+
+def process_rss(pid: int, proc_root: Path = PROC_ROOT) -> Optional[int]:
+    """Returns the resident set size of a local process in bytes, if readable."""
+    try:
+        status = (proc_root / str(pid) / "status").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    return None
+
+
+@dataclass
+class ResourceSample:
+    """Resources held by one browser at a fixture boundary.
+
+    Attributes:
+        rss_bytes (int, optional): Summed RSS of the browser process tree, or
+            None when the processes are not local (e.g. a remote browser).
+        cpu_seconds (dict): CPU time consumed so far, by process id.
+        contexts (int): Open browser contexts.
+        pages (int): Open pages across those contexts.
+    """
+
+    at: float
+    rss_bytes: Optional[int]
+    cpu_seconds: Dict[int, float]
+    contexts: int
+    pages: int
+
+
+@dataclass
+class BrowserUsage:
+    """Resources a test added to its browser, from its lease to its release.
+
+    CPU time of processes that exited during the test (e.g. the renderer of
+    a closed page) is not counted.
+    """
+
+    nodeid: str
+    browser: str
+    rss_bytes: Optional[int]
+    rss_growth: Optional[int]
+    cpu_seconds: float
+    js_heap_bytes: Optional[int]
+    contexts: int
+    pages: int
+    contexts_left: int
+    pages_left: int
+    seconds: float
+
+
+def _added(usage: BrowserUsage, metric: str) -> float:
+    """What a test added to one of the leak metrics."""
+    if metric == "rss_bytes":
+        return usage.rss_growth or 0
+    return usage.contexts_left if metric == "contexts" else usage.pages_left
+
+
+@dataclass
+class _BrowserSeries:
+    """Post-test samples of one browser, for the leak check."""
+
+    label: str
+    usages: List[BrowserUsage] = field(default_factory=list)
+    flagged: set = field(default_factory=set)
+
+
+class ResourceMonitor:
+    """Samples the browser process tree around each test and looks for leaks.
+
+    Every test's browser is sampled when the test leases it and again when it
+    is released, after the test's pages and context were closed. The
+    difference is attributed to the test. A browser leaks when a metric grows
+    persistently: over the last ``window`` tests on that browser, the median
+    of the later half exceeds that of the earlier half by the threshold.
+    Process RSS and CPU come from Chromium's process list (CDP) and /proc, so
+    they are only measured on Linux with a local browser.
+    """
+
+    def __init__(
+        self,
+        leak_threshold_mb: float = 50,
+        window: int = 10,
+        ceiling_mb: Optional[float] = None,
+        proc_root: Path = PROC_ROOT,
+    ):
+        """Initializes the monitor.
+
+        Args:
+            leak_threshold_mb (float): RSS growth over the window that counts
+                as a leak. Any persistent growth of open contexts or pages does.
+            window (int): Number of consecutive tests the growth must span.
+            ceiling_mb (float, optional): RSS above which a browser should be
+                restarted after its current test.
+            proc_root (Path): Root of the process filesystem.
+        """
+        self.thresholds = {
+            "rss_bytes": leak_threshold_mb * MIB,
+            "contexts": 1,
+            "pages": 1,
+        }
+        self.window = max(2, window)
+        self.ceiling_bytes = ceiling_mb * MIB if ceiling_mb else None
+        self.proc_root = proc_root
+        self.leaks: List[Dict[str, Any]] = []
+        self.restarts = 0
+        self.cpu_seconds = 0.0
+        self.peak_rss_bytes = 0
+        self.tests = 0
+        self._usages: List[BrowserUsage] = []
+        self._browsers_seen = 0
+        self._series: Dict[Browser, _BrowserSeries] = {}
+        self._sessions: Dict[Browser, Optional[CDPSession]] = {}
+
+    def _forget(self, browser: Browser) -> None:
+        self._series.pop(browser, None)
+        self._sessions.pop(browser, None)
+
+    async def _session(self, browser: Browser) -> Optional[CDPSession]:
+        if browser not in self._sessions:
+            try:
+                self._sessions[browser] = await browser.new_browser_cdp_session()
+            except PlaywrightError as e:
+                logger.warning("Browser process metrics unavailable: %s", e)
+                self._sessions[browser] = None
+            browser.on("disconnected", self._forget)
+        return self._sessions[browser]
+
+    async def sample(self, browser: Browser) -> ResourceSample:
+        """Samples the browser's processes, contexts and pages."""
+        cpu: Dict[int, float] = {}
+        rss: Optional[int] = None
+        session = await self._session(browser)
+        if session is not None:
+            try:
+                info = await session.send("SystemInfo.getProcessInfo")
+            except PlaywrightError as e:
+                logger.debug("Could not read the browser process list: %s", e)
+                info = {"processInfo": []}
+            for process in info["processInfo"]:
+                cpu[process["id"]] = process["cpuTime"]
+                process_bytes = process_rss(process["id"], self.proc_root)
+                if process_bytes is not None:
+                    rss = (rss or 0) + process_bytes
+        contexts = browser.contexts
+        return ResourceSample(
+            at=time.perf_counter(),
+            rss_bytes=rss,
+            cpu_seconds=cpu,
+            contexts=len(contexts),
+            pages=sum(len(context.pages) for context in contexts),
+        )
+
+    async def js_heap_bytes(self, page: Page) -> Optional[int]:
+        """Returns the used JS heap of a page, or None if it cannot be read."""
+        try:
+            session = await page.context.new_cdp_session(page)
+            try:
+                usage = await session.send("Runtime.getHeapUsage")
+            finally:
+                await session.detach()
+        except PlaywrightError as e:
+            logger.debug("Could not read the JS heap size: %s", e)
+            return None
+        return int(usage["usedSize"])
+
+    def _label(self, browser: Browser) -> _BrowserSeries:
+        if browser not in self._series:
+            self._browsers_seen += 1
+            self._series[browser] = _BrowserSeries(f"browser-{self._browsers_seen}")
+        return self._series[browser]
+
+    def record(
+        self,
+        browser: Browser,
+        nodeid: str,
+        before: ResourceSample,
+        after: ResourceSample,
+        js_heap_bytes: Optional[int] = None,
+    ) -> BrowserUsage:
+        """Attributes the difference between two samples to a test.
+
+        Returns:
+            BrowserUsage: What the test added, also checked for persistent growth.
+        """
+        series = self._label(browser)
+        growth = None
+        if before.rss_bytes is not None and after.rss_bytes is not None:
+            growth = after.rss_bytes - before.rss_bytes
+        cpu = sum(
+            max(0.0, seconds - before.cpu_seconds.get(pid, 0.0))
+            for pid, seconds in after.cpu_seconds.items()
+        )
+        usage = BrowserUsage(
+            nodeid=nodeid,
+            browser=series.label,
+            rss_bytes=after.rss_bytes,
+            rss_growth=growth,
+            cpu_seconds=round(cpu, 3),
+            js_heap_bytes=js_heap_bytes,
+            contexts=after.contexts,
+            pages=after.pages,
+            contexts_left=after.contexts - before.contexts,
+            pages_left=after.pages - before.pages,
+            seconds=round(after.at - before.at, 3),
+        )
+        self.tests += 1
+        self.cpu_seconds += cpu
+        self.peak_rss_bytes = max(self.peak_rss_bytes, after.rss_bytes or 0)
+        self._usages.append(usage)
+        series.usages = (series.usages + [usage])[-self.window :]
+        self._check_leaks(series)
+        return usage
+
+    def _check_leaks(self, series: _BrowserSeries) -> None:
+        if len(series.usages) < self.window:
+            return
+        half = self.window // 2
+        for metric in LEAK_METRICS:
+            if metric in series.flagged:
+                continue
+            values = [getattr(usage, metric) for usage in series.usages]
+            if None in values:
+                continue
+            growth = statistics.median(values[-half:]) - statistics.median(values[:half])
+            if growth < self.thresholds[metric] or values[-1] <= values[0]:
+                continue
+            series.flagged.add(metric)
+            # Tests that added the most over the window are the likely culprits
+            suspects = sorted(series.usages, key=lambda u: -_added(u, metric))[:3]
+            leak = {
+                "browser": series.label,
+                "metric": metric,
+                "growth": growth,
+                "tests": len(series.usages),
+                "suspects": [usage.nodeid for usage in suspects],
+            }
+            self.leaks.append(leak)
+            logger.warning(
+                "Possible %s leak in %s: +%s over %d tests, most added by %s",
+                metric,
+                series.label,
+                format_growth(metric, growth),
+                len(series.usages),
+                ", ".join(leak["suspects"]),
+            )
+
+    def over_ceiling(self, usage: BrowserUsage) -> bool:
+        """Checks whether the test left its browser above the memory ceiling."""
+        return (
+            self.ceiling_bytes is not None
+            and usage.rss_bytes is not None
+            and usage.rss_bytes > self.ceiling_bytes
+        )
+
+    def snapshot(self, top: int = 10) -> Dict[str, Any]:
+        """Returns totals, leaks and the tests that grew RSS most, for xdist transport."""
+        heaviest = sorted(self._usages, key=lambda u: -_added(u, "rss_bytes"))[:top]
+        return {
+            "tests": self.tests,
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "restarts": self.restarts,
+            "leaks": list(self.leaks),
+            "heaviest": [asdict(usage) for usage in heaviest if usage.rss_growth],
+        }
+
+
+def format_growth(metric: str, growth: float) -> str:
+    if metric == "rss_bytes":
+        return f"{growth / MIB:.1f} MiB"
+    return f"{growth:g} {metric}"
+
+
+def summarize_resources(snapshots: List[Dict[str, Any]], top: int = 5) -> List[str]:
+    """Merges worker snapshots into report lines: totals, leaks and heaviest tests."""
+    if not snapshots:
+        return []
+    tests = sum(s["tests"] for s in snapshots)
+    cpu = sum(s["cpu_seconds"] for s in snapshots)
+    peak = max(s["peak_rss_bytes"] for s in snapshots)
+    restarts = sum(s["restarts"] for s in snapshots)
+    lines = [
+        f"{tests} tests sampled: {cpu:.1f}s browser CPU, peak RSS "
+        f"{peak / MIB:.0f} MiB per browser, {restarts} restarts over the ceiling"
+    ]
+    for snapshot in snapshots:
+        for leak in snapshot["leaks"]:
+            lines.append(
+                f"Possible {leak['metric']} leak in {leak['browser']}: "
+                f"+{format_growth(leak['metric'], leak['growth'])} over "
+                f"{leak['tests']} tests, suspects: {', '.join(leak['suspects'])}"
+            )
+    heaviest = sorted(
+        (usage for s in snapshots for usage in s["heaviest"]),
+        key=lambda u: -u["rss_growth"],
+    )[:top]
+    for usage in heaviest:
+        lines.append(f"  +{usage['rss_growth'] / MIB:.1f} MiB {usage['nodeid']}")
+    return lines
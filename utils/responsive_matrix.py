@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from playwright.async_api import Browser, BrowserContext, Error as PlaywrightError
+
+from pages.careers_page import CareersPage
+from utils.data_helpers import get_test_devices
+
+logger = logging.getLogger(__name__)
+
+MATRIX_MODES = ("in-turn", "parallel")
+
+# Runs the checks of one device on a careers page and returns them by name
+DeviceCheck = Callable[[CareersPage, Dict], Awaitable[Dict[str, bool]]]
+
+
+@dataclass
+class DeviceResult:
+    """Outcome of the checks run for one device.
+
+    Attributes:
+        device (dict): The device, as returned by get_test_devices().
+        checks (dict): Result of every check by name.
+        seconds (float): Time spent on the device, setup included.
+        error (str, optional): Error raised while checking the device.
+    """
+
+    device: Dict
+    checks: Dict[str, bool] = field(default_factory=dict)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.device["name"]
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and all(self.checks.values())
+
+    @property
+    def failed_checks(self) -> List[str]:
+        return [name for name, ok in self.checks.items() if not ok]
+
+
+class ResponsiveMatrix:
+    """Checks the careers page on every device of a matrix without navigating anew.
+
+    In "in-turn" mode the already loaded page is resized to each device in
+    turn; every device after the first also reloads it, so UI state opened by
+    the previous device's checks does not leak into the next. A device costs a
+    viewport change, a reload in the same context and its checks. In "parallel"
+    mode every device gets its own context created from the loaded page's
+    storage state, so consent is not probed again, and the devices are
+    checked concurrently.
+    """
+
+    def __init__(
+        self,
+        devices: Optional[List[Dict]] = None,
+        mode: str = "in-turn",
+        browser: Optional[Browser] = None,
+        context_options: Optional[Dict[str, Any]] = None,
+        prepare_context: Optional[Callable[[BrowserContext, Dict], Awaitable[Any]]] = None,
+    ):
+        """Initializes the matrix.
+
+        Args:
+            devices (list, optional): Devices to check, get_test_devices() by default.
+            mode (str): "in-turn" or "parallel", see the class docstring.
+            browser (Browser, optional): Browser for the device contexts,
+                required in parallel mode.
+            context_options (dict, optional): Options of the device contexts.
+            prepare_context (Callable, optional): Coroutine function applied to
+                each device context before navigating, e.g. to replay a HAR.
+        """
+        if mode not in MATRIX_MODES:
+            raise ValueError(f"Unknown matrix mode: {mode}")
+        if mode == "parallel" and browser is None:
+            raise ValueError("Parallel mode needs a browser to create device contexts")
+        self.devices = devices if devices is not None else get_test_devices()
+        self.mode = mode
+        self.browser = browser
+        self.context_options = context_options or {}
+        self.prepare_context = prepare_context
+
+    async def run(self, careers_page: CareersPage, check: DeviceCheck) -> List[DeviceResult]:
+        """Runs the checks of every device.
+
+        Args:
+            careers_page (CareersPage): Loaded careers page to start from.
+            check (DeviceCheck): Coroutine function running the checks of one device.
+
+        Returns:
+            List[DeviceResult]: One result per device, in matrix order.
+        """
+        if self.mode == "in-turn":
+            return await self.run_in_turn(careers_page, check)
+        return await self.run_parallel(careers_page, check)
+
+    async def run_in_turn(
+        self, careers_page: CareersPage, check: DeviceCheck
+    ) -> List[DeviceResult]:
+        """Resizes the loaded page to each device in turn and runs its checks."""
+        page = careers_page.page
+        original_viewport = page.viewport_size
+        results = []
+        try:
+            for index, device in enumerate(self.devices):
+                start = time.perf_counter()
+                result = DeviceResult(device)
+                try:
+                    await page.set_viewport_size(
+                        {"width": device["width"], "height": device["height"]}
+                    )
+                    if index:
+                        # Drop menus or search forms opened on the previous device
+                        await careers_page.reload()
+                    result.checks = await check(careers_page, device)
+                except PlaywrightError as e:
+                    result.error = str(e).splitlines()[0]
+                result.seconds = time.perf_counter() - start
+                results.append(result)
+        finally:
+            if original_viewport:
+                await page.set_viewport_size(original_viewport)
+        return results
+
+    async def run_parallel(
+        self, careers_page: CareersPage, check: DeviceCheck
+    ) -> List[DeviceResult]:
+        """Checks every device concurrently in contexts sharing the page's state."""
+        state = await careers_page.page.context.storage_state()
+        options = {k: v for k, v in self.context_options.items() if k != "viewport"}
+
+        async def check_device(device: Dict) -> DeviceResult:
+            start = time.perf_counter()
+            result = DeviceResult(device)
+            context = await self.browser.new_context(
+                **options,
+                storage_state=state,
+                viewport={"width": device["width"], "height": device["height"]},
+            )
+            try:
+                if self.prepare_context is not None:
+                    await self.prepare_context(context, device)
+                device_page = CareersPage(
+                    await context.new_page(), consent_cached=True, url=careers_page.url
+                )
+                await device_page.navigate()
+                result.checks = await check(device_page, device)
+            except PlaywrightError as e:
+                result.error = str(e).splitlines()[0]
+            finally:
+                await context.close()
+            result.seconds = time.perf_counter() - start
+            return result
+
+        return list(await asyncio.gather(*map(check_device, self.devices)))
+
+
+def format_results(results: List[DeviceResult]) -> List[str]:
+    """Formats the matrix results as one report line per device."""
+    lines = []
+    for result in results:
+        size = f"{result.device['width']}x{result.device['height']}"
+        if result.error:
+            status = f"ERROR {result.error}"
+        elif result.failed_checks:
+            status = "FAILED " + ", ".join(result.failed_checks)
+        else:
+            status = "passed"
+        lines.append(f"{result.name} ({size}): {status} in {result.seconds * 1000:.0f} ms")
+    return lines
@@ -0,0 +1,118 @@
+import logging
+import statistics
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DURATIONS_CACHE_KEY = "scheduling/durations"
+
+# Assumed duration of a test that has never run, without any history
+DEFAULT_DURATION = 5.0
+
+
+class DurationHistory:
+    """Smoothed per-test durations (setup, call and teardown) from earlier runs.
+
+    Registered as a pytest plugin, it measures the current run from the test
+    reports; under xdist the controller receives the reports of every worker.
+    """
+
+    def __init__(
+        self, durations: Optional[Dict[str, float]] = None, smoothing: float = 0.5
+    ):
+        """Initializes the history.
+
+        Args:
+            durations (dict, optional): Known durations by node id.
+            smoothing (float): Weight of a new measurement against the history.
+        """
+        self.durations: Dict[str, float] = dict(durations or {})
+        self.smoothing = smoothing
+        self._measured: Dict[str, float] = {}
+
+    @classmethod
+    def load(cls, cache) -> "DurationHistory":
+        """Loads the history from the pytest cache (None when it is disabled)."""
+        return cls(cache.get(DURATIONS_CACHE_KEY, {}) if cache is not None else {})
+
+    def add(self, nodeid: str, seconds: float) -> None:
+        """Adds the time of one test phase measured in this run."""
+        self._measured[nodeid] = self._measured.get(nodeid, 0.0) + seconds
+
+    def pytest_runtest_logreport(self, report) -> None:
+        self.add(report.nodeid, report.duration)
+
+    def save(self, cache) -> None:
+        """Merges this run's measurements into the history and stores it."""
+        for nodeid, seconds in self._measured.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = round(
+                seconds
+                if previous is None
+                else self.smoothing * seconds + (1 - self.smoothing) * previous,
+                3,
+            )
+        self._measured.clear()
+        if cache is not None:
+            cache.set(DURATIONS_CACHE_KEY, self.durations)
+
+    def estimate(self, nodeid: str) -> float:
+        """Returns the expected duration of a test.
+
+        Tests without history are assumed to take the median known duration.
+        """
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        if self.durations:
+            return statistics.median(self.durations.values())
+        return DEFAULT_DURATION
+
+
+@dataclass
+class SchedulePlan:
+    """Tests assigned to each worker, in the order they should run."""
+
+    workers: List[List[str]]
+    loads: List[float]
+    ideal: float
+
+    @property
+    def makespan(self) -> float:
+        """Expected wall-clock time: the load of the busiest worker."""
+        return max(self.loads, default=0.0)
+
+
+def plan_schedule(
+    tests: Iterable[str],
+    durations: Dict[str, float],
+    workers: int,
+) -> SchedulePlan:
+    """Balances tests across workers, longest processing time first.
+
+    Each test, longest first, goes to the least loaded worker.
+
+    Args:
+        tests (Iterable[str]): Node ids in collection order.
+        durations (dict): Expected duration of every test.
+        workers (int): Number of workers.
+
+    Returns:
+        SchedulePlan: Per-worker test lists, in collection order.
+    """
+    tests = list(tests)
+    workers = max(workers, 1)
+    ideal = sum(durations[test] for test in tests) / workers
+
+    loads = [0.0] * workers
+    assigned: List[List[str]] = [[] for _ in range(workers)]
+    for test in sorted(tests, key=lambda t: -durations[t]):
+        target = min(range(workers), key=lambda w: loads[w])
+        loads[target] += durations[test]
+        assigned[target].append(test)
+
+    order = {test: index for index, test in enumerate(tests)}
+    for worker_tests in assigned:
+        worker_tests.sort(key=order.__getitem__)
+    logger.debug("Planned makespan %.1fs, ideal %.1fs", max(loads), ideal)
+    return SchedulePlan(assigned, loads, ideal)
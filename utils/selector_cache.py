@@ -0,0 +1,268 @@
+import hashlib
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set
+from urllib.parse import urlsplit
+
+from playwright.async_api import Error as PlaywrightError, Page
+
+logger = logging.getLogger(__name__)
+
+SELECTOR_CACHE_KEY = "careers_page/selector_cache"
+
+# A candidate that never matched and was passed over this often is tried last
+DEAD_AFTER_MISSES = 3
+
+# Consent banners show until the consent cookie is set, so a cold warm-up and a
+# cached consent state see different buttons; their elements are left out
+CONSENT_BANNER_SELECTOR = (
+    "#onetrust-consent-sdk, #onetrust-banner-sdk, .cookie-consent, "
+    "[id*='cookie-banner']"
+)
+
+# Structural elements whose tags, ids and classes identify the page layout, each
+# with whether it sits in a consent banner. Job cards and other content are
+# left out, so new postings keep the fingerprint.
+_FINGERPRINT_SCRIPT = """
+(banner) => Array.from(
+    document.querySelectorAll('form, input, button, select, header, nav')
+).map((el) => [
+    el.tagName.toLowerCase()
+        + (el.id ? '#' + el.id : '')
+        + Array.from(el.classList).sort().map((name) => '.' + name).join(''),
+    el.closest(banner) !== null,
+])
+"""
+
+
+def site_key(url: str) -> str:
+    """Returns the key of a site's selector statistics, one per host."""
+    return urlsplit(url).hostname or "default"
+
+
+def dom_fingerprint(tokens: Sequence[str]) -> str:
+    """Hashes the structural element tokens of a page, ignoring their order."""
+    digest = hashlib.sha256("\n".join(sorted(set(tokens))).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class SelectorRecord:
+    """Outcomes of one candidate selector."""
+
+    wins: int = 0
+    misses: int = 0
+    total_ms: float = 0.0
+    invalid: bool = False
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.wins if self.wins else 0.0
+
+    @property
+    def dead(self) -> bool:
+        return self.invalid or (self.wins == 0 and self.misses >= DEAD_AFTER_MISSES)
+
+    def add(self, other: "SelectorRecord") -> None:
+        self.wins += other.wins
+        self.misses += other.misses
+        self.total_ms += other.total_ms
+        self.invalid = self.invalid or other.invalid
+
+
+class SiteSelectors:
+    """What is known about one site's candidate selectors under one DOM fingerprint."""
+
+    def __init__(self, fingerprint: Optional[str] = None):
+        self.fingerprint = fingerprint
+        self.selectors: Dict[str, Dict[str, SelectorRecord]] = {}
+        self.winners: Dict[str, str] = {}
+
+    def record(self, kind: str, selector: str) -> SelectorRecord:
+        return self.selectors.setdefault(kind, {}).setdefault(selector, SelectorRecord())
+
+    def add(self, other: "SiteSelectors") -> None:
+        """Adds the outcomes of another run; its winners are the more recent."""
+        for kind, records in other.selectors.items():
+            for selector, record in records.items():
+                self.record(kind, selector).add(record)
+        self.winners.update(other.winners)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "winners": dict(self.winners),
+            "selectors": {
+                kind: {selector: asdict(record) for selector, record in records.items()}
+                for kind, records in self.selectors.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SiteSelectors":
+        site = cls(data.get("fingerprint"))
+        site.winners = dict(data.get("winners", {}))
+        for kind, records in data.get("selectors", {}).items():
+            for selector, record in records.items():
+                site.selectors.setdefault(kind, {})[selector] = SelectorRecord(**record)
+        return site
+
+
+class SelectorCache:
+    """Learns which fallback selectors resolve the careers page's readiness waits.
+
+    For each site, the cache keeps the selector that last resolved each kind of
+    wait, how long the waits took and how often every candidate was passed
+    over. Candidates are then offered last winner first, then by wins, with
+    known-dead ones (invalid, or never matched) at the end. The statistics are
+    saved across runs and dropped as soon as the site's DOM fingerprint
+    changes, so a redesign is relearned from the declared order. A disabled
+    cache keeps the declared order and records nothing.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.saved: Dict[str, SiteSelectors] = {}
+        self.session: Dict[str, SiteSelectors] = {}
+        self._checked: Set[str] = set()
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Loads the statistics saved by previous runs."""
+        self.saved = {site: SiteSelectors.from_dict(entry) for site, entry in data.items()}
+
+    def dump(self, stored: Dict[str, Any]) -> Dict[str, Any]:
+        """Adds this run's outcomes to the saved statistics and returns them.
+
+        Args:
+            stored (dict): The statistics currently saved, possibly updated by
+                other xdist workers since this run loaded them.
+
+        Returns:
+            dict: Statistics to save. A site whose fingerprint changed in this
+            run replaces the saved entry instead of adding to it.
+        """
+        data = dict(stored)
+        for key, session in self.session.items():
+            entry = stored.get(key)
+            if entry is None or (
+                session.fingerprint is not None
+                and entry.get("fingerprint") != session.fingerprint
+            ):
+                data[key] = session.to_dict()
+                continue
+            site = SiteSelectors.from_dict(entry)
+            site.add(session)
+            data[key] = site.to_dict()
+        return data
+
+    def _session(self, url: str) -> SiteSelectors:
+        key = site_key(url)
+        if key not in self.session:
+            saved = self.saved.get(key)
+            self.session[key] = SiteSelectors(saved.fingerprint if saved else None)
+        return self.session[key]
+
+    def _known(self, url: str) -> SiteSelectors:
+        """Returns the saved statistics combined with this run's."""
+        known = SiteSelectors()
+        saved = self.saved.get(site_key(url))
+        if saved is not None:
+            known.add(saved)
+        known.add(self._session(url))
+        return known
+
+    def order(self, url: str, kind: str, selectors: Sequence[str]) -> List[str]:
+        """Returns the candidates of a kind in the order they should be tried."""
+        if not self.enabled:
+            return list(selectors)
+        known = self._known(url)
+        records = known.selectors.get(kind, {})
+        winner = known.winners.get(kind)
+        position = {selector: index for index, selector in enumerate(selectors)}
+
+        def rank(selector: str):
+            record = records.get(selector, SelectorRecord())
+            return (
+                selector != winner,
+                record.dead,
+                -record.wins,
+                position[selector],
+            )
+
+        return sorted(selectors, key=rank)
+
+    def record_match(
+        self, url: str, kind: str, tried: Sequence[str], selector: str, elapsed: float
+    ) -> None:
+        """Records the selector that resolved a wait.
+
+        Args:
+            url (str): URL of the page that was waited on.
+            kind (str): Kind of the matching selector.
+            tried (Sequence[str]): Candidates of that kind in the order they
+                were checked; those before the winner did not match.
+            selector (str): The matching selector.
+            elapsed (float): Duration of the wait in seconds.
+        """
+        if not self.enabled:
+            return
+        session = self._session(url)
+        for candidate in tried:
+            if candidate == selector:
+                break
+            session.record(kind, candidate).misses += 1
+        record = session.record(kind, selector)
+        record.wins += 1
+        record.total_ms += elapsed * 1000
+        session.winners[kind] = selector
+
+    def record_invalid(self, url: str, kind: str, selectors: Sequence[str]) -> None:
+        """Records candidates that the browser cannot parse."""
+        if not self.enabled:
+            return
+        session = self._session(url)
+        for selector in selectors:
+            session.record(kind, selector).invalid = True
+
+    def observe_fingerprint(self, url: str, fingerprint: str) -> bool:
+        """Resets a site's statistics if its DOM fingerprint has changed.
+
+        Returns:
+            bool: True if statistics learnt under another fingerprint were dropped.
+        """
+        key = site_key(url)
+        self._checked.add(key)
+        session = self._session(url)
+        saved = self.saved.get(key)
+        known = session.fingerprint or (saved.fingerprint if saved else None)
+        session.fingerprint = fingerprint
+        if known is None or known == fingerprint:
+            return False
+        logger.info(
+            "DOM of %s changed (fingerprint %s, was %s), relearning selectors",
+            key,
+            fingerprint,
+            known,
+        )
+        # This run's own outcomes were observed on the new DOM and are kept
+        self.saved.pop(key, None)
+        return True
+
+    async def check_fingerprint(self, page: Page) -> None:
+        """Fingerprints the page's DOM, once per site and run.
+
+        Elements of a consent banner do not count, so the fingerprint is the
+        same whether or not consent was already given.
+        """
+        if not self.enabled or site_key(page.url) in self._checked:
+            return
+        try:
+            elements = await page.evaluate(_FINGERPRINT_SCRIPT, CONSENT_BANNER_SELECTOR)
+        except PlaywrightError as e:
+            logger.debug("Could not fingerprint the DOM: %s", e)
+            return
+        tokens = [token for token, in_banner in elements if not in_banner]
+        self.observe_fingerprint(page.url, dom_fingerprint(tokens))
+
+
+SELECTOR_CACHE = SelectorCache()
@@ -0,0 +1,440 @@
+import argparse
+import html
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from utils.data_helpers import get_job_types, get_test_locations
+
+logger = logging.getLogger(__name__)
+
+CONSENT_COOKIE = "OptanonAlertBoxClosed"
+WORK_MODES = ["Office", "Remote", "Hybrid"]
+CITIES = {
+    "Poland": ["Krakow", "Warsaw", "Wroclaw", "Gdansk"],
+    "United States": ["New York", "Newtown", "Austin"],
+    "United Kingdom": ["London", "Manchester"],
+    "Germany": ["Berlin", "Munich"],
+}
+LEVELS = ["Junior", "Middle", "Senior", "Lead", "Chief"]
+ROLES = [
+    "Python Developer",
+    "QA Automation Engineer",
+    "Manual Test Engineer",
+    "Quality Assurance Lead",
+    "Java Developer",
+    "Data Engineer",
+    "DevOps Engineer",
+    "Frontend Developer",
+    "Business Analyst",
+    ".NET Developer",
+]
+
+_STYLE = """
+body { font-family: sans-serif; margin: 0; }
+header { display: flex; justify-content: space-between; padding: 8px 16px; }
+.hamburger-menu-ui { display: none; }
+.header-search-ui { display: none; }
+@media (max-width: 1024px) {
+    .hamburger-menu-ui, .header-search-ui { display: inline-block; }
+}
+.search-result__list { list-style: none; padding: 0; }
+#onetrust-banner-sdk { position: fixed; bottom: 0; left: 0; right: 0; background: #eee; padding: 16px; }
+iframe[title='challenge'] { position: fixed; inset: 0; width: 100%; height: 100%; background: #fff; }
+"""
+
+_SCRIPT = """
+document.addEventListener('click', (event) => {
+    const accept = event.target.closest('#onetrust-accept-btn-handler');
+    if (accept) {
+        document.cookie = 'OptanonAlertBoxClosed=' + new Date().toISOString()
+            + '; path=/; max-age=31536000';
+        document.getElementById('onetrust-banner-sdk').remove();
+    }
+    const menu = event.target.closest('.hamburger-menu-ui');
+    if (menu) {
+        const open = menu.getAttribute('aria-expanded') !== 'true';
+        menu.setAttribute('aria-expanded', String(open));
+        document.getElementById('main-menu').hidden = !open;
+    }
+});
+const challenge = document.querySelector("iframe[title='challenge']");
+if (challenge) {
+    setTimeout(() => challenge.remove(), Number(challenge.dataset.solveMs));
+}
+"""
+
+
+@dataclass(frozen=True)
+class Job:
+    """A synthetic job listing."""
+
+    id: int
+    title: str
+    city: str
+    country: str
+    tags: Tuple[str, str]
+
+    @property
+    def location(self) -> str:
+        return f"{self.city}, {self.country}"
+
+    def description(self) -> List[str]:
+        return [
+            f"Design, build and maintain solutions as a {self.title}",
+            f"Collaborate with distributed teams from {self.city}",
+            "Take part in code reviews and knowledge sharing",
+        ]
+
+
+def build_catalogue(size: int, seed: int = 0) -> List[Job]:
+    """Generates a deterministic job catalogue.
+
+    Args:
+        size (int): Number of listings.
+        seed (int): Seed of the random generator.
+    """
+    rng = random.Random(seed)
+    countries = get_test_locations()
+    job_types = get_job_types()
+    jobs = []
+    for job_id in range(1, size + 1):
+        country = rng.choice(countries)
+        jobs.append(
+            Job(
+                id=job_id,
+                title=f"{rng.choice(LEVELS)} {rng.choice(ROLES)}",
+                city=rng.choice(CITIES.get(country, [country])),
+                country=country,
+                tags=(rng.choice(WORK_MODES), rng.choice(job_types)),
+            )
+        )
+    return jobs
+
+
+class StandInSite:
+    """In-process HTTP server serving a synthetic careers site.
+
+    The markup mirrors the structure the page objects rely on: the keyword
+    search form, the select2 location textbox, job type filters, the results
+    list, the no-results alert, the mobile menu and the vacancy details page.
+    It lets page objects and fixtures be measured without the real site.
+    """
+
+    def __init__(
+        self,
+        catalogue_size: int = 200,
+        page_size: int = 20,
+        latency_ms: float = 0,
+        cookie_banner: bool = True,
+        challenge: bool = False,
+        challenge_ms: int = 500,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        """Initializes the site without starting the server.
+
+        Args:
+            catalogue_size (int): Number of job listings (10 to 100k is practical).
+            page_size (int): Listings per results page.
+            latency_ms (float): Delay added to every response, in milliseconds.
+            cookie_banner (bool): Whether to show a OneTrust-like consent banner
+                until the consent cookie is set.
+            challenge (bool): Whether to cover the careers page with a
+                verification iframe that goes away after ``challenge_ms``.
+            challenge_ms (int): Time the verification challenge takes to solve.
+            seed (int): Seed used to generate the catalogue.
+            port (int): Port to listen on, 0 for any free port.
+        """
+        self.jobs = build_catalogue(catalogue_size, seed)
+        self.page_size = max(1, page_size)
+        self.latency_ms = latency_ms
+        self.cookie_banner = cookie_banner
+        self.challenge = challenge
+        self.challenge_ms = challenge_ms
+        self.port = port
+        self.requests_served = 0
+        # Requests are handled on one thread each
+        self._requests_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Stand-in site is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def careers_url(self) -> str:
+        return f"{self.base_url}/careers"
+
+    def start(self) -> "StandInSite":
+        """Starts serving in a background thread."""
+        site = self
+
+        class Handler(_Handler):
+            pass
+
+        Handler.site = site
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="standin-site", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "Stand-in careers site with %d jobs serving at %s",
+            len(self.jobs),
+            self.careers_url,
+        )
+        return self
+
+    def stop(self) -> None:
+        """Stops the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StandInSite":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def search(
+        self, query: str = "", location: str = "", job_types: Optional[List[str]] = None
+    ) -> List[Job]:
+        """Returns the jobs matching a keyword, location and job types."""
+        query = query.strip().lower()
+        location = location.strip().lower()
+        wanted_types = set(job_types or [])
+        results = []
+        for job in self.jobs:
+            if query and query not in job.title.lower():
+                continue
+            if location and not (
+                job.country.lower() in location or job.city.lower() in location
+            ):
+                continue
+            if wanted_types and not wanted_types.intersection(job.tags):
+                continue
+            results.append(job)
+        return results
+
+
+class _Handler(BaseHTTPRequestHandler):
+    site: StandInSite
+
+    def log_message(self, format, *args):
+        logger.debug("stand-in: " + format, *args)
+
+    def do_GET(self):
+        site = self.site
+        with site._requests_lock:
+            site.requests_served += 1
+        if site.latency_ms:
+            time.sleep(site.latency_ms / 1000)
+
+        parts = urlsplit(self.path)
+        params = parse_qs(parts.query)
+        path = parts.path.rstrip("/")
+
+        if path in ("/careers", "/careers/job-listings"):
+            self._send(200, self._careers_page(path, params))
+        elif path.startswith("/careers/vacancy/"):
+            job = self._job_from_path(path)
+            if job is None:
+                self._send(404, _document("Not found", "<h1>Vacancy not found</h1>"))
+            elif path.endswith("/apply"):
+                self._send(200, _apply_page(job))
+            else:
+                self._send(200, _details_page(job))
+        else:
+            self._send(404, _document("Not found", "<h1>Not found</h1>"))
+
+    def _job_from_path(self, path: str) -> Optional[Job]:
+        try:
+            job_id = int(path.split("/")[3])
+        except (IndexError, ValueError):
+            return None
+        if 1 <= job_id <= len(self.site.jobs):
+            return self.site.jobs[job_id - 1]
+        return None
+
+    def _has_consent(self) -> bool:
+        cookies = SimpleCookie(self.headers.get("Cookie", ""))
+        return CONSENT_COOKIE in cookies
+
+    def _careers_page(self, path: str, params: dict) -> str:
+        site = self.site
+        query = params.get("query", [""])[0]
+        location = params.get("location", [""])[0]
+        job_types = params.get("type", [])
+        try:
+            page_number = max(1, int(params.get("page", ["1"])[0]))
+        except ValueError:
+            page_number = 1
+
+        results = site.search(query, location, job_types)
+        start = (page_number - 1) * site.page_size
+        page_jobs = results[start:start + site.page_size]
+
+        body = [_header(), _search_form(query, location, job_types)]
+        if results:
+            body.append(_results(page_jobs))
+            if start + site.page_size < len(results):
+                next_params = {"query": query, "location": location, "type": job_types}
+                next_params["page"] = page_number + 1
+                href = "/careers/job-listings?" + urlencode(next_params, doseq=True)
+                body.append(
+                    '<nav class="pagination">'
+                    f'<a class="pagination__next" rel="next" href="{html.escape(href)}">Next</a>'
+                    "</nav>"
+                )
+        else:
+            body.append(
+                '<div role="alert" class="search-result__error-message">'
+                "Sorry, your search returned no results. Please try another combination."
+                "</div>"
+            )
+        if site.cookie_banner and not self._has_consent():
+            body.append(
+                '<div id="onetrust-banner-sdk">We use cookies. '
+                '<button id="onetrust-accept-btn-handler">Accept All</button></div>'
+            )
+        if site.challenge and path == "/careers":
+            body.append(
+                f'<iframe title="challenge" data-solve-ms="{site.challenge_ms}" '
+                'srcdoc="Verifying you are human..."></iframe>'
+            )
+        return _document("Careers", "\n".join(body))
+
+    def _send(self, status: int, content: str) -> None:
+        payload = content.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def _document(title: str, body: str) -> str:
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<meta charset='utf-8'><title>{html.escape(title)}</title>"
+        f"<style>{_STYLE}</style></head><body>{body}"
+        f"<script>{_SCRIPT}</script></body></html>"
+    )
+
+
+def _header() -> str:
+    return (
+        '<header class="top-navigation--epam-sticky">'
+        '<a href="/careers">Careers</a>'
+        '<button class="header-search-ui" aria-label="Search">&#128269;</button>'
+        '<button class="hamburger-menu-ui hamburger-menu-ui-23" aria-expanded="false" '
+        'aria-label="Menu">&#9776;</button>'
+        '<nav id="main-menu" hidden><a href="/careers">Jobs</a></nav>'
+        "</header>"
+    )
+
+
+def _search_form(query: str, location: str, job_types: List[str]) -> str:
+    chips = "".join(
+        f'<li class="select2-selection__choice">All Cities in {html.escape(country)}</li>'
+        for country in get_test_locations()
+    )
+    label = ", ".join(f"All Cities in {country}" for country in get_test_locations())
+    types = "".join(
+        '<label class="job-search__filter">'
+        f'<input type="checkbox" name="type" value="{html.escape(t)}"'
+        f'{" checked" if t in job_types else ""}> {html.escape(t)}</label>'
+        for t in WORK_MODES + get_job_types()
+    )
+    return (
+        '<form id="jobSearchFilterForm" class="job-search recruitment-search" '
+        'action="/careers/job-listings" method="get">'
+        '<input id="new_form_job_search-keyword" type="text" name="query" '
+        f'placeholder="Keyword" value="{html.escape(query)}">'
+        '<span class="select2-selection__rendered" role="textbox" '
+        f'aria-label="{html.escape(label)}"><ul>{chips}</ul></span>'
+        '<input class="select2-search__field" type="text" role="combobox" '
+        f'name="location" value="{html.escape(location)}">'
+        f'<div class="job-search__filters"><span class="default-label">Skills</span>{types}</div>'
+        '<button type="submit">Find</button>'
+        "</form>"
+    )
+
+
+def _results(jobs: List[Job]) -> str:
+    cards = "".join(
+        '<li class="search-result__item"><div class="search-result__item-info">'
+        f'<h5><a class="search-result__item-name" href="/careers/vacancy/{job.id}">'
+        f"{html.escape(job.title)}</a></h5>"
+        f'<div class="search-result__location">{html.escape(job.location)}</div>'
+        f'<p class="search-result__tags">{html.escape(", ".join(job.tags))}</p>'
+        "</div></li>"
+        for job in jobs
+    )
+    return f'<ul class="search-result__list">{cards}</ul>'
+
+
+def _details_page(job: Job) -> str:
+    items = "".join(f"<li>{html.escape(line)}</li>" for line in job.description())
+    return _document(
+        job.title,
+        _header()
+        + f'<h1 class="vacancy-details-23__job-title">{html.escape(job.title)}</h1>'
+        f'<div class="vacancy-details-23__location">{html.escape(job.location)}</div>'
+        f'<div class="vacancy-details-23__content-holder"><ul>{items}</ul></div>'
+        f'<a data-auto="apply-button" href="/careers/vacancy/{job.id}/apply">Apply</a>',
+    )
+
+
+def _apply_page(job: Job) -> str:
+    return _document(
+        f"Apply - {job.title}",
+        f"<h1>Apply for {html.escape(job.title)}</h1>"
+        f'<form class="application-form" action="/careers/vacancy/{job.id}/apply">'
+        '<input name="email" type="email"></form>',
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Serves the stand-in site until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve the stand-in careers site")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--no-cookie-banner", action="store_true")
+    parser.add_argument("--challenge", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    site = StandInSite(
+        catalogue_size=args.jobs,
+        page_size=args.page_size,
+        latency_ms=args.latency_ms,
+        cookie_banner=not args.no_cookie_banner,
+        challenge=args.challenge,
+        port=args.port,
+    ).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRACE_POLICIES = ("off", "on-failure-retry", "lightweight", "full")
+
+# Options passed to context.tracing.start() for the policies that trace every test
+TRACE_START_OPTIONS: Dict[str, Dict[str, bool]] = {
+    "lightweight": {"screenshots": True, "snapshots": False, "sources": False},
+    "full": {"screenshots": True, "snapshots": True, "sources": True},
+}
+
+# Where each policy falls back to when it goes over the overhead budget
+FALLBACK_POLICY = {"full": "lightweight", "lightweight": "on-failure-retry"}
+
+
+class AdaptiveTracer:
+    """Chooses the tracing level of each test and keeps its overhead in budget.
+
+    The overhead of a traced test is the time spent starting and stopping the
+    trace plus how much slower its page actions ran than in untraced tests.
+    To measure the latter, every ``baseline_every``-th test of a tracing
+    policy runs untraced as a baseline, and each traced action is compared
+    with the baseline mean of the same action. Until an action has a
+    baseline, only the start/stop time of the trace is counted for it.
+
+    Once the overhead of the current policy exceeds ``budget`` (a fraction of
+    the traced tests' duration), the tracer falls back to the next lighter
+    policy and starts measuring it afresh; the baseline is kept.
+    """
+
+    def __init__(
+        self,
+        policy: str = "full",
+        budget: float = 0.1,
+        min_samples: int = 3,
+        baseline_every: int = 10,
+        max_reruns: int = 5,
+    ):
+        """Initializes the tracer.
+
+        Args:
+            policy (str): Starting policy, one of TRACE_POLICIES.
+            budget (float): Maximum overhead as a fraction of test time.
+                A value of 0 or less disables the fallback.
+            min_samples (int): Traced tests measured before the budget applies.
+            baseline_every (int): Run every n-th test untraced to measure the
+                baseline action latency; 0 or less disables baseline tests.
+            max_reruns (int): Most failed tests rerun to capture a trace;
+                0 or less disables the reruns.
+        """
+        if policy not in TRACE_POLICIES:
+            raise ValueError(f"Unknown trace policy: {policy}")
+        self.policy = policy
+        self.budget = budget
+        self.min_samples = min_samples
+        self.baseline_every = baseline_every
+        self.max_reruns = max_reruns
+        self.fallbacks: List[str] = []
+        self.reruns = 0
+        self.skipped_reruns = 0
+        self._tests = 0
+        # Summed seconds and count of each action in untraced tests
+        self._baseline: Dict[str, List[float]] = {}
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._samples = 0
+        self._overhead = 0.0
+        self._duration = 0.0
+        self._traced: Dict[str, List[float]] = {}
+
+    def start_options(self, retry: bool = False) -> Optional[Dict[str, bool]]:
+        """Returns the tracing.start() options for the next test, or None.
+
+        Args:
+            retry (bool): Whether the test is being rerun to capture a trace
+                of a failure, which always uses full tracing.
+        """
+        if retry:
+            return TRACE_START_OPTIONS["full"]
+        return TRACE_START_OPTIONS.get(self.policy)
+
+    @property
+    def retries_failures(self) -> bool:
+        """Whether failed tests are rerun with tracing on."""
+        return self.policy == "on-failure-retry"
+
+    def takes_baseline(self) -> bool:
+        """Decides whether the next test runs untraced, as a latency baseline.
+
+        Only policies that trace every test take baselines, and only while
+        the budget applies. Failed baseline tests should be rerun with
+        tracing, as under on-failure-retry.
+        """
+        if (
+            self.policy not in TRACE_START_OPTIONS
+            or self.budget <= 0
+            or self.baseline_every <= 0
+        ):
+            return False
+        self._tests += 1
+        return self._tests % self.baseline_every == 0
+
+    def take_rerun(self) -> bool:
+        """Decides whether a failed test is rerun with tracing to capture a trace.
+
+        A rerun repeats the whole test, so only the first ``max_reruns``
+        failures are rerun; later ones are reported without a trace.
+        """
+        if self.reruns >= self.max_reruns:
+            self.skipped_reruns += 1
+            return False
+        self.reruns += 1
+        return True
+
+    def _baseline_mean(self, action: str) -> Optional[float]:
+        total, count = self._baseline.get(action, (0.0, 0))
+        return total / count if count else None
+
+    def record_baseline(self, actions: Sequence[Tuple[str, float]]) -> None:
+        """Records the action latencies of an untraced test.
+
+        Args:
+            actions (Sequence): (action name, seconds) of the test's page actions.
+        """
+        for action, seconds in actions:
+            entry = self._baseline.setdefault(action, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def _action_overhead(self, actions: Dict[str, List[float]]) -> float:
+        """Seconds the actions took beyond their baseline, never negative."""
+        slower = 0.0
+        for action, (total, count) in actions.items():
+            mean = self._baseline_mean(action)
+            if mean is not None:
+                slower += total - mean * count
+        return max(0.0, slower)
+
+    def record(
+        self,
+        start_stop: float,
+        duration: float,
+        actions: Sequence[Tuple[str, float]] = (),
+    ) -> float:
+        """Records the cost of one traced test and falls back if over budget.
+
+        Args:
+            start_stop (float): Seconds spent in tracing.start() and tracing.stop().
+            duration (float): Seconds the traced test took, overhead included.
+            actions (Sequence): (action name, seconds) of the test's page actions.
+
+        Returns:
+            float: Estimated overhead of the test in seconds.
+        """
+        test_actions: Dict[str, List[float]] = {}
+        for action, seconds in actions:
+            for window in (test_actions, self._traced):
+                entry = window.setdefault(action, [0.0, 0])
+                entry[0] += seconds
+                entry[1] += 1
+        overhead = start_stop + self._action_overhead(test_actions)
+        self._samples += 1
+        self._overhead += start_stop
+        self._duration += duration
+        if (
+            self.budget <= 0
+            or self._samples < self.min_samples
+            or self.policy not in FALLBACK_POLICY
+        ):
+            return overhead
+        window_overhead = self._overhead + self._action_overhead(self._traced)
+        ratio = window_overhead / self._duration if self._duration else 0.0
+        if ratio > self.budget:
+            fallback = FALLBACK_POLICY[self.policy]
+            logger.warning(
+                "Trace overhead %.0f%% exceeds budget %.0f%%, falling back from %s to %s",
+                ratio * 100,
+                self.budget * 100,
+                self.policy,
+                fallback,
+            )
+            self.fallbacks.append(f"{self.policy} -> {fallback}")
+            self.policy = fallback
+            self._reset_window()
+        return overhead
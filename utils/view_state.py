@@ -0,0 +1,121 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+# Optionally waits for one element to render, then reads the state of every
+# named selector in the same evaluation. Selectors starting with "//", "(" or
+# "xpath=" are XPath, as in Playwright; all others are CSS.
+_QUERY_VIEW = """
+async ([selectors, waitFor, timeout]) => {
+    const find = (selector) => {
+        if (/^(xpath=|\\/\\/|\\()/.test(selector)) {
+            const result = document.evaluate(
+                selector.replace(/^xpath=/, ''), document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            return Array.from(
+                {length: result.snapshotLength}, (_, i) => result.snapshotItem(i));
+        }
+        return Array.from(document.querySelectorAll(selector.replace(/^css=/, '')));
+    };
+    if (waitFor) {
+        const deadline = performance.now() + timeout;
+        while (!find(selectors[waitFor]).length && performance.now() < deadline) {
+            await new Promise((resolve) => requestAnimationFrame(resolve));
+        }
+    }
+    // Same rule as Playwright: a non-empty box and not visibility:hidden
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0
+            && window.getComputedStyle(el).visibility !== 'hidden';
+    };
+    const state = {};
+    for (const [name, selector] of Object.entries(selectors)) {
+        const nodes = find(selector);
+        const first = nodes[0];
+        state[name] = {
+            count: nodes.length,
+            visible: first ? isVisible(first) : false,
+            texts: nodes.map((node) => node.textContent),
+            attributes: first
+                ? Object.fromEntries(Array.from(first.attributes, (a) => [a.name, a.value]))
+                : {},
+        };
+    }
+    return state;
+}
+"""
+
+
+@dataclass
+class ElementState:
+    """State of the elements matching one selector when the view was read.
+
+    Visibility and attributes are those of the first match, as with
+    ``locator.first``; texts cover every match.
+    """
+
+    selector: str
+    count: int = 0
+    visible: bool = False
+    texts: List[str] = field(default_factory=list)
+    attributes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def text(self) -> Optional[str]:
+        return self.texts[0] if self.texts else None
+
+
+@dataclass
+class ViewState:
+    """A snapshot of several named elements of a page, read in one evaluation."""
+
+    url: str
+    elements: Dict[str, ElementState]
+
+    def __getitem__(self, name: str) -> ElementState:
+        return self.elements[name]
+
+    def visible(self, name: str) -> bool:
+        return self.elements[name].visible
+
+    def text(self, name: str) -> Optional[str]:
+        return self.elements[name].text
+
+
+async def query_view(
+    page: Page,
+    selectors: Dict[str, str],
+    wait_for: Optional[str] = None,
+    timeout: float = 10000,
+) -> ViewState:
+    """Reads the visibility, texts, count and attributes of named elements.
+
+    Checking a view element by element costs one browser round-trip per
+    question; this reads them all in one, which matters most with a remote
+    browser. The snapshot does not wait for the elements or retry like a
+    locator does, so read it once the view has settled.
+
+    Args:
+        page (Page): Page to read.
+        selectors (dict): CSS or XPath selectors by name.
+        wait_for (str, optional): Name of an element to wait for first.
+            Elements that have not rendered by then are read as absent.
+        timeout (float): Maximum time to wait for it in milliseconds.
+
+    Returns:
+        ViewState: The state of every named element.
+    """
+    state = await page.evaluate(_QUERY_VIEW, [selectors, wait_for, timeout])
+    logger.debug("Read view state of %s", ", ".join(selectors))
+    return ViewState(
+        url=page.url,
+        elements={
+            name: ElementState(selector=selectors[name], **fields)
+            for name, fields in state.items()
+        },
+    )
@@ -0,0 +1,249 @@
+import json
+import logging
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from playwright.async_api import Page, Error as PlaywrightError
+
+logger = logging.getLogger(__name__)
+
+# Installed before every navigation: observers for the metrics that are not
+# kept in the performance timeline, so they can be read back at any time
+_OBSERVER_SCRIPT = """
+(() => {
+    if (window.__pwPerf) {
+        return;
+    }
+    const perf = window.__pwPerf = {lcp: null, shifts: [], longTasks: []};
+    performance.setResourceTimingBufferSize(5000);
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback))
+                .observe({type, buffered: true});
+        } catch (e) {
+            // Entry type not supported by this browser
+        }
+    };
+    observe('largest-contentful-paint', (entry) => { perf.lcp = entry.startTime; });
+    observe('layout-shift', (entry) => {
+        if (!entry.hadRecentInput) {
+            perf.shifts.push([entry.startTime, entry.value]);
+        }
+    });
+    observe('longtask', (entry) => perf.longTasks.push([entry.startTime, entry.duration]));
+})();
+"""
+
+_MARK_SCRIPT = "() => ({origin: performance.timeOrigin, now: performance.now()})"
+
+# Reads the metrics of the window since the mark, or of the whole document
+# when there is no mark or the action loaded a new document
+_COLLECT_SCRIPT = """
+(mark) => {
+    const navigated = !mark || mark.origin !== performance.timeOrigin;
+    const from = navigated ? 0 : mark.now;
+    const perf = window.__pwPerf;
+    const round = (value) => (value === null ? null : Math.round(value * 10) / 10);
+    const metrics = {duration_ms: round(performance.now() - from)};
+
+    let transferred = 0;
+    if (navigated) {
+        const nav = performance.getEntriesByType('navigation')[0];
+        if (nav) {
+            metrics.ttfb_ms = round(nav.responseStart);
+            metrics.dom_content_loaded_ms = round(nav.domContentLoadedEventEnd || null);
+            metrics.load_ms = round(nav.loadEventEnd || null);
+            transferred += nav.transferSize;
+        }
+        for (const paint of performance.getEntriesByType('paint')) {
+            metrics[paint.name.replace(/-/g, '_') + '_ms'] = round(paint.startTime);
+        }
+        metrics.lcp_ms = perf ? round(perf.lcp) : null;
+    }
+    for (const entry of performance.getEntriesByType('resource')) {
+        if (entry.startTime >= from) {
+            transferred += entry.transferSize;
+        }
+    }
+    metrics.transferred_bytes = transferred;
+
+    if (perf) {
+        // CLS is the largest session window: shifts less than 1s apart, at most 5s long
+        let cls = 0, session = 0, first = 0, last = 0;
+        for (const [start, value] of perf.shifts.filter(([start]) => start >= from)) {
+            if (session && start - last < 1000 && start - first < 5000) {
+                session += value;
+            } else {
+                session = value;
+                first = start;
+            }
+            last = start;
+            cls = Math.max(cls, session);
+        }
+        metrics.cls = Math.round(cls * 10000) / 10000;
+        const tasks = perf.longTasks.filter(([start]) => start >= from);
+        metrics.long_tasks = tasks.length;
+        metrics.long_task_ms = round(tasks.reduce((total, [, duration]) => total + duration, 0));
+    }
+    return {url: location.href, navigated, metrics};
+}
+"""
+
+PERF_BUDGET_MARKER = "perf_budget"
+
+
+@dataclass
+class PerfSample:
+    """Web performance metrics measured around one page action.
+
+    Attributes:
+        action (str): The page-object action, e.g. "navigate" or "search_jobs".
+        url (str): Page URL once the action completed.
+        navigated (bool): Whether the action loaded a new document, in which
+            case navigation, paint and LCP metrics are included.
+        metrics (dict): Metric values by name, None when not available.
+    """
+
+    action: str
+    url: str
+    navigated: bool
+    metrics: Dict[str, Optional[float]]
+
+
+@dataclass
+class BudgetViolation:
+    """A metric that went over its budget."""
+
+    action: str
+    metric: str
+    value: float
+    limit: float
+
+    def __str__(self) -> str:
+        return f"{self.action}: {self.metric}={self.value:g} over budget {self.limit:g}"
+
+
+class WebPerfRecorder:
+    """Collects in-page performance metrics for the actions of a page object.
+
+    Navigation Timing, paint and resource entries are read from the
+    performance timeline. LCP, layout shifts and long tasks are only
+    reported to observers, which install() registers before the page loads.
+    Transferred bytes only count cross-origin resources that allow it
+    through Timing-Allow-Origin.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """Initializes the recorder.
+
+        Args:
+            enabled (bool): Whether to collect anything; when False every
+                method is a no-op, costing no extra round-trip.
+        """
+        self.enabled = enabled
+        self.samples: List[PerfSample] = []
+        self._installed_pages = set()
+
+    async def install(self, page: Page) -> None:
+        """Registers the performance observers for the page's next documents."""
+        if not self.enabled or id(page) in self._installed_pages:
+            return
+        try:
+            await page.add_init_script(_OBSERVER_SCRIPT)
+            self._installed_pages.add(id(page))
+        except PlaywrightError as e:
+            logger.debug("Could not install performance observers: %s", e)
+
+    async def mark(self, page: Page) -> Optional[Dict[str, float]]:
+        """Marks the start of an action, to be passed to collect()."""
+        if not self.enabled:
+            return None
+        try:
+            return await page.evaluate(_MARK_SCRIPT)
+        except PlaywrightError as e:
+            logger.debug("Could not mark performance timeline: %s", e)
+            return None
+
+    async def collect(
+        self, page: Page, action: str, mark: Optional[Dict[str, float]] = None
+    ) -> Optional[PerfSample]:
+        """Reads the metrics of an action and records them.
+
+        Args:
+            page (Page): Page the action ran on.
+            action (str): Name of the action.
+            mark (dict, optional): Result of mark() before the action; without
+                it the metrics of the whole document are read.
+
+        Returns:
+            Optional[PerfSample]: The recorded sample, None if not collected.
+        """
+        if not self.enabled:
+            return None
+        try:
+            data = await page.evaluate(_COLLECT_SCRIPT, mark)
+        except PlaywrightError as e:
+            logger.debug("Could not collect performance metrics for %s: %s", action, e)
+            return None
+        sample = PerfSample(action=action, **data)
+        self.samples.append(sample)
+        logger.info("Web performance of %s: %s", action, sample.metrics)
+        return sample
+
+    def adopt(self, other: "WebPerfRecorder") -> None:
+        """Takes over the samples and pages of a recorder used before the test started."""
+        self.samples[:0] = other.samples
+        self._installed_pages |= other._installed_pages
+
+    def to_json(self) -> str:
+        return json.dumps([asdict(sample) for sample in self.samples], indent=2)
+
+    def save(self, path: Path) -> Path:
+        """Writes the samples to a JSON file and returns its path."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_json(), encoding="utf-8")
+        return path
+
+
+def budgets_from_markers(markers: Iterable[Any]) -> List[Tuple[Optional[str], Dict[str, float]]]:
+    """Reads the budgets declared with perf_budget markers.
+
+    A marker lists metric limits as keyword arguments and may restrict them to
+    one action, e.g. ``@pytest.mark.perf_budget(lcp_ms=4000, action="navigate")``.
+    Markers closer to the test come first.
+
+    Returns:
+        list: (action or None for every action, limits by metric) pairs.
+    """
+    budgets = []
+    for marker in markers:
+        limits = dict(marker.kwargs)
+        action = limits.pop("action", None)
+        budgets.append((action, {metric: float(limit) for metric, limit in limits.items()}))
+    return budgets
+
+
+def check_budgets(
+    samples: Iterable[PerfSample],
+    budgets: List[Tuple[Optional[str], Dict[str, float]]],
+) -> List[BudgetViolation]:
+    """Compares the samples with the budgets.
+
+    For every action and metric, the closest budget declaring it applies, so a
+    test marker can loosen or tighten a class or module one.
+    """
+    violations = []
+    for sample in samples:
+        applied = set()
+        for action, limits in budgets:
+            if action not in (None, sample.action):
+                continue
+            for metric, limit in limits.items():
+                if metric in applied:
+                    continue
+                applied.add(metric)
+                value = sample.metrics.get(metric)
+                if value is not None and value > limit:
+                    violations.append(BudgetViolation(sample.action, metric, value, limit))
+    return violations
@@ -0,0 +1,163 @@
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence
+
+from xdist.scheduler import LoadScheduling
+
+from utils.scheduling import DurationHistory, plan_schedule
+
+logger = logging.getLogger(__name__)
+
+
+class DurationScheduling(LoadScheduling):
+    """xdist scheduler balancing workers by the tests' historical durations.
+
+    Once every worker has collected, plan_schedule() assigns each worker a
+    queue of tests, longest processing time first. Workers are fed from their own queue two tests
+    at a time. A worker whose queue runs dry takes tests from the end of the
+    queue of the worker with the most expected time left, as long as that
+    finishes them sooner, which absorbs wrong estimates. Workers are only shut
+    down once no queue holds any test, so an idle worker can still take over
+    the tests of a crashed one.
+    """
+
+    # Tests a worker holds at once; it needs the next one to finish the current
+    IN_FLIGHT = 2
+
+    def __init__(self, config, log=None, history: Optional[DurationHistory] = None):
+        super().__init__(config, log)
+        self.history = history or DurationHistory.load(getattr(config, "cache", None))
+        self.queues: Dict[object, Deque[int]] = {}
+
+    @property
+    def tests_finished(self) -> bool:
+        """Return True if all tests have been executed by the nodes."""
+        if any(self.queues.values()):
+            return False
+        return super().tests_finished
+
+    @property
+    def has_pending(self) -> bool:
+        """Return True if there are tests queued or running."""
+        return any(self.queues.values()) or super().has_pending
+
+    def schedule(self) -> None:
+        """Plan the run once all collections are in, then start every node."""
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        collections = list(self.node2collection.values())
+        if any(collection != collections[0] for collection in collections[1:]):
+            self.log("**Different tests collected, aborting run**")
+            return
+        self.collection = collections[0]
+        durations = {test: self.history.estimate(test) for test in self.collection}
+        plan = plan_schedule(self.collection, durations, len(self.nodes))
+        index = {test: i for i, test in enumerate(self.collection)}
+        for node, tests in zip(self.nodes, plan.workers):
+            self.queues[node] = deque(index[test] for test in tests)
+        self.config.suite_schedule = plan
+        logger.info(
+            "Scheduled %d tests on %d workers: planned %.1fs, ideal %.1fs",
+            len(self.collection),
+            len(self.nodes),
+            plan.makespan,
+            plan.ideal,
+        )
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def check_schedule(self, node, duration: float = 0) -> None:
+        """Top the node up from its queue, or from the busiest queue once it is empty."""
+        if node.shutting_down:
+            return
+        queue = self.queues.setdefault(node, deque())
+        missing = self.IN_FLIGHT - len(self.node2pending[node])
+        if missing > 0 and not queue and self.pending:
+            # Tests handed back while no node was running to queue them
+            queue.extend(self.pending[:missing])
+            del self.pending[:missing]
+        if missing > 0 and not queue:
+            self._steal(node, missing)
+        tests = [queue.popleft() for _ in range(min(missing, len(queue)))]
+        if tests:
+            self.node2pending[node].extend(tests)
+            node.send_runtest_some(tests)
+        # A node short of tests finishes the ones it holds once no work is left
+        # anywhere; until then it may still take tests from the other queues
+        if (
+            not self.pending
+            and not any(self.queues.values())
+            and len(self.node2pending[node]) < self.IN_FLIGHT
+        ):
+            node.shutdown()
+
+    def mark_test_complete(self, node, item_index: int, duration: float = 0) -> None:
+        """Top the node up, and offer the remaining work to idle nodes too."""
+        super().mark_test_complete(node, item_index, duration)
+        # An idle node has no test of its own left to call it back
+        for other in self.nodes:
+            if other is not node and not self.node2pending[other]:
+                self.check_schedule(other)
+
+    def _remaining(self, node) -> float:
+        """Expected time left on a node: its running and queued tests."""
+        indices = list(self.node2pending.get(node, [])) + list(self.queues[node])
+        return sum(self.history.estimate(self.collection[i]) for i in indices)
+
+    def _steal(self, node, count: int) -> None:
+        """Moves tests from the end of the queue with the most time left.
+
+        A test is only moved when it would finish sooner on this node.
+        """
+        victims = [n for n, q in self.queues.items() if q and n is not node]
+        if not victims:
+            return
+        victim = max(victims, key=self._remaining)
+        for _ in range(count):
+            queue = self.queues[victim]
+            if not queue:
+                break
+            duration = self.history.estimate(self.collection[queue[-1]])
+            if self._remaining(node) + duration >= self._remaining(victim):
+                break
+            self.queues[node].appendleft(queue.pop())
+            self.log("node", node.gateway.id, "took a test from", victim.gateway.id)
+
+    def mark_test_pending(self, item: str) -> None:
+        """Queue a test again on the node with the least work left."""
+        assert self.collection is not None
+        self._requeue([self.collection.index(item)])
+        for node in self.nodes:
+            self.check_schedule(node)
+
+    def _requeue(self, indices: List[int]) -> None:
+        """Queues tests on the running node with the least work left."""
+        running = [n for n in self.queues if not n.shutting_down]
+        if not indices or not running:
+            self.pending.extend(indices)
+            return
+        self.queues[min(running, key=self._remaining)].extendleft(reversed(indices))
+
+    def remove_pending_tests_from_node(self, node, indices: Sequence[int]) -> None:
+        """Queue tests a node handed back without running them on the other nodes."""
+        for index in indices:
+            self.node2pending[node].remove(index)
+        self._requeue(list(indices))
+        for other in self.nodes:
+            self.check_schedule(other)
+
+    def remove_node(self, node) -> Optional[str]:
+        """Remove a node, handing its queued and unfinished tests to the others."""
+        pending: List[int] = self.node2pending.pop(node)
+        queue = self.queues.pop(node, deque())
+        crashitem = None
+        if pending:
+            assert self.collection is not None
+            crashitem = self.collection[pending.pop(0)]
+        self._requeue(pending + list(queue))
+        for other in self.nodes:
+            self.check_schedule(other)
+        return crashitem